@@ -0,0 +1,46 @@
+"""Process-wide cache of analyze_question answers.
+
+Answers are keyed on what the question resolved to (intent, slots and the
+entities found), not on the raw text, so differently worded questions with
+the same meaning share an entry. Entries are evicted least-recently-used
+once the entry or byte budget is exceeded and expire after a TTL. Each entry
+remembers the version of the data it was computed from (the dataset of its
+domain, see engine.data_version) and is dropped when looked up under a newer
+one, so reloading one dataset leaves the answers about the other cached.
+"""
+import sys
+import time
+
+from versioned import VersionedLRU
+
+
+def answer_key(route, entities):
+    """Normalized cache key for a routed question."""
+    return route.intent, tuple(sorted(route.slots.items())), tuple(entities)
+
+
+def estimate_size(response):
+    """Approximate bytes held by a response dict."""
+    size = sys.getsizeof(response.get("text", ""))
+    data = response.get("data")
+    frames = data.values() if isinstance(data, dict) else [data]
+    for frame in frames:
+        if frame is not None:
+            size += int(frame.memory_usage(index=True, deep=False).sum())
+    return size
+
+
+class AnswerCache(VersionedLRU):
+    """Thread-safe LRU + TTL cache of responses with an approximate memory cap."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 2**20, ttl=3600.0, clock=time.monotonic):
+        super().__init__(max_entries, max_bytes, ttl, estimate_size, clock)
+
+    def get(self, version, key):
+        """Cached response for ``key`` under dataset ``version``, or None."""
+        response = super().get(version, key)
+        # A copy: the caller may fill in or change fields of its response
+        return None if response is None else dict(response)
+
+    def put(self, version, key, response):
+        super().put(version, key, dict(response))
@@ -1,7 +1,14 @@
 import streamlit as st
-import pandas as pd
-import json
 import datetime
+import os
+
+import engine
+from answer_cache import AnswerCache
+from charts import ChartCache, chart_png
+from chat_history import ChatHistory, message_data
+from registry import DatasetRegistry
+from latency import recorder
+from engine import analyze_question, with_labels
 
 
 # Page configuration
@@ -13,378 +20,44 @@ st.set_page_config(
 
 # Initialize session state
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = ChatHistory()
+
 
 
+# Load datasets once per process; every session shares the same read-only frames,
+# and the registry swaps in a new version in the background when data/ changes
+@st.cache_resource
+def get_registry():
+    """Datasets from data.gov.in, reloaded when their files change"""
+    return DatasetRegistry().start()
 
-# Load datasets
-@st.cache_data
-def load_datasets():
-    """Load CSV datasets from data.gov.in"""
+def load_snapshot():
+    """Current datasets; taken once per run so an answer never mixes two versions"""
     try:
-        rainfall_df = pd.read_csv('data/rainfall_data.csv')
-        crop_df = pd.read_csv('data/crop_production.csv')
-        return rainfall_df, crop_df
+        return get_registry().snapshot()
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return None, None
+        return None
 
-@st.cache_data
-def load_metadata():
-    """Load dataset metadata"""
-    try:
-        with open('data/dataset.json', 'r') as f:
-            return json.load(f)
-    except:
-        return {
-            "rainfall_data": {
-                "title": "District-wise Rainfall Data - Tamil Nadu (2017-18)",
-                "source": "India Meteorological Department",
-                "years_covered": "2017-2018",
-                "description": "Seasonal and annual rainfall for 32 Tamil Nadu districts"
-            },
-            "crop_production": {
-                "title": "Crop Production Statistics - Tamil Nadu (2012-13)",
-                "source": "Ministry of Agriculture & Farmers Welfare",
-                "years_covered": "2012-2013",
-                "description": "Area, production, and productivity for major crops"
-            }
-        }
-
-def analyze_question(question, rainfall_df, crop_df):
-    question_lower = question.lower().strip()
-    response = {"text": "", "data": None, "data_type": None}
-
-    # --- 1️⃣ Handle Greetings / Small Talk (keep as you already have) ---
-    greetings = ["hi", "hello", "hey", "good morning", "good evening"]
-    if any(g in question_lower for g in greetings):
-        response["text"] = "👋 Hello there! How can I help you explore Tamil Nadu’s rainfall or crop data today?"
-        return response
-
-    if "how are you" in question_lower:
-        response["text"] = "😊 I’m just a chatbot, but I’m doing great! Ready to analyze data for you."
-        return response
-
-    if "who made you" in question_lower or "developer" in question_lower:
-        response["text"] = "🤖 I was created by **Ishwaree Patil** as part of the *Bharat Digital Fellowship 2026* project!"
-        return response
-    if "what is your name" in question_lower or "who are you" in question_lower or "your name" in question_lower:
-        response["text"] = "🤖 My name is **AgriClimateBot** — your data assistant for Tamil Nadu’s agriculture and climate insights! 🌾☁️"
-        return response
-
-    if "bye" in question_lower or "thank" in question_lower:
-        response["text"] = "👋 You’re welcome! Have a wonderful day ahead 🌾"
-        return response
-
-    # --- 2️⃣ Fallback for unrelated or unusual questions ---
-    # Keywords related to data domain
-    data_keywords = [
-        "rain", "rainfall", "district", "crop", "production", "area",
-        "productivity", "yield", "monsoon", "agriculture", "climate"
-    ]
-
-    # If none of the relevant keywords appear → respond with chatbot purpose
-    if not any(k in question_lower for k in data_keywords):
-        response["text"] = (
-            "🤖 I’m **AgriClimateBot**, a data assistant built to analyze and explain "
-            "**Tamil Nadu’s rainfall and crop production datasets**. 🌾☁️\n\n"
-            "I’m not designed for general conversation — but I can help you with agriculture and climate insights!\n\n"
-            "💡 Try asking questions like:\n"
-            "- Which district received the most rainfall in 2019?\n"
-            "- Which crop had the highest productivity?\n"
-            "- Compare rainfall between Chennai and Coimbatore.\n"
-            "- What is the average rainfall across Tamil Nadu?\n"
-        )
-        return response
-    
-    # RAINFALL QUERIES
-    if any(word in question_lower for word in ['rainfall', 'rain', 'monsoon', 'precipitation', 'weather', 'climate']):
-        response['data_type'] = 'rainfall'
-        
-        district_col = 'District'
-        total_rainfall_col = 'Total Actual Rainfall (June\'17 to May\'18) in mm'
-        sw_monsoon_col = 'Actual Rainfall in South West Monsoon (June\'17 to September\'17) in mm'
-        ne_monsoon_col = 'Actual Rainfall in North East Monsoon (October\'17 to December\'17) in mm'
-        
-        # Check for specific districts
-        districts_mentioned = []
-        for district in rainfall_df[district_col].values:
-            if str(district).lower() in question_lower:
-                districts_mentioned.append(district)
-        
-        if districts_mentioned:
-            data = rainfall_df[rainfall_df[district_col].isin(districts_mentioned)]
-            response['data'] = data
-            
-            if len(districts_mentioned) == 1:
-                district_name = districts_mentioned[0]
-                district_data = data.iloc[0]
-                total_rain = district_data[total_rainfall_col]
-                sw_rain = district_data[sw_monsoon_col]
-                ne_rain = district_data[ne_monsoon_col]
-                
-                response['text'] = f"## 🌧️ Rainfall Analysis for {district_name}\n\n"
-                response['text'] += f"### Annual Rainfall (2017-18)\n"
-                response['text'] += f"- **Total Annual Rainfall**: {total_rain:.1f} mm\n"
-                response['text'] += f"- **South West Monsoon** (June-Sept): {sw_rain:.1f} mm\n"
-                response['text'] += f"- **North East Monsoon** (Oct-Dec): {ne_rain:.1f} mm\n\n"
-                
-                # Compare with state average
-                state_avg = rainfall_df[rainfall_df[district_col] == 'State Average'][total_rainfall_col].values
-                if len(state_avg) > 0:
-                    diff = total_rain - state_avg[0]
-                    if diff > 0:
-                        response['text'] += f"📊 This is **{diff:.1f} mm above** the state average.\n\n"
-                    else:
-                        response['text'] += f"📊 This is **{abs(diff):.1f} mm below** the state average.\n\n"
-                
-                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
-            
-            elif len(districts_mentioned) == 2:
-                d1, d2 = districts_mentioned[0], districts_mentioned[1]
-                r1 = data[data[district_col] == d1][total_rainfall_col].values[0]
-                r2 = data[data[district_col] == d2][total_rainfall_col].values[0]
-                
-                response['text'] = f"## 📊 Rainfall Comparison (2017-18)\n\n"
-                response['text'] += f"### {d1} vs {d2}\n\n"
-                response['text'] += f"| District | Total Rainfall |\n"
-                response['text'] += f"|----------|----------------|\n"
-                response['text'] += f"| **{d1}** | {r1:.1f} mm |\n"
-                response['text'] += f"| **{d2}** | {r2:.1f} mm |\n\n"
-                
-                diff = abs(r1 - r2)
-                higher = d1 if r1 > r2 else d2
-                
-                response['text'] += f"**Analysis**: {higher} received **{diff:.1f} mm more** rainfall than the other district.\n\n"
-                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
-            
-            else:
-                response['text'] = f"## 🌧️ Rainfall Data for Multiple Districts\n\n"
-                response['text'] += f"Showing rainfall data for {len(districts_mentioned)} districts.\n\n"
-                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
-        
-        elif 'highest' in question_lower or 'maximum' in question_lower or 'most' in question_lower or 'top' in question_lower:
-            # Extract number if mentioned
-            num = 10
-            if 'top 5' in question_lower or '5 highest' in question_lower:
-                num = 5
-            elif 'top 3' in question_lower or '3 highest' in question_lower:
-                num = 3
-            
-            data = rainfall_df[rainfall_df[district_col] != 'State Average'].nlargest(num, total_rainfall_col)
-            response['data'] = data
-            
-            top_district = data.iloc[0][district_col]
-            top_rainfall = data.iloc[0][total_rainfall_col]
-            
-            response['text'] = f"## 🏆 Top {num} Districts by Rainfall (2017-18)\n\n"
-            response['text'] += f"### Highest Rainfall:\n"
-            response['text'] += f"**{top_district}** with **{top_rainfall:.1f} mm**\n\n"
-            response['text'] += f"### Complete Ranking:\n"
-            
-            for idx, row in data.head(num).iterrows():
-                rank = list(data.index).index(idx) + 1
-                response['text'] += f"{rank}. **{row[district_col]}**: {row[total_rainfall_col]:.1f} mm\n"
-            
-            response['text'] += f"\n*[Source: India Meteorological Department via data.gov.in]*"
-        
-        elif 'lowest' in question_lower or 'minimum' in question_lower or 'least' in question_lower:
-            data = rainfall_df[rainfall_df[district_col] != 'State Average'].nsmallest(10, total_rainfall_col)
-            response['data'] = data
-            
-            bottom_district = data.iloc[0][district_col]
-            bottom_rainfall = data.iloc[0][total_rainfall_col]
-            
-            response['text'] = f"## 📉 Districts with Lowest Rainfall (2017-18)\n\n"
-            response['text'] += f"### Lowest Rainfall:\n"
-            response['text'] += f"**{bottom_district}** with **{bottom_rainfall:.1f} mm**\n\n"
-            response['text'] += f"### Bottom 10 Districts:\n"
-            
-            for idx, row in data.head(10).iterrows():
-                rank = list(data.index).index(idx) + 1
-                response['text'] += f"{rank}. **{row[district_col]}**: {row[total_rainfall_col]:.1f} mm\n"
-            
-            response['text'] += f"\n*[Source: India Meteorological Department via data.gov.in]*"
-        
-        elif 'average' in question_lower or 'mean' in question_lower:
-            state_avg_data = rainfall_df[rainfall_df[district_col] == 'State Average']
-            if len(state_avg_data) > 0:
-                response['data'] = state_avg_data
-                avg_rainfall = state_avg_data[total_rainfall_col].values[0]
-                response['text'] = f"## 📊 Tamil Nadu State Average Rainfall (2017-18)\n\n"
-                response['text'] += f"**Average Annual Rainfall**: {avg_rainfall:.1f} mm\n\n"
-                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
-            else:
-                avg_rainfall = rainfall_df[rainfall_df[district_col] != 'State Average'][total_rainfall_col].mean()
-                response['text'] = f"## 📊 Tamil Nadu Average Rainfall (2017-18)\n\n"
-                response['text'] += f"**Calculated Average**: {avg_rainfall:.1f} mm (across {len(rainfall_df)-1} districts)\n\n"
-                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
-                response['data'] = rainfall_df.head(15)
-        
-        else:
-            data = rainfall_df.head(15)
-            response['data'] = data
-            response['text'] = f"## 🌧️ Tamil Nadu Rainfall Data (2017-18)\n\n"
-            response['text'] += f"Showing rainfall data for {len(rainfall_df)} districts including seasonal breakdowns.\n\n"
-            response['text'] += "**Available Data:**\n"
-            response['text'] += "- South West Monsoon (June-September)\n"
-            response['text'] += "- North East Monsoon (October-December)\n"
-            response['text'] += "- Winter Season (January-February)\n"
-            response['text'] += "- Hot Weather Season (March-May)\n\n"
-            response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
-    
-    # CROP QUERIES
-    elif any(word in question_lower for word in ['crop', 'production', 'agriculture', 'farming', 'paddy', 'rice', 'wheat', 'productivity', 'yield', 'area', 'maize', 'ragi', 'jowar', 'bajra']):
-        response['data_type'] = 'crops'
-        
-        crop_col = 'District'
-        area_col = 'Area (Ha)'
-        production_col = 'Production (Tonnes)'
-        productivity_col = 'Productivity. (Tonnes/Ha)'
-
-        
-        # Check for specific crops
-        crops_mentioned = []
-        for crop in crop_df[crop_col].values:
-            if str(crop).lower() in question_lower:
-                crops_mentioned.append(crop)
-        
-        if crops_mentioned:
-            data = crop_df[crop_df[crop_col].isin(crops_mentioned)]
-            response['data'] = data
-            
-            response['text'] = f"## 🌾 Crop Production Analysis (Tamil Nadu 2012-13)\n\n"
-            
-            for crop in crops_mentioned[:5]:  # Show max 5 crops
-                if crop in data[crop_col].values:
-                    crop_data = data[data[crop_col] == crop].iloc[0]
-                    
-                    response['text'] += f"### {crop}\n"
-                    response['text'] += f"- **Area Under Cultivation**: {crop_data[area_col]:.2f} thousand hectares\n"
-                    response['text'] += f"- **Total Production**: {crop_data[production_col]:.2f} thousand metric tonnes\n"
-                    response['text'] += f"- **Productivity**: {crop_data[productivity_col]:.0f} kg per hectare\n\n"
-            
-            response['text'] += "*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
-        
-        elif 'production' in question_lower or 'produce' in question_lower or 'top' in question_lower:
-            num = 10
-            if 'top 5' in question_lower or '5 highest' in question_lower:
-                num = 5
-            elif 'top 3' in question_lower:
-                num = 3
-            
-            data = crop_df.nlargest(num, production_col)
-            response['data'] = data
-            
-            top_crop = data.iloc[0][crop_col]
-            top_production = data.iloc[0][production_col]
-            
-            response['text'] = f"## 🏆 Top {num} Crops by Production (Tamil Nadu 2012-13)\n\n"
-            response['text'] += f"### Highest Production:\n"
-            response['text'] += f"**{top_crop}** with **{top_production:.2f} thousand metric tonnes**\n\n"
-            response['text'] += f"### Complete Ranking:\n\n"
-            
-            for idx, row in data.head(num).iterrows():
-                rank = list(data.index).index(idx) + 1
-                response['text'] += f"{rank}. **{row[crop_col]}**: {row[production_col]:.2f} thousand MT\n"
-            
-            response['text'] += f"\n*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
-        
-        elif 'productivity' in question_lower or 'yield' in question_lower:
-            crop_df_clean = crop_df[crop_df[productivity_col] > 0]
-            data = crop_df_clean.nlargest(10, productivity_col)
-            response['data'] = data
-            
-            top_crop = data.iloc[0][crop_col]
-            top_productivity = data.iloc[0][productivity_col]
-            
-            response['text'] = f"## 📈 Top 10 Crops by Productivity (Tamil Nadu 2012-13)\n\n"
-            response['text'] += f"### Highest Yield:\n"
-            response['text'] += f"**{top_crop}** with **{top_productivity:.0f} kg per hectare**\n\n"
-            response['text'] += f"### Complete Ranking:\n\n"
-            
-            for idx, row in data.head(10).iterrows():
-                rank = list(data.index).index(idx) + 1
-                response['text'] += f"{rank}. **{row[crop_col]}**: {row[productivity_col]:.0f} kg/ha\n"
-            
-            response['text'] += f"\n*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
-        
-        elif 'area' in question_lower:
-            data = crop_df.nlargest(10, area_col)
-            response['data'] = data
-            
-            response['text'] = f"## 📏 Top 10 Crops by Cultivation Area (Tamil Nadu 2012-13)\n\n"
-            
-            for idx, row in data.head(10).iterrows():
-                rank = list(data.index).index(idx) + 1
-                response['text'] += f"{rank}. **{row[crop_col]}**: {row[area_col]:.2f} thousand hectares\n"
-            
-            response['text'] += f"\n*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
-        
-        else:
-            data = crop_df.head(10)
-            response['data'] = data
-            response['text'] = f"## 🌾 Tamil Nadu Crop Production Statistics (2012-13)\n\n"
-            response['text'] += f"Showing production, area, and productivity data for major crops in Tamil Nadu.\n\n"
-            response['text'] += f"**Total Crops in Dataset**: {len(crop_df)}\n\n"
-            response['text'] += "*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
-    
-    # CORRELATION/COMPARISON QUERIES
-    elif any(word in question_lower for word in ['correlate', 'correlation', 'relationship', 'impact', 'affect']):
-        response['data_type'] = 'both'
-        response['data'] = {
-            'rainfall': rainfall_df.head(10),
-            'crops': crop_df.head(10)
-        }
-        
-        response['text'] = f"## 🔗 Agriculture & Climate Data Analysis\n\n"
-        response['text'] += f"### Available Datasets:\n\n"
-        response['text'] += f"**1. Rainfall Data (2017-18)**\n"
-        response['text'] += f"- 32 districts in Tamil Nadu\n"
-        response['text'] += f"- Seasonal and annual rainfall measurements\n"
-        response['text'] += f"- Source: India Meteorological Department\n\n"
-        response['text'] += f"**2. Crop Production Data (2012-13)**\n"
-        response['text'] += f"- {len(crop_df)} major crops in Tamil Nadu\n"
-        response['text'] += f"- Area, production, and productivity metrics\n"
-        response['text'] += f"- Source: Ministry of Agriculture & Farmers Welfare\n\n"
-        response['text'] += f"**Note**: The datasets cover different time periods (2012-13 for crops, 2017-18 for rainfall), which allows for historical trend analysis.\n\n"
-        response['text'] += "*[Sources: IMD & Ministry of Agriculture via data.gov.in]*"
-    
-    # DEFAULT: Show both datasets
-    else:
-        response['data_type'] = 'both'
-        response['data'] = {
-            'rainfall': rainfall_df.head(10),
-            'crops': crop_df.head(10)
-        }
-        
-        response['text'] = f"## 🌾 AgriClimate Intelligence System\n\n"
-        response['text'] += f"I have access to real data from **data.gov.in**:\n\n"
-        response['text'] += f"### 📊 Available Datasets:\n\n"
-        response['text'] += f"**1. Rainfall Data (2017-18)**\n"
-        response['text'] += f"- 32 districts in Tamil Nadu\n"
-        response['text'] += f"- Seasonal rainfall patterns\n"
-        response['text'] += f"- Source: India Meteorological Department\n\n"
-        response['text'] += f"**2. Crop Production Data (2012-13)**\n"
-        response['text'] += f"- {len(crop_df)} crops\n"
-        response['text'] += f"- Production, area, and productivity statistics\n"
-        response['text'] += f"- Source: Ministry of Agriculture & Farmers Welfare\n\n"
-        response['text'] += f"### 💡 You can ask me:\n"
-        response['text'] += f"- Which district has the highest rainfall?\n"
-        response['text'] += f"- Compare rainfall between Chennai and Coimbatore\n"
-        response['text'] += f"- Show top 5 crops by production\n"
-        response['text'] += f"- What is paddy production in Tamil Nadu?\n"
-        response['text'] += f"- Which crops have the highest productivity?\n\n"
-        response['text'] += "*[Data sourced from data.gov.in]*"
-    
-    return response
+@st.cache_resource
+def get_answer_cache():
+    """Answer cache shared by every session of this process"""
+    return AnswerCache()
+
+@st.cache_resource
+def get_chart_cache():
+    """Rendered chart images shared by every session of this process"""
+    return ChartCache()
+
+with st.spinner("Loading datasets from data.gov.in..."):
+    snapshot = load_snapshot()
 
 # Sidebar
 with st.sidebar:
     st.title("🌾 AgriClimate Intelligence")
     st.markdown("### 📊 Data Sources from data.gov.in")
     
-    metadata = load_metadata()
+    metadata = snapshot.metadata if snapshot is not None else engine.load_metadata()
     
     for dataset_name, info in metadata.items():
         with st.expander(f"📄 {info['title']}", expanded=False):
@@ -392,6 +65,8 @@ with st.sidebar:
             st.write(f"**Years:** {info['years_covered']}")
             if 'description' in info:
                 st.write(f"**Details:** {info['description']}")
+    if snapshot is not None and get_registry().last_error:
+        st.warning(f"⚠️ Reloading the data failed, still serving the previous version: {get_registry().last_error}")
     
     st.markdown("---")
     st.markdown("### 💡 Sample Questions")
@@ -413,17 +88,42 @@ with st.sidebar:
     - Correlate rainfall with agriculture
     """)
     
+    with st.expander("⚡ Answer Cache", expanded=False):
+        stats = get_answer_cache().stats()
+        st.caption(f"{stats['hits']} hits · {stats['misses']} misses · {stats['evictions']} evictions · "
+                   f"{stats['hit_rate']:.0%} hit rate · {stats['entries']} entries")
+        charts = get_chart_cache().stats()
+        st.caption(f"Charts: {charts['hits']} hits · {charts['misses']} renders · {charts['evictions']} evictions · "
+                   f"{charts['bytes'] / 1024:.0f} KiB")
+    
+    with st.expander("⏱️ Latency", expanded=False):
+        # Recording is process-wide, so it is switched for the whole server (AGRICLIMATE_PROFILE=1),
+        # not from a session
+        if not recorder.enabled:
+            st.caption("Recording is off; start the app with `AGRICLIMATE_PROFILE=1` to record stage timings.")
+        summary = recorder.summary()
+        if summary:
+            st.dataframe(
+                [{"stage": stage, "calls": stats["count"],
+                  **{q: f"{stats[q] * 1000:.2f} ms" for q in ("p50", "p95", "p99")}}
+                 for stage, stats in summary.items()],
+                hide_index=True, width="stretch"
+            )
+            st.download_button("JSON", recorder.to_json(), "latency.json", "application/json")
+            st.download_button("Prometheus", recorder.to_prometheus(), "latency.prom", "text/plain")
+        elif recorder.enabled:
+            st.caption("No timings recorded yet.")
+    
     if st.button("🗑️ Clear Chat History"):
-        st.session_state.chat_history = []
+        st.session_state.chat_history.clear()
         st.rerun()
 
 # Main content
 st.title("🌾 AgriClimate Intelligence System")
 st.markdown("*Powered by Tamil Nadu's Agriculture & Climate Data from **data.gov.in***")
 
-# Load data
-with st.spinner("Loading datasets from data.gov.in..."):
-    rainfall_df, crop_df = load_datasets()
+# Data of this run
+rainfall_df, crop_df, views = snapshot[:3] if snapshot is not None else (None, None, None)
 
 if rainfall_df is None or crop_df is None:
     st.error("⚠️ Could not load datasets. Please ensure CSV files are in the 'data/' folder.")
@@ -453,11 +153,7 @@ if user_question:
     current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # --- Save user's message ---
-    st.session_state.chat_history.append({
-        "role": "user",
-        "content": user_question,
-        "time": current_time
-    })
+    st.session_state.chat_history.append("user", user_question, current_time)
 
     # --- Display user message (no timestamp here) ---
     with st.chat_message("user"):
@@ -466,53 +162,112 @@ if user_question:
     # --- Process and display bot's response ---
     with st.chat_message("assistant"):
         with st.spinner("🔍 Analyzing data from data.gov.in..."):
-            result = analyze_question(user_question, rainfall_df, crop_df)
+            result = analyze_question(user_question, rainfall_df, crop_df, views, get_answer_cache())
             bot_text = result["text"]
 
             # --- Timestamp for bot reply ---
             response_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             # --- Save bot message ---
-            st.session_state.chat_history.append({
-                "role": "assistant",
-                "content": bot_text,
-                "data": result.get("data"),
-                "time": response_time
-            })
+            # (row positions + the version of the answer's dataset instead of a copy of the frames;
+            # reloading the other dataset leaves the rows valid)
+            st.session_state.chat_history.append(
+                "assistant", bot_text, response_time,
+                result.get("data_type"), engine.selected_rows(result),
+                engine.data_version(views, result.get("data_type"))
+            )
 
             # --- Display bot reply ---
+            render_watch = recorder.time('render')
             st.markdown(f"**🤖 AgriClimateBot:**\n\n{bot_text}")
 
+            # --- Chart: drawn once per result and dataset version, then served from the cache ---
+            chart = chart_png(result, engine.data_version(views, result.get("data_type")), get_chart_cache())
+            if chart is not None:
+                st.image(chart)
+
             # --- Show retrieved data ---
             if result.get("data") is not None:
                 with st.expander("📊 View Retrieved Data from data.gov.in", expanded=False):
                     if isinstance(result["data"], dict):
                         st.subheader("🌧️ Rainfall Data")
-                        st.dataframe(result["data"]["rainfall"], use_container_width=True)
+                        st.dataframe(with_labels(result["data"]["rainfall"], views["rainfall_labels"]), use_container_width=True)
                         st.caption("📍 Source: India Meteorological Department via data.gov.in")
 
                         st.subheader("🌾 Crop Production Data")
-                        st.dataframe(result["data"]["crops"], use_container_width=True)
+                        st.dataframe(with_labels(result["data"]["crops"], views["crop_labels"]), use_container_width=True)
                         st.caption("📍 Source: Ministry of Agriculture & Farmers Welfare via data.gov.in")
                     else:
-                        st.dataframe(result["data"], use_container_width=True)
+                        labels = views["crop_labels"] if result.get("data_type") == "crops" else views["rainfall_labels"]
+                        st.dataframe(with_labels(result["data"], labels), use_container_width=True)
                         if result.get("data_type") == "rainfall":
                             st.caption("📍 Source: India Meteorological Department via data.gov.in")
                         elif result.get("data_type") == "crops":
                             st.caption("📍 Source: Ministry of Agriculture & Farmers Welfare via data.gov.in")
+            render_watch.stop()
+
+    # Optional Prometheus textfile for a local collector (e.g. node_exporter)
+    if recorder.enabled and os.environ.get("AGRICLIMATE_METRICS_FILE"):
+        recorder.write_textfile(os.environ["AGRICLIMATE_METRICS_FILE"])
 
 # --- Conversation History (Collapsible Section) ---
-with st.expander("💬 Conversation History", expanded=False):
-    if len(st.session_state.chat_history) == 0:
-        st.info("No chat history yet.")
+HISTORY_PAGE_SIZE = 10
+
+def set_history_page(page):
+    st.session_state.history_page = page
+
+def show_message_data(msg):
+    """Frames behind a past answer, rebuilt from its row positions in the current datasets"""
+    data = message_data(msg, rainfall_df, crop_df, engine.data_version(views, msg.data_type))
+    if data is None:
+        st.caption("The datasets were reloaded since this answer; ask again to see its data.")
+    elif isinstance(data, dict):
+        st.dataframe(with_labels(data["rainfall"], views["rainfall_labels"]), width="stretch")
+        st.dataframe(with_labels(data["crops"], views["crop_labels"]), width="stretch")
     else:
-        for msg in st.session_state.chat_history:
-            role_label = "🧑‍💻 You" if msg["role"] == "user" else "🤖 AgriClimateBot"
+        labels = views["crop_labels"] if msg.data_type == "crops" else views["rainfall_labels"]
+        st.dataframe(with_labels(data, labels), width="stretch")
+
+# A fragment: opening, closing and paging rerun only this block, not the whole app.
+# Streamlit does not report whether an expander is open, so a toggle stands in for
+# it and nothing below it is built while it is off.
+@st.fragment
+def conversation_history():
+    history = st.session_state.chat_history
+    if not st.toggle(f"💬 Conversation History ({len(history)})", key="show_history"):
+        return
+    with st.container(border=True):
+        if len(history) == 0:
+            st.info("No chat history yet.")
+            return
+        if history.dropped:
+            st.caption(f"{history.dropped} older messages could not be saved and are not shown.")
+
+        pages = -(-len(history) // HISTORY_PAGE_SIZE)
+        page = min(st.session_state.get("history_page", 0), pages - 1)
+        messages = history.latest(HISTORY_PAGE_SIZE, page * HISTORY_PAGE_SIZE)
+        first = len(history) - page * HISTORY_PAGE_SIZE - len(messages)
+        for index, msg in enumerate(messages, first):
+            role_label = "🧑‍💻 You" if msg.role == "user" else "🤖 AgriClimateBot"
             st.markdown(
                 f"<div style='padding:8px; margin-bottom:5px; border-radius:10px; background-color:#1e2128;'>"
-                f"<b>{role_label}</b> <span style='color:gray;'>({msg['time']})</span><br>{msg['content']}</div>",
+                f"<b>{role_label}</b> <span style='color:gray;'>({msg.time})</span><br>{msg.content}</div>",
                 unsafe_allow_html=True
             )
+            # Only answers the user opens get their rows looked up again
+            if msg.rows is not None and st.toggle("📊 Data", key=f"history_data_{index}"):
+                show_message_data(msg)
+
+        if pages > 1:
+            # Callbacks move the page before the fragment reruns
+            older, position, newer = st.columns([1, 2, 1])
+            older.button("⬅️ Older", disabled=page == pages - 1, key="history_older",
+                         on_click=set_history_page, args=(page + 1,))
+            position.caption(f"Page {page + 1} of {pages} (newest first)")
+            newer.button("Newer ➡️", disabled=page == 0, key="history_newer",
+                         on_click=set_history_page, args=(page - 1,))
+
+conversation_history()
 
 st.markdown("""
 <style>
@@ -0,0 +1,136 @@
+"""Answer a file of questions offline, in parallel, as JSONL.
+
+Questions are read one per line (plain text, or JSON objects with a
+"question" field) from a file or stdin. They are answered by
+engine.analyze_question across a pool of worker processes, each of which
+loads the datasets once, and the answers are written as JSON lines in input
+order while later questions are still being processed.
+
+    python batch.py questions.txt -o answers.jsonl --workers 8
+    cat questions.txt | python batch.py - > answers.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import engine
+from answer_cache import AnswerCache
+
+
+DEFAULT_CHUNK = 64
+
+# Per-process state, set up once by init_worker
+_datasets = None
+_cache = None
+
+
+def init_worker(data_dir=None):
+    global _datasets, _cache
+    # Workers forked after the parent loaded the data inherit it as is
+    if _datasets is None:
+        _datasets = engine.load_datasets(data_dir)
+        _cache = AnswerCache()
+
+
+def answer_chunk(items):
+    """Answer a list of (index, question) pairs in this worker."""
+    rainfall_df, crop_df, views = _datasets
+    # Intents for the whole chunk come from one batched classifier pass
+    routes = engine.router.route_batch([question for _, question in items])
+    results = []
+    for (index, question), route in zip(items, routes):
+        response = engine.analyze_question(question, rainfall_df, crop_df, views, _cache, route)
+        results.append({
+            "index": index,
+            "question": question,
+            "intent": response.get("intent"),
+            "data_type": response.get("data_type"),
+            "text": response["text"],
+            "rows": engine.selected_rows(response),
+        })
+    return results
+
+
+def read_questions(stream):
+    """(index, question) pairs from plain-text or JSONL input, skipping blank lines."""
+    index = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            line = json.loads(line)["question"]
+        yield index, line
+        index += 1
+
+
+def chunked(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_results(results, out):
+    for result in results:
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return len(results)
+
+
+def run(questions, out, workers=None, chunk_size=DEFAULT_CHUNK, data_dir=None):
+    """Answer ``questions`` and write JSONL to ``out``; returns the answer count."""
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(questions, chunk_size)
+    count = 0
+    # Load (and if needed build the column stores) once before any worker starts
+    init_worker(data_dir)
+    if workers == 1:
+        for chunk in chunks:
+            count += write_results(answer_chunk(chunk), out)
+        return count
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(data_dir,)) as pool:
+        # Keep a bounded number of chunks in flight and write them back in submission order
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(answer_chunk, chunk))
+            if len(pending) >= workers * 4:
+                count += write_results(pending.popleft().result(), out)
+        while pending:
+            count += write_results(pending.popleft().result(), out)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer questions in bulk with the AgriClimateBot engine")
+    parser.add_argument("input", nargs="?", default="-", help="question file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file, or - for stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="questions per task")
+    parser.add_argument("--data-dir", default=None, help="directory holding the dataset CSVs")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        count = run(read_questions(source), out, args.workers, args.chunk_size, args.data_dir)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Answered {count} questions in {elapsed:.2f} s ({count / elapsed if elapsed else 0:.0f} questions/sec, "
+          f"{args.workers or os.cpu_count()} workers)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
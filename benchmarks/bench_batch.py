@@ -0,0 +1,64 @@
+"""Benchmark: batch.py throughput and scaling with the number of workers.
+
+    python benchmarks/bench_batch.py [questions] [max_workers]
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import batch
+
+TEMPLATES = [
+    "Which district has the highest rainfall?",
+    "Show top {n} districts by rainfall",
+    "Show the {n} lowest rainfall districts",
+    "What is the average rainfall in Tamil Nadu?",
+    "Compare {a} and {b} rainfall",
+    "How much rain did {a} get?",
+    "Show top {n} crops by production",
+    "Which crops have the highest productivity?",
+    "Top {n} crops by cultivation area",
+    "What is the crop production in {a}?",
+    "Correlate rainfall with agriculture",
+    "hello",
+]
+DISTRICTS = ["Chennai", "Coimbatore", "Madurai", "Salem", "Erode", "Vellore", "Theni", "Karur",
+             "Thanjavur", "Tirunelveli", "Dindigul", "Namakkal", "Cuddalore", "The Nilgiris"]
+
+
+def questions(count, seed=5):
+    rng = random.Random(seed)
+    for i in range(count):
+        a, b = rng.sample(DISTRICTS, 2)
+        yield i, rng.choice(TEMPLATES).format(n=rng.randint(1, 30), a=a, b=b)
+
+
+class NullWriter:
+    def write(self, text):
+        pass
+
+
+def main(count, max_workers):
+    worker_counts = sorted({1, 2, 4, 8, 16, max_workers} & set(range(1, max_workers + 1)))
+    print(f"{count} questions, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>8} {'questions/sec':>14} {'speedup':>8}")
+    batch.init_worker()  # load once up front so every run starts warm
+    baseline = None
+    for workers in worker_counts:
+        batch._cache.clear()  # forked workers would otherwise inherit a warm answer cache
+        start = time.perf_counter()
+        answered = batch.run(questions(count), NullWriter(), workers=workers)
+        elapsed = time.perf_counter() - start
+        rate = answered / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {elapsed:>8.2f} {rate:>14.0f} {rate / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1)
@@ -0,0 +1,83 @@
+"""Benchmark: chart rendering, the chart cache and figure memory.
+
+Times drawing each chart kind from scratch and serving it from the
+ChartCache, at the real size and for a threshold answer over a synthetic
+dataset (where only the first MAX_BARS rows are drawn), then renders a few
+hundred distinct charts without a cache and reports the RSS growth, which
+stays flat when every figure is released after use.
+
+    python benchmarks/bench_charts.py [rows]
+"""
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import engine
+from charts import ChartCache, chart_png
+from synthetic import write_datasets
+
+QUESTIONS = {
+    "comparison": "Compare Chennai and Coimbatore rainfall",
+    "top_n": "Show top 10 districts by rainfall",
+    "productivity": "Which crops have the highest productivity?",
+}
+LEAK_RENDERS = 300
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(label, response, version):
+    cache = ChartCache()
+    png = chart_png(response, version, cache)
+    print(f"{label:>22} {len(response['data']):>9} {len(png) / 1024:>8.1f} "
+          f"{best_of(lambda: chart_png(response, version)):>10.1f} "
+          f"{best_of(lambda: chart_png(response, version, cache)) * 1e3:>10.1f}")
+
+
+def main(rows):
+    print(f"{'chart':>22} {'rows':>9} {'png KiB':>8} {'render ms':>10} {'cached us':>10}")
+    rainfall_df, crop_df, views = engine.load_datasets()
+    for label, question in QUESTIONS.items():
+        measure(label, engine.analyze_question(question, rainfall_df, crop_df, views), views["version"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_datasets(tmp, rows)
+        shutil.copy(ROOT / "data" / "dataset.json", Path(tmp) / "dataset.json")
+        rainfall_df, crop_df, views = engine.load_datasets(tmp)
+        response = engine.analyze_question("districts with more than 1000 mm rainfall", rainfall_df, crop_df, views)
+        measure("threshold (synthetic)", response, views["version"])
+
+        # Distinct charts (a different top-N each time), no cache: RSS should not climb
+        gc.collect()
+        before = rss_bytes()
+        for i in range(LEAK_RENDERS):
+            response = engine.analyze_question(f"Show top {2 + i % 28} districts by rainfall",
+                                               rainfall_df, crop_df, views)
+            chart_png(response, None)
+        gc.collect()
+        growth = rss_bytes() - before
+    print(f"RSS growth over {LEAK_RENDERS} uncached renders: {growth / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,90 @@
+"""Benchmark: memory held by one session's chat history as it grows.
+
+Compares the old list of message dicts holding the result frames with
+ChatHistory (row positions + dataset version, ring buffer spilled to
+SQLite), using tracemalloc for the heap each one retains, and reports the
+cost of appending a message.
+
+    python benchmarks/bench_chat_history.py [turns ...]
+"""
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import engine
+from chat_history import ChatHistory
+
+QUESTIONS = [
+    "How much rain did Chennai get?",
+    "Show top 10 districts by rainfall",
+    "Show top 5 crops by production",
+    "Correlate rainfall with agriculture",
+    "Tell me about the district data",
+]
+TIME = "2025-01-01 00:00:00"
+
+
+def answers(turns, datasets):
+    rainfall_df, crop_df, views = datasets
+    results = [engine.analyze_question(q, rainfall_df, crop_df, views) for q in QUESTIONS]
+    return [(QUESTIONS[i % len(QUESTIONS)], results[i % len(QUESTIONS)]) for i in range(turns)]
+
+
+def old_history(turns):
+    messages = []
+    for question, result in turns:
+        # The old app stored each answer's own frames
+        data = result.get("data")
+        if isinstance(data, dict):
+            data = {name: frame.copy() for name, frame in data.items()}
+        elif data is not None:
+            data = data.copy()
+        messages.append({"role": "user", "content": question, "time": TIME})
+        messages.append({"role": "assistant", "content": result["text"], "data": data, "time": TIME})
+    return messages
+
+
+def compact_history(turns, version, spill_path):
+    messages = ChatHistory(spill_path=spill_path)
+    for question, result in turns:
+        messages.append("user", question, TIME)
+        messages.append("assistant", result["text"], TIME,
+                        result["data_type"], engine.selected_rows(result), version)
+    return messages
+
+
+def retained(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, held
+
+
+def main(sizes):
+    datasets = engine.load_datasets()
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_path = Path(tmp) / "history.sqlite"
+        print(f"{'turns':>7} {'frames in history KiB':>22} {'ChatHistory KiB':>16} {'nbytes KiB':>11} "
+              f"{'spilled':>8} {'append us':>10}")
+        for count in sizes:
+            turns = answers(count, datasets)
+            old, _ = retained(lambda: old_history(turns))
+            start = time.perf_counter()
+            new, history = retained(lambda: compact_history(turns, datasets[2]["version"], spill_path))
+            per_append = (time.perf_counter() - start) / (2 * count) * 1e6
+            print(f"{count:>7} {old / 1024:>22.1f} {new / 1024:>16.1f} {history.nbytes() / 1024:>11.1f} "
+                  f"{history.spilled:>8} {per_append:>10.1f}")
+            history.clear()
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 100, 1000, 5000])
@@ -0,0 +1,55 @@
+"""Benchmark: district join and rainfall/productivity statistics at scale.
+
+Synthetic datasets repeat a pool of 700 district names, standing in for
+several years of all-India data. Times the join build (uncached), a cached
+join lookup and the findings computation.
+
+    python benchmarks/bench_correlation.py [rows ...]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import engine
+from correlation import build_join, cached_join, rainfall_findings
+from synthetic import write_datasets
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def measure(label, rainfall_df, crop_df, version):
+    joined = build_join(rainfall_df, crop_df)
+    cached_join(version, rainfall_df, crop_df)
+    print(f"{label:>10} {len(rainfall_df):>10} {len(joined):>9} "
+          f"{best_of(lambda: build_join(rainfall_df, crop_df)):>9.2f} "
+          f"{best_of(lambda: cached_join(version, rainfall_df, crop_df)) * 1e3:>10.1f} "
+          f"{best_of(lambda: rainfall_findings(joined)):>11.2f}")
+
+
+def main(sizes):
+    print(f"{'dataset':>10} {'rows':>10} {'districts':>9} {'join ms':>9} {'cached us':>10} {'findings ms':>11}")
+    rainfall_df, crop_df, views = engine.load_datasets()
+    measure("real", rainfall_df, crop_df, views["version"])
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_datasets(tmp, rows)
+            shutil.copy(ROOT / "data" / "dataset.json", Path(tmp) / "dataset.json")
+            rainfall_df, crop_df, views = engine.load_datasets(tmp)
+            measure("synthetic", rainfall_df, crop_df, views["version"])
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 100_000, 1_000_000])
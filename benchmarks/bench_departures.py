@@ -0,0 +1,81 @@
+"""Benchmark: seasonal departure table build and category lookups at scale.
+
+Checks first that threshold questions worded like a category ("in excess
+of 1000 mm") are not answered as departures. Then times building the
+DepartureTable over every season, a cached lookup of the table for an
+already loaded version, and "deficient NE monsoon" as a slice of the
+prebuilt index against computing it from the raw columns (percent, mask and
+sort) on every question.
+
+    python benchmarks/bench_departures.py [rows ...]
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import numpy as np
+
+import engine
+from departures import DEFICIENT_BELOW, DepartureTable, cached_departures
+from synthetic import write_datasets
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def scan(rainfall_df):
+    actual = rainfall_df["ne_actual"].to_numpy(dtype=float)
+    normal = rainfall_df["ne_normal"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = (actual - normal) / normal * 100
+    positions = np.flatnonzero(percent <= DEFICIENT_BELOW)
+    return positions[np.argsort(percent[positions], kind="stable")]
+
+
+def check(rainfall_df, crop_df, views):
+    """Category questions get the departure list; thresholds worded like one stay filters."""
+    excess = engine.analyze_question("Which districts had excess rainfall?", rainfall_df, crop_df, views)
+    assert "Excess Annual Rainfall" in excess["text"], excess["text"]
+    above = engine.analyze_question("districts with rainfall in excess of 1000 mm", rainfall_df, crop_df, views)
+    expected = views["rainfall_rankings"]["total_actual"].between(1000, None, low_inclusive=False)
+    assert "above 1000 mm" in above["text"] and len(above["data"]) == len(expected) == 17, above["text"]
+
+
+def measure(label, rainfall_df, version):
+    table = cached_departures(version, rainfall_df)
+    matches = len(table.lookup("ne", "deficient"))
+    print(f"{label:>10} {len(rainfall_df):>10} {matches:>9} "
+          f"{best_of(lambda: DepartureTable(rainfall_df)) / 1e3:>9.2f} "
+          f"{best_of(lambda: cached_departures(version, rainfall_df)):>10.1f} "
+          f"{best_of(lambda: table.lookup('ne', 'deficient')):>10.1f} "
+          f"{best_of(lambda: scan(rainfall_df)):>10.1f}")
+
+
+def main(sizes):
+    print(f"{'dataset':>10} {'rows':>10} {'deficient':>9} {'build ms':>9} "
+          f"{'cached us':>10} {'lookup us':>10} {'scan us':>10}")
+    rainfall_df, crop_df, views = engine.load_datasets()
+    check(rainfall_df, crop_df, views)
+    measure("real", rainfall_df, views["version"])
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_datasets(tmp, rows)
+            shutil.copy(ROOT / "data" / "dataset.json", Path(tmp) / "dataset.json")
+            rainfall_df, _, views = engine.load_datasets(tmp)
+            measure("synthetic", rainfall_df, views["version"])
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 100_000, 1_000_000])
@@ -0,0 +1,46 @@
+"""Benchmark: cold ``import engine`` time, checked against a target.
+
+Every sample is a fresh interpreter. The script exits non-zero when the best
+sample is over the target or when importing the engine pulled in a heavy
+library, so it can gate changes in CI.
+
+    python benchmarks/bench_engine_import.py [target_ms]
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGET_MS = 150.0
+SAMPLES = 7
+HEAVY = ["streamlit", "pandas", "numpy", "sklearn", "nltk", "matplotlib"]
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import engine
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def sample():
+    code = CHILD.format(root=str(ROOT), heavy=HEAVY)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main(target_ms):
+    samples = [sample() for _ in range(SAMPLES)]
+    times = sorted(s["ms"] for s in samples)
+    heavy = sorted({m for s in samples for m in s["heavy"]})
+    print(f"import engine: best {times[0]:.1f} ms, median {times[len(times) // 2]:.1f} ms "
+          f"(target {target_ms:.0f} ms)")
+    print(f"heavy modules imported: {', '.join(heavy) or 'none'}")
+    return 0 if times[0] <= target_ms and not heavy else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else TARGET_MS))
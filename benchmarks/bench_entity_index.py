@@ -0,0 +1,57 @@
+"""Micro-benchmark: district extraction latency as the number of districts grows.
+
+Compares EntityIndex.find (exact and fuzzy) with the old per-row
+``district.lower() in question`` loop.
+
+    python benchmarks/bench_entity_index.py
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from entity_index import EntityIndex
+
+QUESTIONS = [
+    "Compare Chennai and Coimbatore rainfall",
+    "Compare rainfall in Chennai and Coimbatur",
+    "Which district has highest rainfall?",
+    "Show rainfall for The Nilgiris",
+]
+SIZES = [32, 700, 10000, 100000]
+
+
+def district_names(count, seed=11):
+    rng = random.Random(seed)
+    names = ["Chennai", "Coimbatore", "The Nilgiris"]
+    while len(names) < count:
+        names.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))).title())
+    return names
+
+
+def row_scan(question, names):
+    q = question.lower()
+    return [n for n in names if n.lower() in q]
+
+
+def per_question_us(func, number):
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    return best / (number * len(QUESTIONS)) * 1e6
+
+
+def main():
+    print(f"{'districts':>10} {'index (us/q)':>13} {'exact only (us/q)':>18} {'row scan (us/q)':>16}")
+    for size in SIZES:
+        names = district_names(size)
+        index = EntityIndex(names)
+        fuzzy = per_question_us(lambda: [index.find(q) for q in QUESTIONS], 200)
+        exact = per_question_us(lambda: [index.find(q, fuzzy=False) for q in QUESTIONS], 200)
+        scan = per_question_us(lambda: [row_scan(q, names) for q in QUESTIONS], max(1, 20000 // size))
+        print(f"{size:>10} {fuzzy:>13.2f} {exact:>18.2f} {scan:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: data.gov.in fetcher against the offline stand-in API.
+
+First an end-to-end refresh: a copy of data/ whose dataset.json names
+stand-in resources is refreshed (the CSVs must come back byte for byte and
+load into the same dataset version), then refreshed again (all 304s).
+
+Then throughput over hundreds of resources at a few concurrency levels:
+a cold fetch (every page downloaded) and a revalidation from the on-disk
+cache (every page a 304).
+
+    python benchmarks/bench_fetcher.py [resources] [--page-size 10]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import engine
+import fetcher
+from dataset_store import DATASETS
+from standin_api import StandInAPI, recorded_resources
+
+API_KEY = "offline-key"
+CONCURRENCY = [1, 8, 32]  # at most standin_api.StandInServer.request_queue_size
+
+
+def end_to_end(page_size):
+    resources = {f"{name}-resource": (ROOT / "data" / file_name).read_bytes() for name, file_name in DATASETS.items()}
+    with StandInAPI(resources, API_KEY) as api, tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        metadata = json.loads((ROOT / "data" / "dataset.json").read_text())
+        for name in DATASETS:
+            metadata[name]["resource_id"] = f"{name}-resource"
+        (data_dir / "dataset.json").write_text(json.dumps(metadata))
+
+        first = fetcher.refresh(data_dir, api.url, API_KEY, page_size=page_size)
+        same = all((data_dir / f).read_bytes() == (ROOT / "data" / f).read_bytes() for f in DATASETS.values())
+        version = engine.load_datasets(data_dir)[2]["version"]
+        stats = Counter()
+        second = fetcher.refresh(data_dir, api.url, API_KEY, page_size=page_size, stats=stats)
+    print(f"refresh: {first}; identical CSVs: {same}; "
+          f"same version as data/: {version == engine.load_datasets()[2]['version']}")
+    print(f"again:   {second}; {stats['not_modified']}/{stats['requests']} pages not modified")
+
+
+def throughput(count, page_size):
+    resources = recorded_resources(count)
+    ids = {resource_id: resource_id for resource_id in resources}
+    print(f"\n{count} resources, {page_size} records per page")
+    print(f"{'concurrency':>11} {'run':>11} {'seconds':>8} {'resources/s':>12} {'requests/s':>11} {'connections':>12}")
+    for concurrency in CONCURRENCY:
+        with StandInAPI(resources, API_KEY) as api, tempfile.TemporaryDirectory() as tmp:
+            cache = fetcher.ResponseCache(tmp)
+            for run in ("cold", "revalidate"):
+                stats = Counter()
+                start = time.perf_counter()
+                results = asyncio.run(fetcher.fetch_all(ids, api.url, API_KEY, concurrency, page_size, cache, stats))
+                elapsed = time.perf_counter() - start
+                assert all(results[i] == resources[i] for i in ids), "fetched content differs"
+                print(f"{concurrency:>11} {run:>11} {elapsed:>8.2f} {count / elapsed:>12.0f} "
+                      f"{stats['requests'] / elapsed:>11.0f} {stats['connections']:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("resources", type=int, nargs="?", default=300)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args(argv)
+    end_to_end(args.page_size)
+    throughput(args.resources, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
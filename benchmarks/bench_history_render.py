@@ -0,0 +1,79 @@
+"""Benchmark: app rerun latency against conversation length.
+
+For 10, 100 and 1,000 messages, times a full rerun of app.py with the
+history panel closed and open (first page), and the former render-every-
+message loop on its own, and counts the elements each sends.
+
+    python benchmarks/bench_history_render.py [messages ...]
+"""
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from streamlit.testing.v1 import AppTest
+
+from bench_suite import history
+
+REPEAT = 5
+
+
+def legacy_history():
+    """The history block before pagination: every message, every rerun."""
+    import streamlit as st
+
+    with st.expander("💬 Conversation History", expanded=False):
+        for msg in st.session_state.chat_history:
+            role_label = "🧑‍💻 You" if msg.role == "user" else "🤖 AgriClimateBot"
+            st.markdown(
+                f"<div style='padding:8px; margin-bottom:5px; border-radius:10px; background-color:#1e2128;'>"
+                f"<b>{role_label}</b> <span style='color:gray;'>({msg.time})</span><br>{msg.content}</div>",
+                unsafe_allow_html=True
+            )
+
+
+def count_elements(node):
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def rerun(at):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples), count_elements(at._tree)
+
+
+def main(lengths):
+    print(f"{'messages':>9} {'closed ms':>10} {'open ms':>9} {'elements':>9} "
+          f"{'all messages ms':>16} {'elements':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for length in lengths:
+            messages = history(length, Path(tmp) / "history.sqlite")
+
+            at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=300)
+            at.session_state["chat_history"] = messages
+            at.run()
+            closed, _ = rerun(at)
+            at.toggle(key="show_history").set_value(True).run()
+            opened, open_elements = rerun(at)
+
+            legacy = AppTest.from_function(legacy_history, default_timeout=300)
+            legacy.session_state["chat_history"] = messages
+            legacy.run()
+            everything, legacy_elements = rerun(legacy)
+            print(f"{length:>9} {closed:>10.1f} {opened:>9.1f} {open_elements:>9} "
+                  f"{everything:>16.1f} {legacy_elements:>9}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 100, 1000])
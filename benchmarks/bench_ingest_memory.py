@@ -0,0 +1,59 @@
+"""Benchmark: peak RSS of streaming ingestion vs a whole-file ``pd.read_csv``.
+
+Each measurement runs in a fresh subprocess and reports that process's peak
+RSS, so the numbers do not leak into each other.
+
+    python benchmarks/bench_ingest_memory.py [rows ...]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from synthetic import write_rainfall_csv
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+mode, csv_path, store_path = sys.argv[1:4]
+start = time.perf_counter()
+if mode == "read_csv":
+    import pandas as pd
+    rows = len(pd.read_csv(csv_path))
+else:
+    from ingest import ingest_csv, load_schema
+    rows = ingest_csv(csv_path, store_path, load_schema("rainfall_data", {metadata!r}), chunksize=50_000)["rows"]
+print(json.dumps({{"rows": rows, "seconds": time.perf_counter() - start,
+                  "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+
+def measure(mode, csv_path, store_path):
+    code = CHILD.format(root=str(ROOT), metadata=str(ROOT / "data" / "dataset.json"))
+    out = subprocess.run([sys.executable, "-c", code, mode, str(csv_path), str(store_path)],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'CSV MiB':>8} {'read_csv peak MiB':>18} {'ingest peak MiB':>16} "
+          f"{'store MiB':>10} {'ingest s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            csv_path = write_rainfall_csv(Path(tmp) / f"rainfall_{rows}.csv", rows)
+            store_path = Path(tmp) / f"store_{rows}"
+            whole = measure("read_csv", csv_path, store_path)
+            streamed = measure("ingest", csv_path, store_path)
+            store_mib = sum(f.stat().st_size for f in store_path.iterdir()) / 2**20
+            print(f"{rows:>10} {csv_path.stat().st_size / 2**20:>8.1f} {whole['peak_rss_mib']:>18.1f} "
+                  f"{streamed['peak_rss_mib']:>16.1f} {store_mib:>10.1f} {streamed['seconds']:>9.2f}")
+            csv_path.unlink()
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000, 1_000_000, 3_000_000])
@@ -0,0 +1,96 @@
+"""Benchmark: trained intent classifier vs the keyword router.
+
+Accuracy is measured on benchmarks/intent_eval.tsv (hand-written questions;
+the run stops if any of them also occurs in the training set, ignoring case
+and punctuation) and on a held-out generated set with a different seed. Latency covers the artifact load, a single route and
+the batched path.
+
+    python benchmarks/bench_intent_classifier.py
+"""
+import csv
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from intent_examples import examples
+from intent_model import ClassifierRouter, IntentClassifier
+from intent_router import router as keyword_router
+
+EVAL_PATH = ROOT / "benchmarks" / "intent_eval.tsv"
+
+
+def load_eval():
+    with open(EVAL_PATH, newline="") as f:
+        return [(question, intent) for intent, question in csv.reader(f, delimiter="\t")]
+
+
+def normalized(question):
+    return " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+
+
+def check_disjoint(hand):
+    """The eval questions must not be training examples (intent_model.train's defaults)."""
+    training = {normalized(question) for question, _ in examples()}
+    shared = [question for question, _ in hand if normalized(question) in training]
+    assert not shared, f"eval questions found in the training set: {shared}"
+
+
+def accuracy(route, data):
+    misses = Counter()
+    correct = 0
+    for question, intent in data:
+        got = route(question).intent
+        correct += got == intent
+        if got != intent:
+            misses[(intent, got)] += 1
+    return correct / len(data), misses
+
+
+def per_call_us(fn, items, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        samples.append((time.perf_counter() - start) / len(items) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    import numpy  # noqa: F401  (time the artifact load, not the NumPy import)
+
+    loads = []
+    for _ in range(5):
+        start = time.perf_counter()
+        IntentClassifier.load()
+        loads.append((time.perf_counter() - start) * 1e3)
+    router = ClassifierRouter()
+
+    hand = load_eval()
+    check_disjoint(hand)
+    generated = examples(per_intent=60, seed=1)
+    print(f"artifact load: {statistics.median(loads):.1f} ms")
+    print(f"{'router':<22} {'eval acc':>9} {'held-out acc':>13} {'route us':>9}")
+    for name, route in [("keyword", keyword_router.route), ("classifier+fallback", router.route)]:
+        hand_acc, misses = accuracy(route, hand)
+        generated_acc, _ = accuracy(route, generated)
+        questions = [q for q, _ in hand]
+        print(f"{name:<22} {hand_acc:>9.1%} {generated_acc:>13.1%} {per_call_us(route, questions):>9.1f}")
+        for (expected, got), count in misses.most_common(5):
+            print(f"    {expected} -> {got}: {count}")
+
+    questions = [q for q, _ in generated] * 5
+    start = time.perf_counter()
+    router.route_batch(questions)
+    batched = (time.perf_counter() - start) / len(questions) * 1e6
+    print(f"batched route: {batched:.1f} us/question over {len(questions)} questions")
+
+
+if __name__ == "__main__":
+    main()
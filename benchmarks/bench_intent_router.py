@@ -0,0 +1,72 @@
+"""Micro-benchmark: per-question routing latency as the keyword vocabulary grows.
+
+Compares the compiled IntentRouter with the old chain of ``any(k in q ...)``
+substring scans over the same vocabulary.
+
+    python benchmarks/bench_intent_router.py
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from intent_router import CHAT_INTENTS, DOMAIN_INTENTS, OPERATIONS, TOPIC_KEYWORDS, IntentRouter
+
+QUESTIONS = [
+    "Which district has highest rainfall?",
+    "Compare Chennai and Coimbatore rainfall",
+    "Show top 5 crops by production",
+    "Which crops have highest productivity?",
+    "What is the average rainfall in Tamil Nadu?",
+    "Correlate rainfall with agriculture",
+    "hello there, how are you",
+]
+VOCAB_SIZES = [0, 100, 1000, 5000, 20000]
+
+
+def synthetic_keywords(count, seed=7):
+    rng = random.Random(seed)
+    words = []
+    for i in range(count):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        if i % 5 == 0:
+            word += " " + "".join(rng.choice(string.ascii_lowercase) for _ in range(5))
+        elif i % 7 == 0:
+            word += "*"
+        words.append(word)
+    return words
+
+
+def build(extra):
+    domains = [(name, list(keywords)) for name, keywords in DOMAIN_INTENTS]
+    domains[-1][1].extend(extra)
+    return IntentRouter(CHAT_INTENTS, domains, TOPIC_KEYWORDS, OPERATIONS)
+
+
+def substring_scan(question, vocab):
+    q = question.lower()
+    return any(k in q for k in vocab)
+
+
+def per_question_us(func, repeat=5):
+    number = 200
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / (number * len(QUESTIONS)) * 1e6
+
+
+def main():
+    print(f"{'keywords':>10} {'router (us/q)':>15} {'substring scan (us/q)':>22}")
+    for size in VOCAB_SIZES:
+        extra = synthetic_keywords(size)
+        router = build(extra)
+        vocab = [k.rstrip("*") for k in extra]
+        routed = per_question_us(lambda: [router.route(q) for q in QUESTIONS])
+        scanned = per_question_us(lambda: [substring_scan(q, vocab) for q in QUESTIONS])
+        print(f"{size:>10} {routed:>15.2f} {scanned:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: cost of the per-stage latency instrumentation.
+
+Times analyze_question over a mix of questions with recording off (the
+default) and on, and the bare cost of a disabled stopwatch.
+
+    python benchmarks/bench_latency.py [rounds]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import engine
+from latency import recorder
+
+QUESTIONS = [
+    "hello",
+    "How much rain did Chennai get?",
+    "Compare Chennai and Coimbatore rainfall",
+    "Show top 10 districts by rainfall",
+    "What is the average rainfall in Tamil Nadu?",
+    "What is the crop production in Salem?",
+    "Which crops have the highest productivity?",
+    "Correlate rainfall with agriculture",
+]
+
+
+def per_question(datasets, rounds):
+    rainfall_df, crop_df, views = datasets
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for question in QUESTIONS:
+                engine.analyze_question(question, rainfall_df, crop_df, views)
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(QUESTIONS)) * 1e6
+
+
+def disabled_stopwatch(calls=1_000_000):
+    recorder.enabled = False
+    start = time.perf_counter()
+    for _ in range(calls):
+        with recorder.time("route") as watch:
+            watch.lap("extract")
+            watch.lap("compute")
+            watch.lap("format")
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main(rounds):
+    datasets = engine.load_datasets()
+    recorder.enabled = False
+    off = per_question(datasets, rounds)
+    recorder.enabled = True
+    on = per_question(datasets, rounds)
+    recorder.enabled = False
+    print(f"analyze_question, recording off: {off:8.1f} us/question")
+    print(f"analyze_question, recording on:  {on:8.1f} us/question ({(on - off) / off:+.1%})")
+    print(f"disabled stopwatch (time + 3 laps): {disabled_stopwatch():.0f} ns")
+    for stage, stats in recorder.summary().items():
+        print(f"  {stage:<8} p50 {stats['p50'] * 1e6:8.1f} us  p95 {stats['p95'] * 1e6:8.1f} us  "
+              f"p99 {stats['p99'] * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
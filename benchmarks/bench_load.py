@@ -0,0 +1,315 @@
+"""Load test: N concurrent chat sessions against the real app.
+
+Opens ``sessions`` AppTest sessions of app.py and keeps all of them alive
+while each one submits ``turns`` questions through ``st.chat_input``, so
+every session grows its own chat history the way a browser tab does. The
+questions are drawn (seeded) from a weighted mix of what users ask: district
+lookups, comparisons, rankings with charts, numeric filters, departures,
+crop questions and small talk, over every district in the data, so the
+shared caches see both repeats and new keys.
+
+AppTest swaps a process-wide Streamlit runtime in for each run, so runs
+cannot overlap in one process; the sessions are interleaved instead, one
+turn at a time in a shuffled order, which is how one server process works
+through many sessions that each wait for their answer. Everything the
+sessions share (the dataset registry, the answer cache and the chart cache)
+is the same ``st.cache_resource`` object for all of them.
+
+Reports
+
+* per-turn latency (p50/p95/p99 of the full rerun a question triggers),
+  overall and per kind of question, and the engine's own stage timings,
+* process RSS growth per session once every session has its history,
+* answer-cache and chart-cache hit rates over the run, read from the app's
+  own "Answer Cache" panel.
+
+Because those sessions never overlap, ``--engine 1,8,32`` adds what they
+cannot show: a thread pool where each worker is one session asking its
+``turns`` questions back to back, all of them calling
+``engine.analyze_question`` and ``charts.chart_png`` at the same time against
+one shared registry snapshot, answer cache and chart cache, the way the
+Streamlit server runs concurrent reruns on its threads. It runs once per
+concurrency level (fresh caches, the same seeded questions) and reports
+p50/p95 per level, so lock contention and the GIL show up as the level grows.
+
+``--max-p95`` / ``--max-rss-per-session`` turn it into a gate (exit status 1
+when a limit is exceeded; with ``--engine`` the p95 of every level is
+checked); ``-o`` writes the numbers as JSON.
+
+    python benchmarks/bench_load.py [--sessions 20] [--turns 10] [--seed 0]
+    python benchmarks/bench_load.py --engine 1,8,32 [--turns 10]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import pandas as pd
+
+from latency import QUANTILES, quantile, recorder
+from rankings import aggregate_mask
+
+# (kind, weight, question templates); {district}, {other}, {n} and {mm} are filled in per turn
+MIX = [
+    ("district", 4, ["How much rain did {district} get?", "What is the rainfall in {district}?",
+                     "Tell me about {district} rainfall"]),
+    ("compare", 2, ["Compare {district} and {other} rainfall", "{district} vs {other} rainfall"]),
+    ("ranking", 3, ["Show top {n} districts by rainfall", "Which district has highest rainfall?",
+                    "Show districts with lowest rainfall", "Show the {n} lowest rainfall districts"]),
+    ("filter", 1, ["Districts with more than {mm} mm rainfall", "Which districts got less than {mm} mm of rain?"]),
+    ("departure", 1, ["Which districts had a deficient north east monsoon?",
+                      "Districts with excess south west monsoon rainfall"]),
+    ("average", 1, ["What is the average rainfall in Tamil Nadu?"]),
+    ("crops", 3, ["What is the crop production in {district}?", "Show top {n} crops by production",
+                  "Which crops have highest productivity?", "Show crops by cultivation area"]),
+    ("correlation", 1, ["Correlate rainfall with agriculture"]),
+    ("chat", 1, ["hello", "thanks", "what's the stock price"]),
+]
+
+CACHE_CAPTION = re.compile(r"(\d+) hits · (\d+) misses")
+CHART_CAPTION = re.compile(r"Charts: (\d+) hits · (\d+) renders")
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def district_names():
+    names = pd.read_csv(ROOT / "data" / "rainfall_data.csv")["District"]
+    return sorted(names[~aggregate_mask(names)].astype(str))
+
+
+def question_stream(rng, districts):
+    """Endless (kind, question) pairs drawn from MIX."""
+    kinds = [kind for kind, _, _ in MIX]
+    weights = [weight for _, weight, _ in MIX]
+    templates = {kind: options for kind, _, options in MIX}
+    while True:
+        kind = rng.choices(kinds, weights)[0]
+        district, other = rng.sample(districts, 2)
+        yield kind, rng.choice(templates[kind]).format(
+            district=district, other=other, n=rng.randint(3, 10), mm=rng.choice([300, 500, 800, 1000, 1200]))
+
+
+def cache_counters(at):
+    """{"answers": (hits, misses), "charts": (hits, renders)} from the sidebar panel of ``at``'s last run."""
+    counters = {}
+    for caption in at.caption:
+        if (match := CHART_CAPTION.search(caption.value)):
+            counters["charts"] = tuple(map(int, match.groups()))
+        elif (match := CACHE_CAPTION.search(caption.value)):
+            counters["answers"] = tuple(map(int, match.groups()))
+    if counters.keys() != {"answers", "charts"}:
+        raise RuntimeError("cache counters not found in the sidebar; has the Answer Cache panel changed?")
+    return counters
+
+
+def hit_rate(before, after):
+    hits, misses = (b - a for a, b in zip(before, after))
+    return {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {f"p{round(q * 100)}_ms": quantile(ordered, q) * 1000 for q in QUANTILES}
+
+
+def run(sessions, turns, seed, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    questions = question_stream(rng, district_names())
+
+    # Warm-up session: imports (matplotlib with the first chart), the first dataset
+    # load and the intent model, none of which is a per-session cost
+    warmup = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout).run()
+    warmup.chat_input[0].set_value("Show top 5 districts by rainfall").run()
+    gc.collect()
+    rss_start = rss_bytes()
+    before = cache_counters(warmup.run())
+    recorder.reset()
+    recorder.enabled = True
+
+    apps = [AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout).run() for _ in range(sessions)]
+    latencies = {}
+    start = time.perf_counter()
+    for _ in range(turns):
+        for at in rng.sample(apps, len(apps)):
+            kind, question = next(questions)
+            at.chat_input[0].set_value(question)
+            turn_start = time.perf_counter()
+            at.run()
+            latencies.setdefault(kind, []).append(time.perf_counter() - turn_start)
+            if at.exception:
+                raise RuntimeError(f"{question!r} raised: {at.exception[0].value}")
+    elapsed = time.perf_counter() - start
+    recorder.enabled = False
+
+    gc.collect()
+    rss_end = rss_bytes()
+    after = cache_counters(warmup.run())
+    history = [len(at.session_state["chat_history"]) for at in apps]
+    every_turn = [seconds for samples in latencies.values() for seconds in samples]
+    return {
+        "sessions": sessions,
+        "turns_per_session": turns,
+        "seed": seed,
+        "turns": len(every_turn),
+        "seconds": elapsed,
+        "turns_per_second": len(every_turn) / elapsed,
+        "latency": percentiles(every_turn),
+        "latency_by_kind": {kind: dict(percentiles(samples), turns=len(samples))
+                            for kind, samples in sorted(latencies.items())},
+        "stages": {stage: {key: value * 1000 if key != "count" else value for key, value in stats.items()}
+                   for stage, stats in recorder.summary().items()},
+        "rss_start_mib": rss_start / 2**20,
+        "rss_end_mib": rss_end / 2**20,
+        "rss_per_session_kib": (rss_end - rss_start) / sessions / 1024,
+        "history_messages": {"min": min(history), "max": max(history)},
+        "answer_cache": hit_rate(before["answers"], after["answers"]),
+        "chart_cache": hit_rate(before["charts"], after["charts"]),
+    }
+
+
+def run_engine(levels, turns, seed):
+    """Concurrent sessions calling the engine directly, once per level in ``levels``."""
+    import engine
+    from answer_cache import AnswerCache
+    from charts import ChartCache, chart_png
+    from registry import DatasetRegistry
+
+    snapshot = DatasetRegistry().snapshot()
+    districts = district_names()
+
+    def answer(question, answers, charts):
+        result = engine.analyze_question(question, snapshot.rainfall_df, snapshot.crop_df, snapshot.views, answers)
+        chart_png(result, engine.data_version(snapshot.views, result.get("data_type")), charts)
+
+    # Warm-up: imports, the intent model and matplotlib's first figure
+    answer("Show top 5 districts by rainfall", AnswerCache(), ChartCache())
+
+    results = []
+    for sessions in levels:
+        questions = question_stream(random.Random(seed), districts)
+        asked = [[next(questions) for _ in range(turns)] for _ in range(sessions)]
+        answers, charts = AnswerCache(), ChartCache()
+        start_line = threading.Barrier(sessions)
+
+        def session(turns_of_session):
+            start_line.wait()
+            timings = []
+            for kind, question in turns_of_session:
+                turn_start = time.perf_counter()
+                answer(question, answers, charts)
+                timings.append((kind, time.perf_counter() - turn_start))
+            return timings
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            timings = [timing for session_timings in pool.map(session, asked) for timing in session_timings]
+        elapsed = time.perf_counter() - start
+
+        latencies = {}
+        for kind, seconds in timings:
+            latencies.setdefault(kind, []).append(seconds)
+        answer_stats, chart_stats = answers.stats(), charts.stats()
+        results.append({
+            "sessions": sessions,
+            "turns": len(timings),
+            "seconds": elapsed,
+            "turns_per_second": len(timings) / elapsed,
+            "latency": percentiles([seconds for _, seconds in timings]),
+            "latency_by_kind": {kind: dict(percentiles(samples), turns=len(samples))
+                                for kind, samples in sorted(latencies.items())},
+            "answer_cache": {key: answer_stats[key] for key in ("hits", "misses", "hit_rate")},
+            "chart_cache": {key: chart_stats[key] for key in ("hits", "misses", "hit_rate")},
+        })
+    return {"turns_per_session": turns, "seed": seed, "levels": results}
+
+
+def report_engine(result):
+    print(f"Engine driver: {result['turns_per_session']} turns per session (seed {result['seed']}), "
+          f"sessions on concurrent threads")
+    print(f"  {'sessions':>8s} {'turns':>6s} {'turns/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}"
+          f" {'answers hit':>11s} {'charts hit':>10s}")
+    for level in result["levels"]:
+        latency = level["latency"]
+        print(f"  {level['sessions']:8d} {level['turns']:6d} {level['turns_per_second']:8.1f} "
+              f"{latency['p50_ms']:8.1f} {latency['p95_ms']:8.1f} {latency['p99_ms']:8.1f} "
+              f"{level['answer_cache']['hit_rate']:11.0%} {level['chart_cache']['hit_rate']:10.0%}")
+
+
+def report(result):
+    latency = result["latency"]
+    print(f"{result['sessions']} sessions × {result['turns_per_session']} turns (seed {result['seed']}): "
+          f"{result['turns']} turns in {result['seconds']:.1f} s, {result['turns_per_second']:.1f} turns/s")
+    print(f"\nPer-turn latency: p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms, "
+          f"p99 {latency['p99_ms']:.0f} ms")
+    for kind, stats in result["latency_by_kind"].items():
+        print(f"  {kind:12s} {stats['turns']:5d} turns  p50 {stats['p50_ms']:7.1f}  "
+              f"p95 {stats['p95_ms']:7.1f}  p99 {stats['p99_ms']:7.1f} ms")
+    print("\nEngine stages (ms):")
+    for stage, stats in result["stages"].items():
+        print(f"  {stage:12s} {stats['count']:5d} calls  p50 {stats['p50']:7.2f}  "
+              f"p95 {stats['p95']:7.2f}  p99 {stats['p99']:7.2f}")
+    print(f"\nRSS: {result['rss_start_mib']:.1f} MiB after warm-up, {result['rss_end_mib']:.1f} MiB with every "
+          f"session open ({result['rss_per_session_kib']:.0f} KiB per session, incl. AppTest overhead; "
+          f"{result['history_messages']['max']} history messages per session)")
+    for name in ("answer_cache", "chart_cache"):
+        stats = result[name]
+        print(f"{name.replace('_', ' ').capitalize()}: {stats['hit_rate']:.0%} hit rate "
+              f"({stats['hits']} hits, {stats['misses']} misses)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent AppTest sessions")
+    parser.add_argument("--sessions", type=int, default=20, help="sessions kept open at once")
+    parser.add_argument("--turns", type=int, default=10, help="questions asked per session")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the question mix")
+    parser.add_argument("--engine", default=None, metavar="LEVELS",
+                        help="comma-separated session counts for the threaded engine driver (e.g. 1,8,32) "
+                             "instead of the AppTest sessions")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per rerun")
+    parser.add_argument("--max-p95", type=float, default=None, help="fail when the p95 turn exceeds this many ms")
+    parser.add_argument("--max-rss-per-session", type=float, default=None,
+                        help="fail when RSS grows by more than this many KiB per session")
+    parser.add_argument("-o", "--output", default=None, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.engine:
+        result = run_engine([int(level) for level in args.engine.split(",")], args.turns, args.seed)
+        report_engine(result)
+    else:
+        result = run(args.sessions, args.turns, args.seed, args.timeout)
+        report(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failures = []
+    for level in result.get("levels", [result]):
+        if args.max_p95 is not None and level["latency"]["p95_ms"] > args.max_p95:
+            failures.append(f"p95 {level['latency']['p95_ms']:.0f} ms > {args.max_p95:.0f} ms "
+                            f"with {level['sessions']} sessions")
+    if ("levels" not in result and args.max_rss_per_session is not None
+            and result["rss_per_session_kib"] > args.max_rss_per_session):
+        failures.append(f"{result['rss_per_session_kib']:.0f} KiB per session > {args.max_rss_per_session:.0f} KiB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+"""Benchmark: numeric filters by binary search on a RankingView vs a full scan.
+
+A threshold or range over a metric is two ``searchsorted`` calls on the
+view's sorted values plus a slice of its order; the scan builds a boolean
+mask over the column and sorts the matches. Times a narrow range (about 1%
+of the rows) and a wide threshold (about half), and the parse of the question.
+The parser and the answers are tested in tests/test_numeric_query.py.
+
+    python benchmarks/bench_numeric_query.py [rows ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from numeric_query import parse_filter
+from rankings import build_rankings
+
+
+def best_of(fn, repeat=7):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def scan(values, low, high):
+    positions = np.flatnonzero((values >= low) & (values <= high))
+    return positions[np.argsort(-values[positions], kind="stable")]
+
+
+def main(sizes):
+    question = "districts with total rainfall between 900 and 1000 mm"
+    print(f"parse_filter: {best_of(lambda: parse_filter(question, 'rainfall'), 1000):.1f} us")
+    print(f"{'rows':>10} {'case':>7} {'matches':>9} {'search us':>10} {'scan us':>10} {'speedup':>8}")
+    rng = np.random.default_rng(0)
+    for rows in sizes:
+        values = rng.gamma(4.0, 250.0, rows)
+        df = pd.DataFrame({"district": np.arange(rows).astype(str), "total_actual": values})
+        view = build_rankings(df, ["total_actual"], "district")["total_actual"]
+        low, high = np.quantile(values, [0.495, 0.505])
+        for case, (a, b) in {"narrow": (low, high), "wide": (np.median(values), np.inf)}.items():
+            matches = len(view.between(a, b))
+            assert matches == len(scan(values, a, b))
+            search = best_of(lambda: view.between(a, b))
+            full = best_of(lambda: scan(values, a, b))
+            print(f"{rows:>10} {case:>7} {matches:>9} {search:>10.1f} {full:>10.1f} {full / search:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 100_000, 1_000_000])
@@ -0,0 +1,72 @@
+"""Benchmark: top-N / bottom-N queries with precomputed RankingViews vs per-query sorts.
+
+The legacy path is what analyze_question used to do on every question:
+filter, ``nlargest``, then ``list(data.index).index(idx)`` for each rank.
+
+    python benchmarks/bench_rankings.py [rows ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rankings import build_rankings
+
+TOP_N = 10
+
+
+def synthetic_frame(rows, seed=3):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "District": [f"District {i}" for i in range(rows)],
+        "total": rng.gamma(4.0, 250.0, rows),
+        "sw": rng.gamma(3.0, 120.0, rows),
+        "ne": rng.gamma(3.0, 150.0, rows),
+    })
+    df.loc[rows - 1, "District"] = "State Average"
+    return df
+
+
+def legacy_top(df, n):
+    data = df[df["District"] != "State Average"].nlargest(n, "total")
+    lines = []
+    for idx, row in data.head(n).iterrows():
+        rank = list(data.index).index(idx) + 1
+        lines.append(f"{rank}. **{row['District']}**: {row['total']:.1f} mm")
+    return lines
+
+
+def ranked_top(df, view, n):
+    data = df.iloc[view.top(n)]
+    return [f"{rank}. **{d}**: {v:.1f} mm"
+            for rank, (d, v) in enumerate(zip(data["District"], data["total"]), 1)]
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'build (ms)':>11} {'ranked top (ms)':>16} {'ranked bottom (ms)':>19} {'legacy top (ms)':>16}")
+    for rows in sizes:
+        df = synthetic_frame(rows)
+        start = time.perf_counter()
+        views = build_rankings(df, ["total", "sw", "ne"], "District")
+        build = (time.perf_counter() - start) * 1e3
+        view = views["total"]
+        top = timed(lambda: ranked_top(df, view, TOP_N), 200)
+        bottom = timed(lambda: df.iloc[view.bottom(TOP_N)], 200)
+        legacy = timed(lambda: legacy_top(df, TOP_N), 20)
+        assert ranked_top(df, view, TOP_N) == legacy_top(df, TOP_N)
+        print(f"{rows:>10} {build:>11.2f} {top:>16.3f} {bottom:>19.3f} {legacy:>16.3f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 100_000, 1_000_000])
@@ -0,0 +1,61 @@
+"""Benchmark: dataset registry polling and incremental reloads.
+
+On synthetic data, times a poll that finds nothing changed (a stat per file),
+a reload after one CSV changed (that dataset's store and views rebuilt, the
+other's reused) and, for comparison, a full engine.load_datasets with both
+stores rebuilt.
+
+    python benchmarks/bench_registry.py [rows ...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import engine
+from registry import DatasetRegistry
+from synthetic import write_datasets
+
+
+def touch_content(path, stamp):
+    """Append a blank line and backdate the file past the registry's settle time."""
+    with open(path, "a") as f:
+        f.write("\n")
+    os.utime(path, (stamp, stamp))
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'idle poll us':>13} {'crop reload ms':>15} {'full load ms':>13}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            write_datasets(data_dir, rows)
+            shutil.copy(ROOT / "data" / "dataset.json", data_dir / "dataset.json")
+            registry = DatasetRegistry(data_dir, interval=0)
+
+            start = time.perf_counter()
+            for _ in range(100):
+                registry.refresh()
+            idle = (time.perf_counter() - start) / 100 * 1e6
+
+            stamp = time.time() - 10
+            touch_content(data_dir / "crop_production.csv", stamp)
+            start = time.perf_counter()
+            assert registry.refresh() == ["crop_production"]
+            reload = (time.perf_counter() - start) * 1e3
+
+            shutil.rmtree(data_dir / "store")
+            start = time.perf_counter()
+            engine.load_datasets(data_dir)
+            full = (time.perf_counter() - start) * 1e3
+        print(f"{rows:>10} {idle:>13.1f} {reload:>15.1f} {full:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 100_000])
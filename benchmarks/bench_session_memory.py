@@ -0,0 +1,97 @@
+"""Benchmark: memory per concurrent session with the shared dataset cache.
+
+Part 1 keeps the result of N cached loads alive, the way N sessions each
+hold the frames of their last rerun, and measures the Python heap retained
+per session with ``st.cache_data`` (pickled copy per call) versus
+``st.cache_resource`` over frozen frames (shared reference).
+
+Part 2 drives the real app with N AppTest sessions and reports process RSS
+growth per added session.
+
+    python benchmarks/bench_session_memory.py [sessions]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+from readonly import freeze_frame
+
+QUESTIONS = [
+    "Which district has highest rainfall?",
+    "Compare Chennai and Coimbatore rainfall",
+    "Show top 5 crops by production",
+]
+
+
+def read_frames():
+    return pd.read_csv("data/rainfall_data.csv"), pd.read_csv("data/crop_production.csv")
+
+
+@st.cache_data
+def copied_load():
+    return read_frames()
+
+
+@st.cache_resource
+def shared_load():
+    rainfall_df, crop_df = read_frames()
+    return freeze_frame(rainfall_df), freeze_frame(crop_df)
+
+
+def retained_per_session(loader, sessions):
+    loader()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [loader() for _ in range(sessions)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / sessions
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def app_sessions(sessions):
+    from streamlit.testing.v1 import AppTest
+
+    apps = []
+    samples = []
+    for _ in range(sessions + 1):
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=60).run()
+        for question in QUESTIONS:
+            at.chat_input[0].set_value(question).run()
+        apps.append(at)
+        gc.collect()
+        samples.append(rss_bytes())
+    # The first session pays for imports and the cold load
+    growth = [b - a for a, b in zip(samples[1:], samples[2:])]
+    return samples, growth
+
+
+def main(sessions):
+    print(f"Heap retained per session over {sessions} sessions:")
+    print(f"  st.cache_data    : {retained_per_session(copied_load, sessions) / 1024:8.1f} KiB")
+    print(f"  st.cache_resource: {retained_per_session(shared_load, sessions) / 1024:8.1f} KiB")
+
+    samples, growth = app_sessions(sessions)
+    print(f"\nApp RSS after first session: {samples[0] / 2**20:.1f} MiB")
+    print(f"RSS growth per added session (incl. AppTest overhead): "
+          f"mean {sum(growth) / len(growth) / 1024:.1f} KiB, max {max(growth) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
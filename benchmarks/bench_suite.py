@@ -0,0 +1,233 @@
+"""Benchmark suite: dataset loading, every analyze_question branch and history rendering.
+
+For each size, synthetic rainfall and crop CSVs are generated (see
+synthetic.py) and the suite times
+
+* ``load``: ``engine.load_datasets`` cold (column stores built from the CSVs)
+  and warm (stores already on disk),
+* ``analyze``: one representative question per ``analyze_question`` branch,
+  with no answer cache so every call does the full work,
+
+and, once against the real app, the Streamlit rerun cost of the conversation
+history panel, closed and open, at a few history lengths (``render``).
+
+Results are written as JSON (default ``benchmarks/results/<commit>.json``) so
+two commits can be compared:
+
+    python benchmarks/bench_suite.py [--sizes 32 1000 100000 1000000] [-o out.json]
+    python benchmarks/bench_suite.py --compare base.json new.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import engine
+from synthetic import write_datasets
+
+SIZES = [32, 1_000, 100_000, 1_000_000]
+HISTORY_LENGTHS = [0, 10, 100, 1000]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+REGRESSION = 1.10
+
+BRANCHES = {
+    "greeting": "hello",
+    "single_district": "How much rain did Chennai get?",
+    "two_district": "Compare Chennai and Coimbatore rainfall",
+    "top_n": "Show top 10 districts by rainfall",
+    "lowest": "Show the 5 lowest rainfall districts",
+    "average": "What is the average rainfall in Tamil Nadu?",
+    "crop_lookup": "What is the crop production in Salem?",
+    "productivity": "Which crops have the highest productivity?",
+    "area": "Top 5 crops by cultivation area",
+    "correlation": "Correlate rainfall with agriculture",
+}
+
+
+def timed(fn, repeat, budget=0.2):
+    """Per-call timings of ``fn`` in microseconds: ``repeat`` samples, each
+    averaging as many calls as fit in ``budget`` seconds."""
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    number = max(1, int(budget / max(first, 1e-6)))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return summarize(samples)
+
+
+def summarize(samples_us):
+    return {"min_us": min(samples_us), "median_us": statistics.median(samples_us),
+            "samples": len(samples_us)}
+
+
+def bench_load(data_dir, repeat):
+    store_dir = data_dir / "store"
+    cold = []
+    for _ in range(repeat):
+        shutil.rmtree(store_dir, ignore_errors=True)
+        start = time.perf_counter()
+        engine.load_datasets(data_dir)
+        cold.append((time.perf_counter() - start) * 1e6)
+    warm = timed(lambda: engine.load_datasets(data_dir), repeat, budget=0.5)
+    return {"cold": summarize(cold), "warm": warm}
+
+
+def bench_analyze(datasets, repeat):
+    rainfall_df, crop_df, views = datasets
+    results = {}
+    for branch, question in BRANCHES.items():
+        intent = engine.analyze_question(question, rainfall_df, crop_df, views)["intent"]
+        results[branch] = dict(timed(lambda: engine.analyze_question(question, rainfall_df, crop_df, views), repeat),
+                               intent=intent)
+    return results
+
+
+def bench_size(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        start = time.perf_counter()
+        write_datasets(data_dir, rows)
+        shutil.copy(ROOT / "data" / "dataset.json", data_dir / "dataset.json")
+        print(f"  generated in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+        load = bench_load(data_dir, repeat if rows < 100_000 else 1)
+        analyze = bench_analyze(engine.load_datasets(data_dir), repeat)
+    return {"load": load, "analyze": analyze}
+
+
+def history(length, spill_path):
+    """A chat history of ``length`` messages, as app.py stores them (all kept in memory)."""
+    from chat_history import ChatHistory
+
+    rainfall_df, crop_df, views = engine.load_datasets()
+    questions = list(BRANCHES.values())
+    messages = ChatHistory(capacity=max(length, 1), spill_path=spill_path)
+    for i in range(length // 2):
+        result = engine.analyze_question(questions[i % len(questions)], rainfall_df, crop_df, views)
+        messages.append("user", questions[i % len(questions)], "2025-01-01 00:00:00")
+        messages.append("assistant", result["text"], "2025-01-01 00:00:00",
+                        result["data_type"], engine.selected_rows(result), views["version"])
+    return messages
+
+
+def bench_render(lengths, repeat):
+    """Median full rerun of app.py with a prefilled history, with the history
+    panel closed and open; ``history_us`` is the part over the empty-history rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    def rerun(at):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1e6)
+        return summarize(samples)
+
+    results = {"closed": {}, "open": {}}
+    spill = tempfile.TemporaryDirectory()
+    for length in lengths:
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+        at.session_state["chat_history"] = history(length, Path(spill.name) / "history.sqlite")
+        at.run()
+        results["closed"][str(length)] = rerun(at)
+        at.toggle(key="show_history").set_value(True).run()
+        results["open"][str(length)] = rerun(at)
+    spill.cleanup()
+    for state in results.values():
+        base = state[str(lengths[0])]["median_us"]
+        for entry in state.values():
+            entry["history_us"] = entry["median_us"] - base
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(node, prefix=""):
+    """{"size.section.case": median_us} for every timing in a results file."""
+    flat = {}
+    for key, value in node.items():
+        if isinstance(value, dict) and "median_us" in value:
+            flat[prefix + key] = value["median_us"]
+        elif isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+    return flat
+
+
+def compare(base_path, new_path):
+    """Print per-case ratios; returns 1 when anything got slower than REGRESSION."""
+    with open(base_path) as f:
+        base = flatten(json.load(f)["results"])
+    with open(new_path) as f:
+        new = flatten(json.load(f)["results"])
+    slower = 0
+    print(f"{'case':<42} {'base us':>12} {'new us':>12} {'ratio':>7}")
+    for case in sorted(base.keys() & new.keys()):
+        ratio = new[case] / base[case] if base[case] else float("inf")
+        flag = "  slower" if ratio > REGRESSION else ""
+        slower += bool(flag)
+        print(f"{case:<42} {base[case]:>12.1f} {new[case]:>12.1f} {ratio:>7.2f}{flag}")
+    return 1 if slower else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the AgriClimateBot benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="synthetic rows per dataset")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per measurement")
+    parser.add_argument("--no-render", action="store_true", help="skip the Streamlit history rendering runs")
+    parser.add_argument("-o", "--output", default=None, help="results JSON (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two results files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare)
+
+    os.chdir(ROOT)
+    results = {}
+    for rows in args.sizes:
+        print(f"{rows} rows", file=sys.stderr)
+        results[f"rows_{rows}"] = bench_size(rows, args.repeat)
+    if not args.no_render:
+        print("history rendering", file=sys.stderr)
+        results["render"] = bench_render(HISTORY_LENGTHS, args.repeat)
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"commit": commit,
+                   "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "cpus": os.cpu_count(),
+                   "results": results}, f, indent=2)
+
+    for case, median in flatten(results).items():
+        print(f"{case:<42} {median:>12.1f} us")
+    print(f"results written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
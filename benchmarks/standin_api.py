@@ -0,0 +1,143 @@
+"""Offline stand-in for the data.gov.in resource API.
+
+Serves recorded CSV resources the way the real API pages them:
+
+    GET /resource/<id>?api-key=...&format=csv&offset=N&limit=M
+
+Every page carries an ETag (hash of the page) and a Last-Modified date and
+gets a 304 when the client revalidates with a matching If-None-Match or
+If-Modified-Since. Connections are kept alive for ``max_keep_alive``
+requests and then closed by the server, as real front ends do, so client
+reconnects are exercised too.
+
+    with StandInAPI(recorded_resources(300)) as api:
+        fetcher.fetch_all(..., api_base=api.url)
+"""
+import hashlib
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+RECORDED_AT = 1_700_000_000
+
+
+def recorded_resources(count, files=("rainfall_data.csv", "crop_production.csv")):
+    """{resource id: CSV bytes}: ``count`` resources cycling over the real data files."""
+    contents = [(ROOT / "data" / name).read_bytes() for name in files]
+    return {f"res-{i:05d}": contents[i % len(contents)] for i in range(count)}
+
+
+def csv_page(content, offset, limit):
+    header, _, rows = content.partition(b"\n")
+    lines = rows.splitlines(keepends=True)[offset:offset + limit]
+    return header + b"\n" + b"".join(lines)
+
+
+class StandInServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 leaves every connection past it to SYN
+    # retries, which would be timed instead of the client at high concurrency
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StandInAPI:
+    """Threaded HTTP/1.1 server on 127.0.0.1 with the resources in memory."""
+
+    def __init__(self, resources, api_key=None, max_keep_alive=100, chunked=False):
+        self.resources = resources
+        self.api_key = api_key
+        self.max_keep_alive = max_keep_alive
+        self.chunked = chunked
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+        self.server = StandInServer(("127.0.0.1", 0), self.handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/resource"
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm and delayed ACKs add ~40 ms to every response
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with api.lock:
+                    api.requests += 1
+                self.served = getattr(self, "served", 0) + 1
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                resource_id = parts.path.rsplit("/", 1)[-1]
+                if api.api_key is not None and query.get("api-key") != api.api_key:
+                    return self.reply(403, b"invalid api key")
+                if resource_id not in api.resources or query.get("format") != "csv":
+                    return self.reply(404, b"resource not found")
+                page = csv_page(api.resources[resource_id], int(query.get("offset", 0)), int(query.get("limit", 10)))
+                etag = f'"{hashlib.sha1(page).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag or (
+                        "If-None-Match" not in self.headers and self.not_modified_since()):
+                    with api.lock:
+                        api.not_modified += 1
+                    return self.reply(304, b"", etag)
+                self.reply(200, page, etag)
+
+            def not_modified_since(self):
+                since = self.headers.get("If-Modified-Since")
+                try:
+                    return since is not None and parsedate_to_datetime(since).timestamp() >= RECORDED_AT
+                except (TypeError, ValueError):
+                    return False
+
+            def reply(self, status, body, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/csv")
+                if etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", formatdate(RECORDED_AT, usegmt=True))
+                closing = self.served >= api.max_keep_alive
+                if closing:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                if status == 304:
+                    self.end_headers()
+                elif api.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for start in range(0, len(body), 4096):
+                        chunk = body[start:start + 4096]
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="standin-api", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
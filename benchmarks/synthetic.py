@@ -0,0 +1,87 @@
+"""Synthetic rainfall and crop CSVs with the same schema as ``data/``.
+
+Rows are written in blocks, so files far larger than memory can be made.
+
+    python benchmarks/synthetic.py OUT_DIR ROWS [ROWS ...]
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+BLOCK_ROWS = 100_000
+DISTRICT_POOL = 700
+
+SEASONS = [("sw", 300.0, 150.0), ("ne", 450.0, 200.0), ("winter", 30.0, 20.0), ("hot", 120.0, 60.0)]
+
+
+def headers(csv_name):
+    """Column headers of the real dataset file."""
+    with open(ROOT / "data" / csv_name) as f:
+        return f.readline().rstrip("\n").split(",")
+
+
+def district_names(count=DISTRICT_POOL):
+    real = pd.read_csv(ROOT / "data" / "rainfall_data.csv")["District"].tolist()[:-1]
+    return real + [f"District {i:04d}" for i in range(max(0, count - len(real)))]
+
+
+def rainfall_block(rng, start, rows, districts):
+    columns = [np.arange(start + 1, start + rows + 1).astype(str),
+               np.array(districts)[np.arange(start, start + rows) % len(districts)]]
+    actual_total = np.zeros(rows)
+    normal_total = np.zeros(rows)
+    for _, mean, spread in SEASONS:
+        normal = np.round(np.abs(rng.normal(mean, spread / 3, rows)), 1)
+        actual = np.round(np.abs(normal * rng.normal(1.0, 0.35, rows)), 1)
+        columns += [actual, normal]
+        actual_total += actual
+        normal_total += normal
+    return columns + [np.round(actual_total, 1), np.round(normal_total, 1)]
+
+
+def crop_block(rng, start, rows, districts):
+    area = rng.integers(1_000, 80_000, rows)
+    productivity = np.round(np.abs(rng.normal(10.0, 6.0, rows)), 2)
+    return [np.arange(start + 1, start + rows + 1).astype(str),
+            np.array(districts)[np.arange(start, start + rows) % len(districts)],
+            area, np.round(area * productivity, 2), productivity]
+
+
+def write_csv(path, csv_name, make_block, rows, total_label, seed=42):
+    """Write ``rows`` synthetic rows plus a state summary row to ``path``."""
+    rng = np.random.default_rng(seed)
+    columns = headers(csv_name)
+    districts = district_names()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(columns=columns).to_csv(path, index=False)
+    for start in range(0, rows, BLOCK_ROWS):
+        block = make_block(rng, start, min(BLOCK_ROWS, rows - start), districts)
+        pd.DataFrame(dict(zip(columns, block))).to_csv(path, mode="a", header=False, index=False)
+    summary = make_block(rng, 0, 1, districts)
+    summary[0], summary[1] = np.array([total_label[0]]), np.array([total_label[1]])
+    pd.DataFrame(dict(zip(columns, summary))).to_csv(path, mode="a", header=False, index=False)
+    return path
+
+
+def write_rainfall_csv(path, rows, seed=42):
+    return write_csv(path, "rainfall_data.csv", rainfall_block, rows, ("Average", "State Average"), seed)
+
+
+def write_crop_csv(path, rows, seed=43):
+    return write_csv(path, "crop_production.csv", crop_block, rows, ("total", "state total"), seed)
+
+
+def write_datasets(out_dir, rows):
+    """Write rainfall_data.csv and crop_production.csv with ``rows`` rows each."""
+    out_dir = Path(out_dir)
+    return write_rainfall_csv(out_dir / "rainfall_data.csv", rows), write_crop_csv(out_dir / "crop_production.csv", rows)
+
+
+if __name__ == "__main__":
+    for n in sys.argv[2:]:
+        for written in write_datasets(Path(sys.argv[1]) / n, int(n)):
+            print(written)
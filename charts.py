@@ -0,0 +1,142 @@
+"""Server-side PNG charts for ranking and comparison answers.
+
+``engine.answer_question`` marks the answers that have a chart with
+``response['chart']``:
+
+    ('ranking', column)   horizontal bars of one metric, in answer order
+    ('seasons', None)     seasonal rainfall of the compared districts, grouped
+
+Charts are drawn with matplotlib's object API on the Agg canvas (no pyplot,
+so no global figure registry) and every figure is cleared as soon as its
+PNG is written. The encoded bytes are kept in a process-wide ``ChartCache``
+keyed on the chart kind and the rows plotted, and tagged with the version of
+the dataset they were drawn from, so the same answer in any session is drawn
+once. Large answers are cut to the first ``MAX_BARS`` rows (the answers are
+already ordered) before anything is drawn.
+"""
+import io
+
+from numeric_query import METRIC_NAMES
+from versioned import VersionedLRU
+
+
+MAX_BARS = 30
+MAX_GROUPS = 12
+DPI = 100
+WIDTH = 7.0
+
+# (column, legend label) of the seasons in a comparison chart
+SEASON_BARS = [
+    ("sw_actual", "South West Monsoon"),
+    ("ne_actual", "North East Monsoon"),
+    ("winter_actual", "Winter"),
+    ("hot_actual", "Hot Weather"),
+]
+COLOR = "#2e7d32"
+RAINFALL_COLOR = "#1565c0"
+
+
+class ChartCache(VersionedLRU):
+    """Thread-safe LRU of encoded chart bytes with a byte budget.
+
+    An entry drawn from an older version of its dataset is dropped when it
+    is looked up under the current one.
+    """
+
+    def __init__(self, max_bytes=32 * 2**20):
+        super().__init__(max_bytes=max_bytes, sizeof=len)
+
+
+def plotted(response):
+    """The rows a chart of ``response`` draws (already cut to the bar limit) and the total."""
+    data = response.get("data")
+    if response.get("chart") is None or data is None or isinstance(data, dict) or len(data) == 0:
+        return None, 0
+    kind, _ = response["chart"]
+    return data.iloc[:MAX_GROUPS if kind == "seasons" else MAX_BARS], len(data)
+
+
+def chart_key(response, rows, total):
+    """Cache key: the chart kind and metric, the row positions drawn and the answer size."""
+    kind, metric = response["chart"]
+    return kind, metric, response.get("data_type"), tuple(int(i) for i in rows.index), total
+
+
+def new_figure(height):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(WIDTH, height), dpi=DPI)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def draw_ranking(figure, rows, total, metric, name_col):
+    label, unit, _ = METRIC_NAMES[metric]
+    names = [str(name) for name in rows[name_col]]
+    values = rows[metric].to_numpy(dtype=float)
+    ax = figure.add_subplot()
+    positions = range(len(names))
+    ax.barh(positions, values, color=RAINFALL_COLOR if unit == "mm" else COLOR)
+    ax.set_yticks(positions, names, fontsize=8)
+    ax.invert_yaxis()
+    ax.set_xlabel(f"{label} ({unit})")
+    shown = f" (first {len(rows)} of {total})" if total > len(rows) else ""
+    ax.set_title(f"{label}{shown}", fontsize=10)
+    ax.grid(axis="x", alpha=0.3)
+
+
+def draw_seasons(figure, rows, total, name_col):
+    import numpy as np
+
+    names = [str(name) for name in rows[name_col]]
+    seasons = [(col, label) for col, label in SEASON_BARS if col in rows]
+    ax = figure.add_subplot()
+    width = 0.8 / max(len(seasons), 1)
+    x = np.arange(len(names))
+    for i, (col, label) in enumerate(seasons):
+        ax.bar(x + (i - (len(seasons) - 1) / 2) * width, rows[col].to_numpy(dtype=float), width, label=label)
+    ax.set_xticks(x, names, fontsize=8, rotation=30 if len(names) > 4 else 0, ha="right" if len(names) > 4 else "center")
+    ax.set_ylabel("Rainfall (mm)")
+    shown = f" (first {len(rows)} of {total})" if total > len(rows) else ""
+    ax.set_title(f"Seasonal Rainfall (2017-18){shown}", fontsize=10)
+    ax.legend(fontsize=8)
+    ax.grid(axis="y", alpha=0.3)
+
+
+def render_png(response, rows, total, name_col="district"):
+    """PNG bytes of the chart for ``response`` over ``rows``."""
+    kind, metric = response["chart"]
+    height = 1.2 + 0.25 * len(rows) if kind == "ranking" else 4.0
+    figure = new_figure(height)
+    try:
+        if kind == "ranking":
+            draw_ranking(figure, rows, total, metric, name_col)
+        else:
+            draw_seasons(figure, rows, total, name_col)
+        figure.tight_layout()
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        # Drop the artists now rather than whenever the cycle collector runs
+        figure.clear()
+
+
+def chart_png(response, version, cache=None):
+    """PNG bytes for an answer that has a chart, else None; rendered once per cache key.
+
+    ``version`` is the version of the answer's dataset (engine.data_version).
+    """
+    rows, total = plotted(response)
+    if rows is None:
+        return None
+    key = chart_key(response, rows, total)
+    if cache is not None and version is not None:
+        png = cache.get(version, key)
+        if png is not None:
+            return png
+    png = render_png(response, rows, total)
+    if cache is not None and version is not None:
+        cache.put(version, key, png)
+    return png
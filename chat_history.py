@@ -0,0 +1,191 @@
+"""Bounded per-session chat history.
+
+Messages keep the answer text and, instead of the result frames, the row
+positions they were taken from plus the version of their own dataset (see
+``engine.data_version``); ``message_data`` rebuilds the frames on demand
+from the shared datasets. The newest ``capacity`` messages live in a ring
+buffer; older ones are spilled to a SQLite file shared by all sessions of
+the process and can be paged back in with ``older``. The file sits in a
+private (0700) temporary directory of the process, removed at exit, unless
+``AGRICLIMATE_HISTORY_DB`` names one; either way it is created readable by
+its owner only. Memory per session is therefore bounded by ``capacity``
+whatever the conversation length, and ``nbytes`` reports it.
+"""
+import atexit
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import uuid
+import weakref
+from array import array
+from collections import deque, namedtuple
+from contextlib import closing
+from pathlib import Path
+
+
+DEFAULT_CAPACITY = 50
+# None: a file in a private temporary directory, see default_spill_path
+SPILL_PATH = os.environ.get("AGRICLIMATE_HISTORY_DB")
+
+_spill_dir = None
+_spill_dir_lock = threading.Lock()
+
+Message = namedtuple("Message", "role content time data_type rows version")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    time TEXT NOT NULL,
+    data_type TEXT,
+    rows TEXT,
+    version TEXT,
+    PRIMARY KEY (session, seq)
+)
+"""
+
+
+def default_spill_path():
+    """Spill file of this process, in a directory only its user can open."""
+    global _spill_dir
+    with _spill_dir_lock:
+        if _spill_dir is None:
+            _spill_dir = tempfile.mkdtemp(prefix="agriclimate-history-")
+            atexit.register(shutil.rmtree, _spill_dir, True)
+    return Path(_spill_dir) / "history.sqlite"
+
+
+def connect(path):
+    # Created 0600 before SQLite opens it (its journal copies the mode)
+    os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+    db = sqlite3.connect(path, timeout=10)
+    # Scratch storage: losing it on a crash is fine, waiting on fsync per message is not
+    db.execute("PRAGMA synchronous = OFF")
+    db.execute(SCHEMA)
+    return db
+
+
+def delete_session(path, session):
+    """Drop a session's spilled messages."""
+    try:
+        with closing(connect(path)) as db, db:
+            db.execute("DELETE FROM messages WHERE session = ?", (session,))
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def compact_rows(rows):
+    """Row positions as int32 arrays (a dict of them for two-dataset answers)."""
+    if rows is None:
+        return None
+    if isinstance(rows, dict):
+        return {name: array("i", positions) for name, positions in rows.items()}
+    return array("i", rows)
+
+
+def rows_to_json(rows):
+    if rows is None:
+        return None
+    if isinstance(rows, dict):
+        return json.dumps({name: positions.tolist() for name, positions in rows.items()})
+    return json.dumps(rows.tolist())
+
+
+def message_data(message, rainfall_df, crop_df, version):
+    """Rebuild the frame(s) behind ``message``; None if it had none or the data changed since."""
+    if message.rows is None or message.version != version:
+        return None
+    if isinstance(message.rows, dict):
+        frames = {"rainfall": rainfall_df, "crops": crop_df}
+        return {name: frames[name].iloc[list(positions)] for name, positions in message.rows.items()}
+    df = crop_df if message.data_type == "crops" else rainfall_df
+    return df.iloc[list(message.rows)]
+
+
+class ChatHistory:
+    """Ring buffer of the latest messages with older ones spilled to SQLite."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill_path=SPILL_PATH):
+        self.capacity = capacity
+        # Resolved on the first spill, so short conversations never create the file
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.session = uuid.uuid4().hex
+        self.recent = deque()
+        self.spilled = 0
+        self.dropped = 0
+        # Spilled rows go away with the session (or the process)
+        self.finalizer = None
+
+    def append(self, role, content, time, data_type=None, rows=None, version=None):
+        """Add a message; ``rows`` is engine.selected_rows(result)."""
+        self.recent.append(Message(role, content, time, data_type, compact_rows(rows), version))
+        if len(self.recent) > self.capacity:
+            self.spill(self.recent.popleft())
+
+    def spill(self, message):
+        if self.spill_path is None:
+            self.spill_path = default_spill_path()
+        if self.finalizer is None:
+            self.finalizer = weakref.finalize(self, delete_session, self.spill_path, self.session)
+        try:
+            with closing(connect(self.spill_path)) as db, db:
+                db.execute("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (self.session, self.spilled, message.role, message.content, message.time,
+                            message.data_type, rows_to_json(message.rows), message.version))
+        except (sqlite3.Error, OSError):
+            # No writable spill file: stay bounded and forget the message
+            self.dropped += 1
+            return
+        self.spilled += 1
+
+    def older(self, limit, offset=0):
+        """Spilled messages, newest first, skipping the ``offset`` newest."""
+        if not self.spilled:
+            return []
+        with closing(connect(self.spill_path)) as db:
+            rows = db.execute("SELECT role, content, time, data_type, rows, version FROM messages "
+                              "WHERE session = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                              (self.session, limit, offset)).fetchall()
+        return [Message(role, content, time, data_type, compact_rows(json.loads(positions)) if positions else None,
+                        version)
+                for role, content, time, data_type, positions, version in rows]
+
+    def latest(self, count, skip=0):
+        """Up to ``count`` messages ending ``skip`` messages before the newest, oldest first."""
+        recent = list(self.recent)
+        end = len(recent) - skip
+        picked = recent[max(0, end - count):max(0, end)]
+        missing = count - len(picked)
+        if missing > 0 and self.spilled:
+            picked = self.older(missing, max(0, skip - len(recent)))[::-1] + picked
+        return picked
+
+    def clear(self):
+        if self.spilled:
+            delete_session(self.spill_path, self.session)
+        self.recent.clear()
+        self.spilled = self.dropped = 0
+
+    def nbytes(self):
+        """Approximate bytes held in memory by this history."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.recent)
+        for message in self.recent:
+            size += sys.getsizeof(message) + sum(sys.getsizeof(field) for field in message[:4])
+            rows = message.rows
+            for positions in (rows.values() if isinstance(rows, dict) else [rows] if rows is not None else []):
+                size += sys.getsizeof(positions)
+        return size
+
+    def __len__(self):
+        """Messages that can still be read back (``dropped`` ones are not counted)."""
+        return self.spilled + len(self.recent)
+
+    def __iter__(self):
+        """The in-memory (most recent) messages, oldest first."""
+        return iter(self.recent)
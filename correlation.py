@@ -0,0 +1,152 @@
+"""Rainfall vs crop statistics over a district-level join of the two datasets.
+
+The sources spell district names differently (Kanyakumari/Kanniyakumari,
+Trichy/Tiruchirappalli, ...), so both sides are reduced to a join key first:
+lower-case letters only, a leading "the" dropped, and known spelling
+variants mapped through ``entity_index.DISTRICT_ALIASES``. Keys are computed
+once per distinct name (the district columns are categoricals), rows with
+the same key are averaged (several years, or duplicate rows), and the two
+sides are merged on the key. The join is cached per dataset version.
+
+Correlations and least-squares fits of a crop metric against every rainfall
+column are computed together as matrix operations, so the cost is a few
+passes over the joined array whatever the number of districts or seasons.
+"""
+import numpy as np
+import pandas as pd
+
+from entity_index import DISTRICT_ALIASES
+from intent_router import tokenize
+from rankings import AGGREGATE_ROWS
+from versioned import PerVersion
+
+
+# Rainfall columns compared against the crop metric, with their display names
+SEASONS = {
+    "sw_actual": "South West Monsoon",
+    "ne_actual": "North East Monsoon",
+    "winter_actual": "Winter Season",
+    "hot_actual": "Hot Weather Season",
+    "total_actual": "Total Annual Rainfall",
+}
+
+OUTLIER_Z = 2.0
+MAX_CACHED_JOINS = 4
+
+_joins = PerVersion(MAX_CACHED_JOINS)
+
+
+def district_key(name):
+    """Join key for a district name, or None for state summary rows."""
+    tokens = tokenize(str(name))
+    if " ".join(tokens) in AGGREGATE_ROWS:
+        return None
+    if tokens[:1] == ["the"]:
+        tokens = tokens[1:]
+    key = "".join(tokens)
+    return DISTRICT_ALIASES.get(key, key)
+
+
+def district_keys(names):
+    """Join key per row; the names are normalized once per distinct value."""
+    names = pd.Categorical(names)
+    keys = np.array([district_key(name) for name in names.categories] + [None], dtype=object)
+    # Code -1 (missing name) picks the trailing None
+    return keys[names.codes]
+
+
+def keyed(df, name_col, columns):
+    """``columns`` averaged per join key, with the first row position and name of each key."""
+    keys = district_keys(df[name_col])
+    frame = pd.DataFrame({column: np.asarray(df[column], dtype=float) for column in columns})
+    frame["row"] = np.arange(len(df))
+    frame["key"] = keys
+    frame = frame[frame["key"].notna()]
+    grouped = frame.groupby("key", sort=False)
+    result = grouped[columns].mean()
+    result["row"] = grouped["row"].min()
+    result["name"] = np.asarray(df[name_col], dtype=object)[result["row"].to_numpy()]
+    return result
+
+
+def build_join(rainfall_df, crop_df, name_col="district", target_cols=("area", "production", "productivity")):
+    """One row per district found in both datasets.
+
+    Columns: the rainfall seasons, the crop metrics, ``rainfall_row`` and
+    ``crop_row`` (positions of the first source row) and ``district``.
+    """
+    rainfall = keyed(rainfall_df, name_col, list(SEASONS))
+    crops = keyed(crop_df, name_col, list(target_cols))
+    joined = rainfall.join(crops, how="inner", lsuffix="_rainfall", rsuffix="_crops")
+    joined = joined.rename(columns={"row_rainfall": "rainfall_row", "row_crops": "crop_row",
+                                    "name_rainfall": "district"}).drop(columns="name_crops")
+    return joined.sort_values("district").reset_index(drop=True)
+
+
+def cached_join(version, rainfall_df, crop_df):
+    """build_join, once per dataset version."""
+    return _joins.get(version, build_join, rainfall_df, crop_df)
+
+
+def fit(X, y):
+    """Pearson r and least-squares line of ``y`` against every column of ``X``.
+
+    Returns ``(r, slope, intercept, z)`` where ``z`` holds the standardized
+    residual of every row under every column's fit (n × k).
+    """
+    n = len(y)
+    x_mean = X.mean(axis=0)
+    y_mean = y.mean()
+    Xc = X - x_mean
+    yc = y - y_mean
+    sxx = np.einsum("ij,ij->j", Xc, Xc)
+    syy = yc @ yc
+    sxy = Xc.T @ yc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = sxy / np.sqrt(sxx * syy)
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        residuals = y[:, None] - (intercept + X * slope)
+        spread = np.sqrt(np.einsum("ij,ij->j", residuals, residuals) / max(n - 2, 1))
+        z = residuals / spread
+    return r, slope, intercept, z
+
+
+def strength(r):
+    size = abs(r)
+    word = "negligible" if size < 0.1 else "weak" if size < 0.3 else "moderate" if size < 0.5 else "strong"
+    return f"{word} {'positive' if r > 0 else 'negative'}"
+
+
+def rainfall_findings(joined, target="productivity", max_outliers=5):
+    """Findings for ``target`` against each rainfall season, strongest first.
+
+    Each finding is a dict with ``column``, ``label``, ``r``, ``r2``,
+    ``slope``, ``intercept``, ``n`` and ``outliers`` (district, value, z)
+    for districts more than OUTLIER_Z residual deviations off the line.
+    """
+    columns = list(SEASONS)
+    data = joined[columns + [target]].to_numpy(dtype=float)
+    complete = ~np.isnan(data).any(axis=1)
+    data = data[complete]
+    districts = joined["district"].to_numpy()[complete]
+    if len(data) < 3:
+        return []
+
+    X, y = data[:, :-1], data[:, -1]
+    r, slope, intercept, z = fit(X, y)
+    findings = []
+    for j in np.argsort(-np.abs(np.nan_to_num(r))):
+        flagged = np.flatnonzero(np.abs(np.nan_to_num(z[:, j])) >= OUTLIER_Z)
+        flagged = flagged[np.argsort(-np.abs(z[flagged, j]))][:max_outliers]
+        findings.append({
+            "column": columns[j],
+            "label": SEASONS[columns[j]],
+            "r": float(r[j]),
+            "r2": float(r[j] ** 2),
+            "slope": float(slope[j]),
+            "intercept": float(intercept[j]),
+            "n": len(y),
+            "outliers": [(districts[i], float(y[i]), float(z[i, j])) for i in flagged],
+        })
+    return findings
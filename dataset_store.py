@@ -0,0 +1,219 @@
+"""Columnar on-disk store for the datasets in ``data/``.
+
+Each CSV is converted once into a directory of raw column files plus a
+``manifest.json`` schema:
+
+    data/store/rainfall_data/
+        manifest.json      column names, CSV labels, dtypes, categories, source fingerprint
+        total_actual.bin   one file per numeric column
+        district.bin       category codes for text columns
+
+Columns get short canonical names (``total_actual`` instead of
+"Total Actual Rainfall (June'17 to May'18) in mm"); the original headers are
+kept in the manifest as display labels. Loading memory-maps the column files
+read-only, so opening a store costs no parsing and pages are only read when
+touched. The CSV is only parsed again when the store is missing or its
+recorded source fingerprint no longer matches the file.
+
+    python dataset_store.py        # (re)build every store
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from readonly import freeze_frame
+
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+STORE_DIR = DATA_DIR / "store"
+FORMAT_VERSION = 2
+
+# Dataset name (as in data/dataset.json) -> source CSV file name
+DATASETS = {
+    "rainfall_data": "rainfall_data.csv",
+    "crop_production": "crop_production.csv",
+}
+
+# CSV header pattern -> canonical column name, first match wins
+COLUMN_PATTERNS = [
+    (r"^(s|sl)\.?\s*no\.?$", "sno"),
+    (r"^district$", "district"),
+    (r"^actual rainfall in south west monsoon", "sw_actual"),
+    (r"^normal rainfall in south west monsoon", "sw_normal"),
+    (r"^actual rainfall in north east monsoon", "ne_actual"),
+    (r"^normal rainfall in north east monsoon", "ne_normal"),
+    (r"^actual rainfall in winter", "winter_actual"),
+    (r"^normal rainfall in winter", "winter_normal"),
+    (r"^actual rainfall in hot weather", "hot_actual"),
+    (r"^normal rainfall in hot weather", "hot_normal"),
+    (r"^total actual rainfall", "total_actual"),
+    (r"^total normal rainfall", "total_normal"),
+    (r"^area\b", "area"),
+    (r"^production\b", "production"),
+    (r"^productivity\b", "productivity"),
+]
+COLUMN_PATTERNS = [(re.compile(p, re.IGNORECASE), name) for p, name in COLUMN_PATTERNS]
+
+
+def canonical_name(header):
+    """Short, stable column name for a CSV header."""
+    header = header.strip()
+    for pattern, name in COLUMN_PATTERNS:
+        if pattern.search(header):
+            return name
+    return re.sub(r"[^a-z0-9]+", "_", header.lower()).strip("_")
+
+
+def canonical_columns(headers):
+    """Map CSV headers to unique canonical names."""
+    names = {}
+    for header in headers:
+        name = base = canonical_name(header)
+        suffix = 2
+        while name in names.values():
+            name = f"{base}_{suffix}"
+            suffix += 1
+        names[header] = name
+    return names
+
+
+def file_fingerprint(path, with_hash=True):
+    """Size, mtime and (optionally) SHA-256 of a file."""
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def read_manifest(store_path):
+    try:
+        with open(Path(store_path) / "manifest.json") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == FORMAT_VERSION else None
+
+
+def is_fresh(manifest, csv_path):
+    """True when ``manifest`` was built from the current contents of ``csv_path``."""
+    if manifest is None:
+        return False
+    if not os.path.exists(csv_path):
+        return True  # nothing newer to rebuild from
+    source = manifest["source"]
+    current = file_fingerprint(csv_path, with_hash=False)
+    if current == {"size": source["size"], "mtime_ns": source["mtime_ns"]}:
+        return True
+    # Touched but maybe not changed: only the content hash decides
+    return current["size"] == source["size"] and file_fingerprint(csv_path)["sha256"] == source["sha256"]
+
+
+def new_store_path(store_path):
+    """Fresh temporary directory next to ``store_path`` to build a store in."""
+    store_path = Path(store_path)
+    tmp_path = store_path.with_name(f"{store_path.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    return tmp_path
+
+
+def commit_store(tmp_path, store_path):
+    """Swap a fully written store in place of ``store_path``.
+
+    Readers that still map the old column files keep them open.
+    """
+    store_path = Path(store_path)
+    old_path = store_path.with_name(f"{store_path.name}.old-{os.getpid()}")
+    if store_path.exists():
+        store_path.rename(old_path)
+    Path(tmp_path).rename(store_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def convert(csv_path, store_path, schema=None):
+    """Stream ``csv_path`` into a column store (see ingest.ingest_csv)."""
+    # Imported here because the ingestion pipeline builds on this module
+    from ingest import ingest_csv
+
+    return ingest_csv(csv_path, store_path, schema)
+
+
+def open_store(store_path, manifest=None):
+    """Memory-map a column store as a read-only DataFrame."""
+    store_path = Path(store_path)
+    manifest = manifest or read_manifest(store_path)
+    rows = manifest["rows"]
+    columns = {}
+    for spec in manifest["columns"]:
+        dtype = np.dtype(spec["dtype"])
+        if rows:
+            values = np.memmap(store_path / spec["file"], dtype=dtype, mode="r", shape=(rows,))
+        else:
+            values = np.empty(0, dtype=dtype)
+            values.flags.writeable = False
+        if spec["kind"] == "category":
+            values = pd.Categorical.from_codes(values, categories=spec["categories"])
+        columns[spec["name"]] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def dataset_version(*manifests):
+    """Short content hash identifying the exact data behind one or more stores."""
+    digest = hashlib.sha256()
+    for manifest in manifests:
+        for source in [manifest["source"]] + manifest.get("appended", []):
+            digest.update(source.get("sha256", "").encode())
+    return digest.hexdigest()[:16]
+
+
+def column_labels(manifest):
+    """Canonical column name -> original CSV header."""
+    return {spec["name"]: spec["label"] for spec in manifest["columns"]}
+
+
+def load_dataset(name, data_dir=DATA_DIR, store_dir=STORE_DIR, rebuild=False):
+    """Load a dataset from its column store, rebuilding it from CSV when stale.
+
+    Returns ``(df, manifest)``. ``rebuild`` forces a new store (the schema in
+    dataset.json changed). If the store cannot be written (read-only
+    checkout), the CSV is parsed directly into a frozen frame instead.
+    """
+    from ingest import load_schema
+
+    csv_path = Path(data_dir) / DATASETS[name]
+    store_path = Path(store_dir) / name
+    manifest = read_manifest(store_path)
+    if rebuild or not is_fresh(manifest, csv_path):
+        try:
+            manifest = convert(csv_path, store_path, load_schema(name, Path(data_dir) / "dataset.json"))
+        except OSError:
+            df = pd.read_csv(csv_path)
+            labels = canonical_columns(df.columns)
+            manifest = {"format": FORMAT_VERSION, "rows": len(df),
+                        "source": dict(file_fingerprint(csv_path), path=str(csv_path)),
+                        "columns": [{"name": n, "label": l} for l, n in labels.items()]}
+            return freeze_frame(df.rename(columns=labels)), manifest
+    return open_store(store_path, manifest), manifest
+
+
+def main():
+    from ingest import load_schema
+
+    for name, file_name in DATASETS.items():
+        manifest = convert(DATA_DIR / file_name, STORE_DIR / name, load_schema(name))
+        print(f"{name}: {manifest['rows']} rows, {len(manifest['columns'])} columns -> {STORE_DIR / name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Seasonal rainfall departures from normal, precomputed as a lookup table.
+
+The rainfall source pairs every season's actual rainfall with its long-period
+normal. ``DepartureTable`` derives, per season and district,
+
+    <season>_departure   actual - normal, in mm
+    <season>_percent     departure as a percentage of the normal
+    <season>_category    deficient / normal / excess
+
+with IMD's thresholds: a departure of -20% or worse is deficient, +20% or
+more is excess, anything in between is normal. The whole table is a few
+array operations over the (rows × seasons) matrices. Each season also gets
+its districts sorted by (category, percent), so "which districts had a
+deficient NE monsoon" is a slice of a stored position array.
+
+Tables are built once per dataset version (``cached_departures``) and only
+rebuilt when the source CSV changes. Questions are parsed into a
+``numeric_query.Departure`` by ``numeric_query.parse_departure``.
+"""
+import numpy as np
+import pandas as pd
+
+from numeric_query import CATEGORIES
+from rankings import aggregate_mask
+from readonly import freeze_frame
+from versioned import PerVersion
+
+
+# Season prefix of the canonical columns (<season>_actual / <season>_normal) → display name
+SEASONS = {
+    "sw": "South West Monsoon",
+    "ne": "North East Monsoon",
+    "winter": "Winter Season",
+    "hot": "Hot Weather Season",
+    "total": "Annual Rainfall",
+}
+
+DEFICIENT_BELOW = -20.0  # percent departure at or under which a season is deficient
+EXCESS_FROM = 20.0       # percent departure from which it is excess
+
+MAX_CACHED_TABLES = 4
+
+_tables = PerVersion(MAX_CACHED_TABLES)
+
+
+class DepartureTable:
+    """Departure metrics per season for every district row of a rainfall frame.
+
+    ``frame`` is aligned with the source rows (state summary rows and rows
+    with a missing or zero normal have NaN metrics and no category).
+    """
+
+    def __init__(self, df, name_col="district", seasons=SEASONS):
+        self.seasons = [season for season in seasons if f"{season}_actual" in df and f"{season}_normal" in df]
+        actual = np.column_stack([np.asarray(df[f"{s}_actual"], dtype=float) for s in self.seasons])
+        normal = np.column_stack([np.asarray(df[f"{s}_normal"], dtype=float) for s in self.seasons])
+        excluded = aggregate_mask(df[name_col])
+
+        departure = actual - normal
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent = np.where(normal > 0, departure / normal * 100, np.nan)
+        departure[excluded] = np.nan
+        percent[excluded] = np.nan
+        # 0 deficient, 1 normal, 2 excess; -1 where there is nothing to compare
+        codes = (percent > DEFICIENT_BELOW).astype(np.int8) + (percent >= EXCESS_FROM)
+        codes[np.isnan(percent)] = -1
+
+        columns = {}
+        self._index = {}
+        for j, season in enumerate(self.seasons):
+            columns[f"{season}_departure"] = departure[:, j]
+            columns[f"{season}_percent"] = percent[:, j]
+            columns[f"{season}_category"] = pd.Categorical.from_codes(codes[:, j], CATEGORIES)
+            positions = np.flatnonzero(codes[:, j] >= 0)
+            # Categories are bands of the percent, so sorting by percent also
+            # groups the rows by category
+            order = positions[np.argsort(percent[positions, j], kind="stable")]
+            bounds = np.searchsorted(codes[order, j], np.arange(len(CATEGORIES) + 1))
+            self._index[season] = (order, bounds)
+        self.frame = freeze_frame(pd.DataFrame(columns, index=df.index))
+
+    def lookup(self, season, category=None):
+        """Row positions of ``season`` in ``category``, largest departure first.
+
+        Deficient rows come most deficient first, excess rows most excessive
+        first. With no category, every district from the most deficient to
+        the most excessive.
+        """
+        order, bounds = self._index[season]
+        if category is None:
+            return order
+        i = CATEGORIES.index(category)
+        positions = order[bounds[i]:bounds[i + 1]]
+        return positions[::-1] if category == "excess" else positions
+
+    def counts(self, season):
+        """{category: number of districts} for ``season``."""
+        _, bounds = self._index[season]
+        return {category: int(bounds[i + 1] - bounds[i]) for i, category in enumerate(CATEGORIES)}
+
+
+def cached_departures(version, df, name_col="district"):
+    """DepartureTable of ``df``, once per dataset version."""
+    return _tables.get(version, DepartureTable, df, name_col)
+
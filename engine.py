@@ -0,0 +1,631 @@
+"""Headless question-answering engine behind the AgriClimateBot Streamlit app.
+
+Everything here runs without Streamlit, so the query logic can be imported
+by scripts, batch jobs and benchmarks. Heavy libraries (NumPy, pandas) are
+only imported by the functions that need them, which keeps
+``import engine`` cheap; see benchmarks/bench_engine_import.py.
+"""
+import json
+from pathlib import Path
+
+from answer_cache import answer_key
+from entity_index import DISTRICT_ALIASES, EntityIndex
+from intent_model import router
+from intent_router import router as keyword_router
+from latency import NULL_STOPWATCH, recorder
+from numeric_query import METRIC_NAMES, describe, find_metric, parse_departure, parse_filter
+
+
+# Canonical dataset columns (see dataset_store.COLUMN_PATTERNS)
+DISTRICT_COL = 'district'
+SW_MONSOON_COL = 'sw_actual'
+NE_MONSOON_COL = 'ne_actual'
+WINTER_COL = 'winter_actual'
+HOT_WEATHER_COL = 'hot_actual'
+TOTAL_RAINFALL_COL = 'total_actual'
+RAINFALL_METRICS = [TOTAL_RAINFALL_COL, SW_MONSOON_COL, NE_MONSOON_COL, WINTER_COL, HOT_WEATHER_COL]
+
+CROP_COL = 'district'
+AREA_COL = 'area'
+PRODUCTION_COL = 'production'
+PRODUCTIVITY_COL = 'productivity'
+CROP_METRICS = [AREA_COL, PRODUCTION_COL, PRODUCTIVITY_COL]
+
+
+def build_rainfall_views(rainfall_df, labels=None, version=None):
+    """Lookup structures derived from the rainfall dataset alone"""
+    from departures import cached_departures
+    from rankings import build_rankings
+
+    return {
+        "rainfall_labels": labels or {},
+        "rainfall_districts": EntityIndex(rainfall_df[DISTRICT_COL].values, aliases=DISTRICT_ALIASES),
+        "rainfall_rankings": build_rankings(rainfall_df, RAINFALL_METRICS, DISTRICT_COL),
+        "rainfall_departures": cached_departures(version, rainfall_df, DISTRICT_COL),
+    }
+
+def build_crop_views(crop_df, labels=None, version=None):
+    """Lookup structures derived from the crop dataset alone"""
+    from rankings import build_rankings
+
+    return {
+        "crop_labels": labels or {},
+        "crop_districts": EntityIndex(crop_df[CROP_COL].values, aliases=DISTRICT_ALIASES),
+        "crop_rankings": build_rankings(crop_df, CROP_METRICS, CROP_COL, positive_only=[PRODUCTIVITY_COL]),
+    }
+
+def combine_views(rainfall_views, crop_views, version=None, versions=None):
+    """Views of both datasets; ``versions`` holds the version of each ('rainfall', 'crops')"""
+    return {"version": version, "versions": versions or {"rainfall": version, "crops": version},
+            **rainfall_views, **crop_views}
+
+def build_views(rainfall_df, crop_df, rainfall_labels=None, crop_labels=None, version=None, versions=None):
+    """Precompute lookup structures over the loaded datasets"""
+    versions = versions or {"rainfall": version, "crops": version}
+    return combine_views(build_rainfall_views(rainfall_df, rainfall_labels, versions["rainfall"]),
+                         build_crop_views(crop_df, crop_labels, versions["crops"]),
+                         version, versions)
+
+def data_version(views, domain):
+    """Version of the data an answer of ``domain`` ('rainfall', 'crops', ...) is derived from"""
+    return views.get("versions", {}).get(domain, views["version"])
+
+def with_labels(df, labels):
+    """Show a frame under the original CSV column headers"""
+    return df.rename(columns=labels, copy=False)
+
+
+def load_datasets(data_dir=None):
+    """Load both datasets from their column stores (built from data/*.csv).
+
+    Returns ``(rainfall_df, crop_df, views)``; the frames are read-only.
+    """
+    from dataset_store import DATA_DIR, column_labels, dataset_version, load_dataset
+
+    data_dir = Path(DATA_DIR if data_dir is None else data_dir)
+    store_dir = data_dir / "store"
+    with recorder.time('load'):
+        rainfall_df, rainfall_manifest = load_dataset('rainfall_data', data_dir, store_dir)
+        crop_df, crop_manifest = load_dataset('crop_production', data_dir, store_dir)
+        views = build_views(rainfall_df, crop_df,
+                            column_labels(rainfall_manifest), column_labels(crop_manifest),
+                            version=dataset_version(rainfall_manifest, crop_manifest),
+                            versions={"rainfall": dataset_version(rainfall_manifest),
+                                      "crops": dataset_version(crop_manifest)})
+    return rainfall_df, crop_df, views
+
+def load_metadata(data_dir=None):
+    """Load dataset metadata as a read-only mapping"""
+    from dataset_store import DATA_DIR
+    from readonly import freeze_mapping
+
+    data_dir = Path(DATA_DIR if data_dir is None else data_dir)
+    try:
+        with open(data_dir / "dataset.json", 'r') as f:
+            return freeze_mapping(json.load(f))
+    except (OSError, ValueError):
+        return freeze_mapping({
+            "rainfall_data": {
+                "title": "District-wise Rainfall Data - Tamil Nadu (2017-18)",
+                "source": "India Meteorological Department",
+                "years_covered": "2017-2018",
+                "description": "Seasonal and annual rainfall for 32 Tamil Nadu districts"
+            },
+            "crop_production": {
+                "title": "Crop Production Statistics - Tamil Nadu (2012-13)",
+                "source": "Ministry of Agriculture & Farmers Welfare",
+                "years_covered": "2012-2013",
+                "description": "Area, production, and productivity for major crops"
+            }
+        })
+
+
+# Canned replies for the small-talk intents of the router
+CHAT_REPLIES = {
+    "greeting": "👋 Hello there! How can I help you explore Tamil Nadu’s rainfall or crop data today?",
+    "how_are_you": "😊 I’m just a chatbot, but I’m doing great! Ready to analyze data for you.",
+    "creator": "🤖 I was created by **Ishwaree Patil** as part of the *Bharat Digital Fellowship 2026* project!",
+    "identity": "🤖 My name is **AgriClimateBot** — your data assistant for Tamil Nadu’s agriculture and climate insights! 🌾☁️",
+    "farewell": "👋 You’re welcome! Have a wonderful day ahead 🌾",
+    # No data keyword at all → respond with chatbot purpose
+    "off_topic": (
+        "🤖 I’m **AgriClimateBot**, a data assistant built to analyze and explain "
+        "**Tamil Nadu’s rainfall and crop production datasets**. 🌾☁️\n\n"
+        "I’m not designed for general conversation — but I can help you with agriculture and climate insights!\n\n"
+        "💡 Try asking questions like:\n"
+        "- Which district received the most rainfall in 2017-18?\n"
+        "- Which crop had the highest productivity?\n"
+        "- Compare rainfall between Chennai and Coimbatore.\n"
+        "- What is the average rainfall across Tamil Nadu?\n"
+    ),
+}
+
+def analyze_question(question, rainfall_df, crop_df, views=None, cache=None, route=None):
+    """Answer ``question``; ``route`` may be passed in when it was computed in a batch"""
+    if views is None:
+        views = build_views(rainfall_df, crop_df)
+    with recorder.time('route') as watch:
+        if route is None:
+            route = router.route(question)
+        route = with_metric(with_departure(with_filter(route, question), question))
+        watch.lap('extract')
+        entities = find_entities(route, views)
+
+        # Same intent, slots and entities → same answer, however the question was worded
+        if cache is not None:
+            key = answer_key(route, entities)
+            version = data_version(views, route.intent.partition(".")[0])
+            cached = cache.get(version, key)
+            if cached is not None:
+                return cached
+
+        # The frames are shared across sessions: branches only ever see guarded views
+        from readonly import guard
+
+        watch.lap('compute')
+        response = answer_question(route, entities, guard(rainfall_df), guard(crop_df), views, watch)
+    if cache is not None:
+        cache.put(version, key, response)
+    return response
+
+def selected_rows(response):
+    """Row positions behind an answer: a list, or a dict of lists for two-dataset answers"""
+    data = response.get("data")
+    if data is None:
+        return None
+    if isinstance(data, dict):
+        return {name: [int(i) for i in frame.index] for name, frame in data.items()}
+    return [int(i) for i in data.index]
+
+def with_filter(route, question):
+    """Add a numeric threshold/range filter to the route slots, if the question has one"""
+    domain = route.intent.partition(".")[0]
+    if domain not in ('rainfall', 'crops', 'overview', 'correlation'):
+        return route
+    # A threshold often reads like a comparison to the classifier; only an
+    # explicit correlation keyword keeps such a question a correlation
+    if domain == 'correlation' and keyword_router.route(question).intent == 'correlation':
+        return route
+    numeric_filter = parse_filter(question, domain)
+    if numeric_filter is None:
+        return route
+    intent = route.intent if domain == numeric_filter.domain else numeric_filter.domain
+    return route._replace(intent=intent, slots=dict(route.slots, filter=numeric_filter))
+
+def with_departure(route, question):
+    """Add a departure-from-normal lookup to the route slots of a rainfall question"""
+    if route.intent.partition(".")[0] not in ('rainfall', 'overview'):
+        return route
+    # "in excess of 1000 mm" / "below 500 mm" are thresholds, not categories
+    if 'filter' in route.slots:
+        return route
+    departure = parse_departure(question)
+    if departure is None:
+        return route
+    return route._replace(intent='rainfall', slots=dict(route.slots, departure=departure))
+
+def measure(column, value):
+    """A metric value with the unit its column is stored in, as every answer prints it"""
+    _, unit, decimals = METRIC_NAMES[column]
+    return f"{value:.{decimals}f} {unit}"
+
+def with_metric(route):
+    """Add the season a rainfall ranking is about ("most rain in the NE monsoon") to the route slots"""
+    if route.intent not in ('rainfall.top', 'rainfall.lowest'):
+        return route
+    domain, metric = find_metric(route.tokens, 'rainfall')
+    if domain != 'rainfall' or metric == TOTAL_RAINFALL_COL:
+        return route
+    return route._replace(slots=dict(route.slots, metric=metric))
+
+def filtered_answer(response, df, name_col, rankings, route, noun, period, source, watch):
+    """Rows passing the route's numeric filter, found by binary search on the metric's RankingView"""
+    numeric_filter = route.slots['filter']
+    metric = numeric_filter.metric
+    positions = rankings[metric].between(numeric_filter.low, numeric_filter.high,
+                                         numeric_filter.low_inclusive, numeric_filter.high_inclusive)
+    data = df.iloc[positions]
+    response['data'] = data
+    response['chart'] = ('ranking', metric)
+    label, _, _ = METRIC_NAMES[metric]
+    num = route.slots.get('n', 25)
+    
+    watch.lap('format')
+    response['text'] = f"## 🔎 {noun} with {label} {describe(numeric_filter)} ({period})\n\n"
+    if len(data) == 0:
+        response['text'] += f"No {noun.lower()} match this filter.\n\n"
+    else:
+        response['text'] += f"Matches: **{len(data)}** of {len(rankings[metric].order)} {noun.lower()}, highest first:\n\n"
+        for rank, (name, value) in enumerate(zip(data[name_col][:num], data[metric][:num]), 1):
+            response['text'] += f"{rank}. **{name}**: {measure(metric, value)}\n"
+        if len(data) > num:
+            response['text'] += f"\n...and {len(data) - num} more in the data table.\n"
+        response['text'] += "\n"
+    response['text'] += source
+    return response
+
+def departure_answer(response, rainfall_df, departures, route, watch):
+    """Districts by departure from the seasonal normal, read from the precomputed DepartureTable"""
+    from departures import DEFICIENT_BELOW, EXCESS_FROM, SEASONS
+
+    season, category = route.slots['departure']
+    positions = departures.lookup(season, category)
+    data = rainfall_df.iloc[positions]
+    response['data'] = data
+    percent = departures.frame[f"{season}_percent"].to_numpy()[positions]
+    labels = departures.frame[f"{season}_category"].to_numpy()[positions]
+    num = route.slots.get('n', 25)
+    
+    watch.lap('format')
+    if category is None:
+        counts = departures.counts(season)
+        response['text'] = f"## 🌦️ {SEASONS[season]}: Departure from Normal (2017-18)\n\n"
+        response['text'] += (f"**{counts['deficient']}** deficient, **{counts['normal']}** normal and "
+                             f"**{counts['excess']}** excess districts, most deficient first:\n\n")
+    else:
+        response['text'] = f"## 🌦️ Districts with {category.title()} {SEASONS[season]} (2017-18)\n\n"
+        if len(data):
+            response['text'] += f"Matches: **{len(data)}** of {len(departures.lookup(season))} districts:\n\n"
+    if len(data) == 0:
+        response['text'] += f"No district had a {category} {SEASONS[season].lower()}.\n\n"
+    else:
+        rows = zip(data[DISTRICT_COL][:num], data[f"{season}_actual"][:num], data[f"{season}_normal"][:num],
+                   percent[:num], labels[:num])
+        for rank, (name, actual, normal, change, label) in enumerate(rows, 1):
+            response['text'] += f"{rank}. **{name}**: {actual:.1f} mm vs {normal:.1f} mm normal ({change:+.1f}%"
+            response['text'] += f", {label})\n" if category is None else ")\n"
+        if len(data) > num:
+            response['text'] += f"\n...and {len(data) - num} more in the data table.\n"
+        response['text'] += "\n"
+    response['text'] += (f"📏 Deficient: {DEFICIENT_BELOW:+.0f}% or less; excess: {EXCESS_FROM:+.0f}% or more "
+                         f"of the normal (IMD categories).\n\n")
+    response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+    return response
+
+def find_entities(route, views):
+    """Districts named in a rainfall or crop question"""
+    domain = route.intent.partition(".")[0]
+    if domain == 'rainfall':
+        return tuple(views['rainfall_districts'].find(route.tokens))
+    if domain == 'crops':
+        return tuple(views['crop_districts'].find(route.tokens))
+    return ()
+
+def answer_question(route, entities, rainfall_df, crop_df, views, watch=NULL_STOPWATCH):
+    """Build the response for a routed question; ``watch`` laps from compute to format"""
+    domain, _, operation = route.intent.partition(".")
+    response = {"text": "", "data": None, "data_type": None, "intent": route.intent, "chart": None}
+
+    # --- 1️⃣ Greetings / Small Talk and unrelated questions ---
+    if route.intent in CHAT_REPLIES:
+        watch.lap('format')
+        response["text"] = CHAT_REPLIES[route.intent]
+        return response
+    
+    # RAINFALL QUERIES
+    if domain == 'rainfall':
+        response['data_type'] = 'rainfall'
+        
+        # Check for specific districts
+        districts_mentioned = list(entities)
+        
+        if districts_mentioned:
+            data = rainfall_df[rainfall_df[DISTRICT_COL].isin(districts_mentioned)]
+            response['data'] = data
+            
+            if len(districts_mentioned) == 1:
+                district_name = districts_mentioned[0]
+                district_data = data.iloc[0]
+                total_rain = district_data[TOTAL_RAINFALL_COL]
+                sw_rain = district_data[SW_MONSOON_COL]
+                ne_rain = district_data[NE_MONSOON_COL]
+                
+                state_avg = rainfall_df[rainfall_df[DISTRICT_COL] == 'State Average'][TOTAL_RAINFALL_COL].values
+                
+                watch.lap('format')
+                response['text'] = f"## 🌧️ Rainfall Analysis for {district_name}\n\n"
+                response['text'] += f"### Annual Rainfall (2017-18)\n"
+                response['text'] += f"- **Total Annual Rainfall**: {total_rain:.1f} mm\n"
+                response['text'] += f"- **South West Monsoon** (June-Sept): {sw_rain:.1f} mm\n"
+                response['text'] += f"- **North East Monsoon** (Oct-Dec): {ne_rain:.1f} mm\n\n"
+                
+                # Compare with state average
+                if len(state_avg) > 0:
+                    diff = total_rain - state_avg[0]
+                    if diff > 0:
+                        response['text'] += f"📊 This is **{diff:.1f} mm above** the state average.\n\n"
+                    else:
+                        response['text'] += f"📊 This is **{abs(diff):.1f} mm below** the state average.\n\n"
+
+                # Departures from the district's own normals, precomputed at load
+                from departures import SEASONS
+
+                departures = views['rainfall_departures'].frame.iloc[data.index[0]]
+                response['text'] += f"### Departure from Normal\n"
+                for season, label in SEASONS.items():
+                    if isinstance(departures[f"{season}_category"], str):
+                        response['text'] += (f"- **{label}**: {departures[f'{season}_percent']:+.1f}% "
+                                             f"({departures[f'{season}_category']})\n")
+                response['text'] += "\n"
+
+                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+            
+            elif len(districts_mentioned) == 2:
+                response['chart'] = ('seasons', None)
+                d1, d2 = districts_mentioned[0], districts_mentioned[1]
+                r1 = data[data[DISTRICT_COL] == d1][TOTAL_RAINFALL_COL].values[0]
+                r2 = data[data[DISTRICT_COL] == d2][TOTAL_RAINFALL_COL].values[0]
+                
+                watch.lap('format')
+                response['text'] = f"## 📊 Rainfall Comparison (2017-18)\n\n"
+                response['text'] += f"### {d1} vs {d2}\n\n"
+                response['text'] += f"| District | Total Rainfall |\n"
+                response['text'] += f"|----------|----------------|\n"
+                response['text'] += f"| **{d1}** | {r1:.1f} mm |\n"
+                response['text'] += f"| **{d2}** | {r2:.1f} mm |\n\n"
+                
+                diff = abs(r1 - r2)
+                higher = d1 if r1 > r2 else d2
+                
+                response['text'] += f"**Analysis**: {higher} received **{diff:.1f} mm more** rainfall than the other district.\n\n"
+                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+            
+            else:
+                response['chart'] = ('seasons', None)
+                watch.lap('format')
+                response['text'] = f"## 🌧️ Rainfall Data for Multiple Districts\n\n"
+                response['text'] += f"Showing rainfall data for {len(districts_mentioned)} districts.\n\n"
+                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+        
+        elif 'departure' in route.slots:
+            departure_answer(response, rainfall_df, views['rainfall_departures'], route, watch)
+        
+        elif 'filter' in route.slots:
+            filtered_answer(response, rainfall_df, DISTRICT_COL, views['rainfall_rankings'], route,
+                            "Districts", "2017-18", "*[Source: India Meteorological Department via data.gov.in]*", watch)
+        
+        elif operation == 'top':
+            num = route.slots.get('n', 10)
+            metric = route.slots.get('metric', TOTAL_RAINFALL_COL)
+            label = "Rainfall" if metric == TOTAL_RAINFALL_COL else METRIC_NAMES[metric][0]
+            
+            positions = views['rainfall_rankings'][metric].top(num)
+            num = len(positions)
+            data = rainfall_df.iloc[positions]
+            response['data'] = data
+            response['chart'] = ('ranking', metric)
+            
+            top_district = data.iloc[0][DISTRICT_COL]
+            top_rainfall = data.iloc[0][metric]
+            
+            watch.lap('format')
+            response['text'] = f"## 🏆 Top {num} Districts by {label} (2017-18)\n\n"
+            response['text'] += f"### Highest {label}:\n"
+            response['text'] += f"**{top_district}** with **{measure(metric, top_rainfall)}**\n\n"
+            response['text'] += f"### Complete Ranking:\n"
+            
+            for rank, (district, rainfall) in enumerate(zip(data[DISTRICT_COL], data[metric]), 1):
+                response['text'] += f"{rank}. **{district}**: {measure(metric, rainfall)}\n"
+            
+            response['text'] += f"\n*[Source: India Meteorological Department via data.gov.in]*"
+        
+        elif operation == 'lowest':
+            num = route.slots.get('n', 10)
+            metric = route.slots.get('metric', TOTAL_RAINFALL_COL)
+            label = "Rainfall" if metric == TOTAL_RAINFALL_COL else METRIC_NAMES[metric][0]
+            positions = views['rainfall_rankings'][metric].bottom(num)
+            num = len(positions)
+            data = rainfall_df.iloc[positions]
+            response['data'] = data
+            response['chart'] = ('ranking', metric)
+            
+            bottom_district = data.iloc[0][DISTRICT_COL]
+            bottom_rainfall = data.iloc[0][metric]
+            
+            watch.lap('format')
+            response['text'] = f"## 📉 Districts with Lowest {label} (2017-18)\n\n"
+            response['text'] += f"### Lowest {label}:\n"
+            response['text'] += f"**{bottom_district}** with **{measure(metric, bottom_rainfall)}**\n\n"
+            response['text'] += f"### Bottom {num} Districts:\n"
+            
+            for rank, (district, rainfall) in enumerate(zip(data[DISTRICT_COL], data[metric]), 1):
+                response['text'] += f"{rank}. **{district}**: {measure(metric, rainfall)}\n"
+            
+            response['text'] += f"\n*[Source: India Meteorological Department via data.gov.in]*"
+        
+        elif operation == 'average':
+            state_avg_data = rainfall_df[rainfall_df[DISTRICT_COL] == 'State Average']
+            if len(state_avg_data) > 0:
+                response['data'] = state_avg_data
+                avg_rainfall = state_avg_data[TOTAL_RAINFALL_COL].values[0]
+                watch.lap('format')
+                response['text'] = f"## 📊 Tamil Nadu State Average Rainfall (2017-18)\n\n"
+                response['text'] += f"**Average Annual Rainfall**: {avg_rainfall:.1f} mm\n\n"
+                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+            else:
+                avg_rainfall = rainfall_df[rainfall_df[DISTRICT_COL] != 'State Average'][TOTAL_RAINFALL_COL].mean()
+                watch.lap('format')
+                response['text'] = f"## 📊 Tamil Nadu Average Rainfall (2017-18)\n\n"
+                response['text'] += f"**Calculated Average**: {avg_rainfall:.1f} mm (across {len(rainfall_df)-1} districts)\n\n"
+                response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+                response['data'] = rainfall_df.head(15)
+        
+        else:
+            data = rainfall_df.head(15)
+            response['data'] = data
+            watch.lap('format')
+            response['text'] = f"## 🌧️ Tamil Nadu Rainfall Data (2017-18)\n\n"
+            response['text'] += f"Showing rainfall data for {len(rainfall_df)} districts including seasonal breakdowns.\n\n"
+            response['text'] += "**Available Data:**\n"
+            response['text'] += "- South West Monsoon (June-September)\n"
+            response['text'] += "- North East Monsoon (October-December)\n"
+            response['text'] += "- Winter Season (January-February)\n"
+            response['text'] += "- Hot Weather Season (March-May)\n\n"
+            response['text'] += "*[Source: India Meteorological Department via data.gov.in]*"
+    
+    # CROP QUERIES
+    elif domain == 'crops':
+        response['data_type'] = 'crops'
+        
+        # Check for specific crops
+        crops_mentioned = list(entities)
+        
+        if crops_mentioned:
+            data = crop_df[crop_df[CROP_COL].isin(crops_mentioned)]
+            response['data'] = data
+            
+            watch.lap('format')
+            response['text'] = f"## 🌾 Crop Production Analysis (Tamil Nadu 2012-13)\n\n"
+            
+            for crop in crops_mentioned[:5]:  # Show max 5 crops
+                if crop in data[CROP_COL].values:
+                    crop_data = data[data[CROP_COL] == crop].iloc[0]
+                    
+                    response['text'] += f"### {crop}\n"
+                    response['text'] += f"- **Area Under Cultivation**: {measure(AREA_COL, crop_data[AREA_COL])}\n"
+                    response['text'] += f"- **Total Production**: {measure(PRODUCTION_COL, crop_data[PRODUCTION_COL])}\n"
+                    response['text'] += f"- **Productivity**: {measure(PRODUCTIVITY_COL, crop_data[PRODUCTIVITY_COL])}\n\n"
+            
+            response['text'] += "*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
+        
+        elif 'filter' in route.slots:
+            filtered_answer(response, crop_df, CROP_COL, views['crop_rankings'], route,
+                            "Crops", "Tamil Nadu 2012-13", "*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*", watch)
+        
+        elif operation == 'production':
+            num = route.slots.get('n', 10)
+            
+            positions = views['crop_rankings'][PRODUCTION_COL].top(num)
+            num = len(positions)
+            data = crop_df.iloc[positions]
+            response['data'] = data
+            response['chart'] = ('ranking', PRODUCTION_COL)
+            
+            top_crop = data.iloc[0][CROP_COL]
+            top_production = data.iloc[0][PRODUCTION_COL]
+            
+            watch.lap('format')
+            response['text'] = f"## 🏆 Top {num} Crops by Production (Tamil Nadu 2012-13)\n\n"
+            response['text'] += f"### Highest Production:\n"
+            response['text'] += f"**{top_crop}** with **{measure(PRODUCTION_COL, top_production)}**\n\n"
+            response['text'] += f"### Complete Ranking:\n\n"
+            
+            for rank, (crop, production) in enumerate(zip(data[CROP_COL], data[PRODUCTION_COL]), 1):
+                response['text'] += f"{rank}. **{crop}**: {measure(PRODUCTION_COL, production)}\n"
+            
+            response['text'] += f"\n*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
+        
+        elif operation == 'productivity':
+            num = route.slots.get('n', 10)
+            positions = views['crop_rankings'][PRODUCTIVITY_COL].top(num)
+            num = len(positions)
+            data = crop_df.iloc[positions]
+            response['data'] = data
+            response['chart'] = ('ranking', PRODUCTIVITY_COL)
+            
+            top_crop = data.iloc[0][CROP_COL]
+            top_productivity = data.iloc[0][PRODUCTIVITY_COL]
+            
+            watch.lap('format')
+            response['text'] = f"## 📈 Top {num} Crops by Productivity (Tamil Nadu 2012-13)\n\n"
+            response['text'] += f"### Highest Yield:\n"
+            response['text'] += f"**{top_crop}** with **{measure(PRODUCTIVITY_COL, top_productivity)}**\n\n"
+            response['text'] += f"### Complete Ranking:\n\n"
+            
+            for rank, (crop, productivity) in enumerate(zip(data[CROP_COL], data[PRODUCTIVITY_COL]), 1):
+                response['text'] += f"{rank}. **{crop}**: {measure(PRODUCTIVITY_COL, productivity)}\n"
+            
+            response['text'] += f"\n*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
+        
+        elif operation == 'area':
+            num = route.slots.get('n', 10)
+            positions = views['crop_rankings'][AREA_COL].top(num)
+            num = len(positions)
+            data = crop_df.iloc[positions]
+            response['data'] = data
+            response['chart'] = ('ranking', AREA_COL)
+            
+            watch.lap('format')
+            response['text'] = f"## 📏 Top {num} Crops by Cultivation Area (Tamil Nadu 2012-13)\n\n"
+            
+            for rank, (crop, area) in enumerate(zip(data[CROP_COL], data[AREA_COL]), 1):
+                response['text'] += f"{rank}. **{crop}**: {measure(AREA_COL, area)}\n"
+            
+            response['text'] += f"\n*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
+        
+        else:
+            data = crop_df.head(10)
+            response['data'] = data
+            watch.lap('format')
+            response['text'] = f"## 🌾 Tamil Nadu Crop Production Statistics (2012-13)\n\n"
+            response['text'] += f"Showing production, area, and productivity data for major crops in Tamil Nadu.\n\n"
+            response['text'] += f"**Total Crops in Dataset**: {len(crop_df)}\n\n"
+            response['text'] += "*[Source: Ministry of Agriculture & Farmers Welfare via data.gov.in]*"
+    
+    # CORRELATION/COMPARISON QUERIES
+    elif domain == 'correlation':
+        from correlation import cached_join, rainfall_findings, strength
+
+        response['data_type'] = 'both'
+        joined = cached_join(views['version'], rainfall_df, crop_df)
+        findings = rainfall_findings(joined, PRODUCTIVITY_COL)
+        response['data'] = {
+            'rainfall': rainfall_df.iloc[joined['rainfall_row'].to_numpy()],
+            'crops': crop_df.iloc[joined['crop_row'].to_numpy()]
+        }
+        
+        watch.lap('format')
+        response['text'] = f"## 🔗 Rainfall vs Crop Productivity\n\n"
+        if not findings:
+            response['text'] += f"Only {len(joined)} districts appear in both datasets, too few to relate rainfall to productivity.\n\n"
+        else:
+            response['text'] += f"Matched **{findings[0]['n']} districts** present in both the rainfall and the crop dataset.\n\n"
+            response['text'] += f"### 📈 Ranked Findings (productivity vs rainfall)\n"
+            for rank, finding in enumerate(findings, 1):
+                response['text'] += (f"{rank}. **{finding['label']}**: r = {finding['r']:+.2f} "
+                                     f"({strength(finding['r'])}, R² = {finding['r2']:.2f}); "
+                                     f"productivity changes by {finding['slope'] * 100:+.2f} per 100 mm\n")
+            
+            strongest = findings[0]
+            response['text'] += f"\n### ⚠️ Outlier Districts ({strongest['label']})\n"
+            if strongest['outliers']:
+                for district, productivity, z in strongest['outliers']:
+                    side = "above" if z > 0 else "below"
+                    response['text'] += f"- **{district}**: productivity {productivity:.2f}, well {side} what its rainfall predicts (z = {z:+.1f})\n"
+            else:
+                response['text'] += "- No district is more than 2 standard deviations off the fitted line.\n"
+            response['text'] += "\n"
+        
+        response['text'] += f"**Note**: The datasets cover different time periods (2012-13 for crops, 2017-18 for rainfall), so these are associations across districts, not year-on-year effects.\n\n"
+        response['text'] += "*[Sources: IMD & Ministry of Agriculture via data.gov.in]*"
+    
+    # DEFAULT: Show both datasets
+    else:
+        response['data_type'] = 'both'
+        response['data'] = {
+            'rainfall': rainfall_df.head(10),
+            'crops': crop_df.head(10)
+        }
+        
+        watch.lap('format')
+        response['text'] = f"## 🌾 AgriClimate Intelligence System\n\n"
+        response['text'] += f"I have access to real data from **data.gov.in**:\n\n"
+        response['text'] += f"### 📊 Available Datasets:\n\n"
+        response['text'] += f"**1. Rainfall Data (2017-18)**\n"
+        response['text'] += f"- 32 districts in Tamil Nadu\n"
+        response['text'] += f"- Seasonal rainfall patterns\n"
+        response['text'] += f"- Source: India Meteorological Department\n\n"
+        response['text'] += f"**2. Crop Production Data (2012-13)**\n"
+        response['text'] += f"- {len(crop_df)} crops\n"
+        response['text'] += f"- Production, area, and productivity statistics\n"
+        response['text'] += f"- Source: Ministry of Agriculture & Farmers Welfare\n\n"
+        response['text'] += f"### 💡 You can ask me:\n"
+        response['text'] += f"- Which district has the highest rainfall?\n"
+        response['text'] += f"- Compare rainfall between Chennai and Coimbatore\n"
+        response['text'] += f"- Show top 5 crops by production\n"
+        response['text'] += f"- What is paddy production in Tamil Nadu?\n"
+        response['text'] += f"- Which crops have the highest productivity?\n\n"
+        response['text'] += "*[Data sourced from data.gov.in]*"
+    
+    return response
+
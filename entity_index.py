@@ -0,0 +1,153 @@
+"""Normalized name index for district (and crop) extraction from questions.
+
+Names are stored as token tuples in a hash map, so finding every name in a
+question costs a handful of lookups per question token no matter how many
+names are indexed. Misspellings fall back to a symmetric-delete index
+(the SymSpell idea): each indexed word is stored under all of its variants
+with up to ``max_edits`` characters deleted, and a question word is looked up
+by its own delete variants, which bounds the work by the word length instead
+of the vocabulary size.
+
+Districts are also indexed under the other spellings in ``DISTRICT_ALIASES``
+(Trichy, Tuticorin, ...), so "rainfall in Trichy" finds Tiruchirappalli.
+"""
+from itertools import combinations
+
+from intent_router import tokenize
+
+
+# Spelling variants (as join keys) → the key used for the district
+DISTRICT_ALIASES = {
+    "kanyakumari": "kanniyakumari",
+    "trichy": "tiruchirappalli",
+    "tiruchi": "tiruchirappalli",
+    "tiruchirapalli": "tiruchirappalli",
+    "ramanadhapuram": "ramanathapuram",
+    "sivagangai": "sivaganga",
+    "thiruvarur": "tiruvarur",
+    "tirupur": "tiruppur",
+    "thiruvallur": "tiruvallur",
+    "thiruvannamalai": "tiruvannamalai",
+    "thirunelveli": "tirunelveli",
+    "tuticorin": "thoothukudi",
+    "thoothukkudi": "thoothukudi",
+    "kancheepuram": "kanchipuram",
+    "viluppuram": "villupuram",
+    "nagapattinam": "nagappattinam",
+}
+
+
+def normalize(name):
+    """Token tuple used as the index key for a name."""
+    return tuple(tokenize(str(name)))
+
+
+def edit_budget(word, max_edits):
+    """Edits allowed for a word: none for short words, more for long ones."""
+    if len(word) < 6:
+        return 0
+    if len(word) < 9:
+        return min(1, max_edits)
+    return max_edits
+
+
+def delete_variants(word, edits):
+    """``word`` with every combination of up to ``edits`` characters removed."""
+    variants = {word}
+    for k in range(1, edits + 1):
+        if len(word) - k < 1:
+            break
+        for drop in combinations(range(len(word)), k):
+            variants.add("".join(c for i, c in enumerate(word) if i not in drop))
+    return variants
+
+
+def edit_distance(a, b, limit):
+    """Damerau-Levenshtein distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class EntityIndex:
+    """Find known names (e.g. districts) mentioned in a question."""
+
+    def __init__(self, names, max_edits=2, aliases=None):
+        self.max_edits = max_edits
+        self.phrases = {}
+        self.max_words = 1
+        self.deletes = {}
+        aliases = aliases or {}
+        spellings = {}
+        for alias, target in aliases.items():
+            spellings.setdefault(target, [target]).append(alias)
+        for name in names:
+            if name is None or str(name) == "nan":
+                continue
+            key = normalize(name)
+            if not key:
+                continue
+            self._add(key, name)
+            # "The Nilgiris" is usually written as just "Nilgiris"
+            if len(key) > 1 and key[0] == "the":
+                self._add(key[1:], name)
+                key = key[1:]
+            # Other spellings of the name; a real name keeps its own key
+            joined = "".join(key)
+            for spelling in spellings.get(aliases.get(joined, joined), ()):
+                self._add((spelling,), name)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def _add(self, key, name):
+        self.phrases.setdefault(key, name)
+        self.max_words = max(self.max_words, len(key))
+        if len(key) == 1 and self.max_edits:
+            word = key[0]
+            for variant in delete_variants(word, edit_budget(word, self.max_edits)):
+                self.deletes.setdefault(variant, set()).add(word)
+
+    def find(self, tokens, fuzzy=True):
+        """Names mentioned in ``tokens`` (a question string or token list), in order."""
+        if isinstance(tokens, str):
+            tokens = tokenize(tokens)
+        found = []
+        i = 0
+        while i < len(tokens):
+            for size in range(min(self.max_words, len(tokens) - i), 0, -1):
+                name = self.phrases.get(tuple(tokens[i:i + size]))
+                if name is not None:
+                    break
+            else:
+                size = 1
+                name = self._closest(tokens[i]) if fuzzy and self.deletes else None
+            if name is not None and name not in found:
+                found.append(name)
+            i += size
+        return found
+
+    def _closest(self, word):
+        budget = edit_budget(word, self.max_edits)
+        if not budget or word.isdigit():
+            return None
+        best, best_distance = None, budget + 1
+        for variant in delete_variants(word, budget):
+            for candidate in self.deletes.get(variant, ()):
+                distance = edit_distance(word, candidate, budget)
+                if distance <= edit_budget(candidate, self.max_edits) and (
+                        distance < best_distance or distance == best_distance and candidate < best):
+                    best, best_distance = candidate, distance
+        return self.phrases[(best,)] if best is not None else None
@@ -0,0 +1,314 @@
+"""Fetch the datasets from the data.gov.in API into ``data/``.
+
+Every dataset in ``data/dataset.json`` with a ``"resource_id"`` is downloaded
+as CSV from the Open Government Data API, page by page
+(``offset``/``limit``), and written over its file in ``data/`` only when the
+content changed. From there it takes the usual path: ``load_dataset``
+rebuilds the column store on the next load, and a running app picks it up
+through the registry.
+
+Transfers run on asyncio over a small HTTP/1.1 client on the stdlib streams:
+one keep-alive ``ConnectionPool`` per host, at most ``concurrency`` requests
+in flight, so hundreds of resources share a handful of connections. Every
+page is kept in an on-disk ``ResponseCache`` with its ETag and Last-Modified;
+the next run revalidates with If-None-Match / If-Modified-Since and a 304
+reuses the cached copy without a body on the wire.
+
+    DATA_GOV_IN_API_KEY=... python fetcher.py [--concurrency 8] [--page-size 1000] [--load]
+
+``AGRICLIMATE_API_BASE`` points the fetcher at another server (the offline
+stand-in in benchmarks/standin_api.py, for instance).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import ssl
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from dataset_store import DATA_DIR, DATASETS
+
+
+API_BASE = os.environ.get("AGRICLIMATE_API_BASE", "https://api.data.gov.in/resource")
+CACHE_DIR = DATA_DIR / "http_cache"
+PAGE_SIZE = 1000
+MAX_PAGES = 10_000
+CONCURRENCY = 8
+TIMEOUT = 30.0
+USER_AGENT = "AgriClimateBot-fetcher/1.0"
+
+Response = namedtuple("Response", "status headers body")
+
+
+class FetchError(Exception):
+    """A resource could not be fetched (HTTP error or broken response)."""
+
+
+async def read_chunked(reader):
+    """Body of a ``Transfer-Encoding: chunked`` response."""
+    chunks = []
+    while True:
+        size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+        if size == 0:
+            # Trailers, up to the blank line
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one host, ``size`` requests at a time.
+
+    Idle connections are reused last-in first-out; a reused connection the
+    server has meanwhile closed is replaced once, transparently.
+    """
+
+    def __init__(self, scheme, host, port, size=CONCURRENCY, timeout=TIMEOUT):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if scheme == "https" else None
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(size)
+        self.idle = []
+        self.opened = 0
+
+    @classmethod
+    def for_url(cls, url, size=CONCURRENCY, timeout=TIMEOUT):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return cls(parts.scheme, parts.hostname, port, size, timeout)
+
+    async def connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(self, target, headers=None):
+        """GET ``target`` (path and query); returns a Response."""
+        async with self.semaphore:
+            for attempt in range(2):
+                reused = bool(self.idle)
+                reader, writer = self.idle.pop() if reused else await asyncio.wait_for(self.connect(), self.timeout)
+                try:
+                    response, keep_alive = await asyncio.wait_for(
+                        self.exchange(reader, writer, target, headers or {}), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return response
+
+    async def exchange(self, reader, writer, target, headers):
+        lines = [f"GET {target} HTTP/1.1", f"Host: {self.host}", f"User-Agent: {USER_AGENT}",
+                 "Accept-Encoding: identity", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        version, status, *_ = (await reader.readuntil(b"\r\n")).decode("latin-1").split(None, 2)
+        status = int(status)
+        response_headers = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        if status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await read_chunked(reader)
+        elif "content-length" in response_headers:
+            body = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return Response(status, response_headers, body), keep_alive
+
+    async def close(self):
+        idle, self.idle = self.idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class ResponseCache:
+    """Fetched pages on disk with their validators, keyed by the request (without the API key)."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = Path(directory)
+
+    def paths(self, key):
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.directory / f"{name}.json", self.directory / f"{name}.body"
+
+    def get(self, key):
+        """(validators, body) of a cached page, or None."""
+        meta_path, body_path = self.paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key or meta.get("size") != len(body):
+            return None
+        return meta, body
+
+    def put(self, key, headers, body):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self.paths(key)
+        meta = {"key": key, "etag": headers.get("etag"), "last_modified": headers.get("last-modified"),
+                "size": len(body), "fetched": time.time()}
+        # Body first, metadata last: a metadata file always describes a complete body
+        write_atomic(body_path, body)
+        write_atomic(meta_path, json.dumps(meta).encode())
+
+
+def write_atomic(path, data):
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+async def fetch_page(pool, cache, target, key, stats):
+    """One page, revalidated against the cached copy when there is one."""
+    cached = cache.get(key) if cache is not None else None
+    headers = {}
+    if cached is not None:
+        if cached[0].get("etag"):
+            headers["If-None-Match"] = cached[0]["etag"]
+        if cached[0].get("last_modified"):
+            headers["If-Modified-Since"] = cached[0]["last_modified"]
+    response = await pool.request(target, headers)
+    stats["requests"] += 1
+    if response.status == 304 and cached is not None:
+        stats["not_modified"] += 1
+        return cached[1]
+    if response.status != 200:
+        raise FetchError(f"HTTP {response.status} for {key}")
+    stats["downloaded_bytes"] += len(response.body)
+    if cache is not None:
+        cache.put(key, response.headers, response.body)
+    return response.body
+
+
+async def fetch_resource(pool, cache, base_path, resource_id, api_key, page_size, stats):
+    """CSV bytes of a whole resource: the pages joined under a single header row."""
+    parts = []
+    for page in range(MAX_PAGES):
+        params = {"format": "csv", "offset": page * page_size, "limit": page_size}
+        key = f"{resource_id}?{urlencode(params)}"
+        target = f"{base_path}/{resource_id}?{urlencode(dict(params, **{'api-key': api_key}))}"
+        body = await fetch_page(pool, cache, target, key, stats)
+        header, _, rows = body.partition(b"\n")
+        if page == 0:
+            parts.append(header + b"\n")
+        if rows.strip():
+            parts.append(rows if rows.endswith(b"\n") else rows + b"\n")
+        stats["pages"] += 1
+        if rows.count(b"\n") + (not rows.endswith(b"\n")) < page_size or not rows.strip():
+            break
+    else:
+        raise FetchError(f"{resource_id}: more than {MAX_PAGES} pages")
+    return b"".join(parts)
+
+
+async def fetch_all(resources, api_base=API_BASE, api_key="", concurrency=CONCURRENCY,
+                    page_size=PAGE_SIZE, cache=None, stats=None):
+    """{name: CSV bytes or the exception} for ``resources`` ({name: resource id})."""
+    stats = Counter() if stats is None else stats
+    pool = ConnectionPool.for_url(api_base, concurrency)
+    base_path = urlsplit(api_base).path.rstrip("/")
+    try:
+        results = await asyncio.gather(
+            *(fetch_resource(pool, cache, base_path, resource_id, api_key, page_size, stats)
+              for resource_id in resources.values()),
+            return_exceptions=True)
+    finally:
+        stats["connections"] += pool.opened
+        await pool.close()
+    return dict(zip(resources, results))
+
+
+def listed_resources(metadata_path=DATA_DIR / "dataset.json"):
+    """{dataset name: resource id} for the datasets of dataset.json that name one."""
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    return {name: info["resource_id"] for name, info in metadata.items()
+            if name in DATASETS and info.get("resource_id")}
+
+
+def refresh(data_dir=DATA_DIR, api_base=API_BASE, api_key="", concurrency=CONCURRENCY,
+            page_size=PAGE_SIZE, cache_dir=None, stats=None):
+    """Fetch the listed resources and update their CSVs in ``data_dir``.
+
+    Returns {dataset name: "updated" | "unchanged" | "failed: ..."}; a failed
+    dataset keeps its current file.
+    """
+    data_dir = Path(data_dir)
+    cache = ResponseCache(cache_dir or data_dir / "http_cache")
+    resources = listed_resources(data_dir / "dataset.json")
+    results = asyncio.run(fetch_all(resources, api_base, api_key, concurrency, page_size, cache, stats))
+    status = {}
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            status[name] = f"failed: {type(result).__name__}: {result}"
+            continue
+        path = data_dir / DATASETS[name]
+        if path.exists() and path.read_bytes() == result:
+            status[name] = "unchanged"
+        else:
+            write_atomic(path, result)
+            status[name] = "updated"
+    return status
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fetch the AgriClimateBot datasets from data.gov.in")
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    parser.add_argument("--api-base", default=API_BASE)
+    parser.add_argument("--api-key", default=os.environ.get("DATA_GOV_IN_API_KEY", ""))
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="connections / requests in flight")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="records per request")
+    parser.add_argument("--load", action="store_true", help="rebuild the column stores right away")
+    args = parser.parse_args(argv)
+
+    if not listed_resources(Path(args.data_dir) / "dataset.json"):
+        print("no dataset in dataset.json has a resource_id; nothing to fetch")
+        return 0
+    stats = Counter()
+    start = time.perf_counter()
+    status = refresh(args.data_dir, args.api_base, args.api_key, args.concurrency, args.page_size, stats=stats)
+    for name, state in status.items():
+        print(f"{name}: {state}")
+    print(f"{stats['requests']} requests ({stats['not_modified']} not modified), "
+          f"{stats['downloaded_bytes'] / 1024:.0f} KiB in {time.perf_counter() - start:.2f} s "
+          f"over {stats['connections']} connections")
+    if args.load and "updated" in status.values():
+        import engine
+
+        engine.load_datasets(args.data_dir)
+    return 1 if any(state.startswith("failed") for state in status.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
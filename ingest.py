@@ -0,0 +1,271 @@
+"""Streaming CSV ingestion into the column store.
+
+Large multi-year CSVs are read in fixed-size chunks, so peak memory depends
+on the chunk size and not on the file size. Every chunk is checked against
+the column schema in ``data/dataset.json``, cast to compact dtypes
+(float32, the smallest int that fits, categorical codes) and appended to the
+column files of a new store, which replaces the old one only once the whole
+file has been ingested.
+
+    python ingest.py data/rainfall_data.csv rainfall_data [--append]
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dataset_store import (
+    DATA_DIR, FORMAT_VERSION, STORE_DIR, canonical_columns, commit_store, file_fingerprint,
+    new_store_path, read_manifest,
+)
+
+
+METADATA_PATH = DATA_DIR / "dataset.json"
+DEFAULT_CHUNK_ROWS = 100_000
+INT_DTYPES = [np.dtype(t) for t in (np.int8, np.int16, np.int32, np.int64)]
+
+
+class SchemaError(ValueError):
+    """A CSV does not match the schema expected for its dataset."""
+
+
+def load_schema(name, metadata_path=METADATA_PATH):
+    """Column specs for dataset ``name`` keyed by canonical name, or None."""
+    try:
+        with open(metadata_path) as f:
+            columns = json.load(f)[name]["columns"]
+    except (OSError, ValueError, KeyError):
+        return None
+    return {spec["name"]: spec for spec in columns}
+
+
+def smallest_int(lo, hi):
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    raise SchemaError(f"integer range {lo}..{hi} does not fit in int64")
+
+
+def infer_type(series):
+    """Schema type for a column the schema does not describe."""
+    if pd.api.types.is_integer_dtype(series):
+        return "int"
+    if pd.api.types.is_numeric_dtype(series):
+        return "float32"
+    return "category"
+
+
+class ColumnWriter:
+    """Appends the chunks of one column to its file in the store.
+
+    Integer columns typed ``int`` and category codes are written wide while
+    streaming and narrowed to the smallest dtype that fits in ``finish``.
+    """
+
+    def __init__(self, store_path, name, label, type_, fill=None):
+        self.name = name
+        self.label = label
+        self.fill = fill
+        self.file = f"{name}.bin"
+        self.path = Path(store_path) / self.file
+        self.rows = 0
+        self.lo, self.hi = None, None
+        self.categories = {}
+        if type_ == "category":
+            self.kind, self.write_dtype, self.auto = "category", np.dtype(np.int32), True
+        elif type_ == "int":
+            self.kind, self.write_dtype, self.auto = "numeric", np.dtype(np.int64), True
+        else:
+            dtype = np.dtype(type_)
+            self.kind, self.write_dtype, self.auto = "numeric", dtype, False
+        self.handle = None
+
+    @classmethod
+    def resume(cls, store_path, old_store, spec):
+        """Writer continuing an existing column, copied into ``store_path``."""
+        if spec["kind"] == "category":
+            type_ = "category"
+        elif spec.get("auto"):
+            type_ = "int"
+        else:
+            type_ = spec["dtype"]
+        writer = cls(store_path, spec["name"], spec["label"], type_, spec.get("fill"))
+        writer.categories = {c: i for i, c in enumerate(spec.get("categories", []))}
+        writer.lo, writer.hi = spec.get("min"), spec.get("max")
+        old = Path(old_store) / spec["file"]
+        if np.dtype(spec["dtype"]) == writer.write_dtype:
+            shutil.copyfile(old, writer.path)
+        else:
+            copy_cast(old, np.dtype(spec["dtype"]), writer.path, writer.write_dtype)
+        writer.rows = old.stat().st_size // np.dtype(spec["dtype"]).itemsize
+        return writer
+
+    def append(self, series, first_line):
+        if self.kind == "category":
+            values = self._codes(series)
+        else:
+            values = self._numbers(series, first_line)
+        if self.handle is None:
+            self.handle = open(self.path, "ab")
+        np.ascontiguousarray(values, dtype=self.write_dtype).tofile(self.handle)
+        self.rows += len(values)
+
+    def _codes(self, series):
+        local, uniques = pd.factorize(series)
+        if not len(uniques):
+            return np.full(len(series), -1, dtype=np.int32)
+        mapping = np.array([self.categories.setdefault(str(u), len(self.categories)) for u in uniques],
+                           dtype=np.int32)
+        return np.where(local >= 0, mapping[np.maximum(local, 0)], -1)
+
+    def _numbers(self, series, first_line):
+        values = pd.to_numeric(series, errors="coerce")
+        invalid = values.isna().to_numpy() & series.notna().to_numpy()
+        if self.write_dtype.kind == "i":
+            invalid |= values.isna().to_numpy()
+        if invalid.any():
+            if self.fill is None:
+                bad = int(np.argmax(invalid))
+                raise SchemaError(f"column {self.label!r}: {series.iloc[bad]!r} on line {first_line + bad} "
+                                  f"is not a valid number")
+            values = values.where(~invalid, self.fill)
+        values = values.to_numpy()
+        if self.write_dtype.kind == "i":
+            if len(values) and not np.all(np.mod(values, 1) == 0):
+                bad = int(np.argmax(np.mod(values, 1) != 0))
+                raise SchemaError(f"column {self.label!r}: {series.iloc[bad]!r} on line {first_line + bad} "
+                                  f"is not an integer")
+            if len(values):
+                lo, hi = values.min(), values.max()
+                self.lo = lo if self.lo is None else min(self.lo, lo)
+                self.hi = hi if self.hi is None else max(self.hi, hi)
+                info = np.iinfo(self.write_dtype)
+                if self.lo < info.min or self.hi > info.max:
+                    raise SchemaError(f"column {self.label!r}: values {self.lo}..{self.hi} "
+                                      f"do not fit in {self.write_dtype.name}")
+        return values
+
+    def finish(self):
+        """Close the file, narrow auto-sized columns and return the manifest spec."""
+        if self.handle is not None:
+            self.handle.close()
+        elif not self.path.exists():
+            self.path.touch()
+        dtype = self.write_dtype
+        if self.kind == "category":
+            dtype = smallest_int(-1, max(len(self.categories) - 1, 0))
+        elif self.auto:
+            dtype = smallest_int(int(self.lo or 0), int(self.hi or 0))
+        if dtype != self.write_dtype:
+            narrowed = self.path.with_suffix(".narrow")
+            copy_cast(self.path, self.write_dtype, narrowed, dtype)
+            narrowed.replace(self.path)
+        spec = {"name": self.name, "label": self.label, "kind": self.kind, "dtype": dtype.str, "file": self.file}
+        if self.kind == "category":
+            spec["categories"] = list(self.categories)
+        elif self.auto:
+            spec.update(auto=True, min=int(self.lo or 0), max=int(self.hi or 0))
+        if self.fill is not None:
+            spec["fill"] = self.fill
+        return spec
+
+
+def copy_cast(src, src_dtype, dst, dst_dtype, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Copy a raw column file to another dtype without loading it whole."""
+    rows = Path(src).stat().st_size // src_dtype.itemsize
+    with open(dst, "wb") as out:
+        if rows:
+            values = np.memmap(src, dtype=src_dtype, mode="r", shape=(rows,))
+            for start in range(0, rows, chunk_rows):
+                values[start:start + chunk_rows].astype(dst_dtype).tofile(out)
+            del values
+
+
+def validate_header(headers, schema):
+    """Canonical names for ``headers``; raises SchemaError on missing columns."""
+    names = canonical_columns(headers)
+    if schema:
+        present = set(names.values())
+        missing = [n for n, spec in schema.items() if n not in present and not spec.get("optional")]
+        if missing:
+            raise SchemaError(f"missing columns: {', '.join(missing)}")
+    return names
+
+
+def ingest_csv(csv_path, store_path, schema=None, chunksize=DEFAULT_CHUNK_ROWS, append=False):
+    """Stream ``csv_path`` into the column store at ``store_path``.
+
+    With ``append=True`` the rows are added after those already in the store
+    (same columns required); otherwise the store is rebuilt from this file.
+    Returns the new manifest.
+    """
+    csv_path, store_path = Path(csv_path), Path(store_path)
+    headers = list(pd.read_csv(csv_path, nrows=0).columns)
+    names = validate_header(headers, schema)
+    schema = schema or {}
+    source = dict(file_fingerprint(csv_path), path=str(csv_path))
+
+    tmp_path = new_store_path(store_path)
+    old = read_manifest(store_path) if append else None
+    try:
+        if old is not None:
+            if sorted(spec["name"] for spec in old["columns"]) != sorted(names.values()):
+                raise SchemaError(f"{csv_path} columns do not match the store at {store_path}")
+            writers = {spec["name"]: ColumnWriter.resume(tmp_path, store_path, spec) for spec in old["columns"]}
+            rows = old["rows"]
+        else:
+            writers = {}
+            rows = 0
+
+        # Force category columns to text so "07" and 7 never become different types per chunk
+        text_columns = {h: str for h, n in names.items() if schema.get(n, {}).get("type") == "category"}
+        line = 2  # line number of the first data row, after the header
+
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=text_columns):
+            for header, name in names.items():
+                if name not in writers:
+                    spec = schema.get(name, {})
+                    writers[name] = ColumnWriter(tmp_path, name, header, spec.get("type") or infer_type(chunk[header]),
+                                                 spec.get("fill"))
+                writers[name].append(chunk[header], first_line=line)
+            rows += len(chunk)
+            line += len(chunk)
+        if not writers:
+            for header, name in names.items():
+                spec = schema.get(name, {})
+                writers[name] = ColumnWriter(tmp_path, name, header, spec.get("type") or "float32", spec.get("fill"))
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "rows": rows,
+            "source": old["source"] if old else source,
+            "appended": (old.get("appended", []) + [source]) if old else [],
+            "columns": [writers[name].finish() for name in names.values()],
+        }
+        with open(tmp_path / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=1)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    commit_store(tmp_path, store_path)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a CSV into a column store under data/store/")
+    parser.add_argument("csv", help="CSV file to ingest")
+    parser.add_argument("dataset", help="dataset name in data/dataset.json, e.g. rainfall_data")
+    parser.add_argument("--append", action="store_true", help="add rows to the existing store")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+    manifest = ingest_csv(args.csv, STORE_DIR / args.dataset, load_schema(args.dataset),
+                          chunksize=args.chunksize, append=args.append)
+    print(f"{args.dataset}: {manifest['rows']} rows in {STORE_DIR / args.dataset}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Labelled example questions for training the intent classifier.
+
+Each intent has a list of templates. ``examples`` fills the placeholders
+({district}, {other}, {n}, {crop}, {season}) at random and adds the usual
+noise of typed questions: a greeting or "please" in front, missing question
+marks, odd capitalisation and the occasional dropped letter.
+"""
+import random
+
+
+DISTRICTS = [
+    "Chennai", "Coimbatore", "Madurai", "Salem", "Erode", "Vellore", "Theni", "Karur",
+    "Thanjavur", "Tirunelveli", "Dindigul", "Namakkal", "Cuddalore", "The Nilgiris",
+    "Kanyakumari", "Trichy", "Ramanathapuram", "Sivaganga", "Tiruvarur", "Tiruppur",
+    "Krishnagiri", "Dharmapuri", "Virudhunagar", "Thoothukudi", "Pudukkottai", "Ariyalur",
+]
+CROPS = ["paddy", "rice", "wheat", "maize", "ragi", "jowar", "bajra", "sugarcane", "cotton", "groundnut"]
+SEASONS = ["south west monsoon", "north east monsoon", "winter", "hot weather season", "summer",
+           "sw monsoon", "ne monsoon", "annual"]
+
+TEMPLATES = {
+    "greeting": [
+        "hi", "hello", "hey", "hey there", "hello bot", "good morning", "good evening",
+        "good afternoon", "hi there", "hiya", "greetings", "yo", "namaste", "vanakkam",
+        "hello, anyone there", "hey agriclimatebot",
+    ],
+    "how_are_you": [
+        "how are you", "how are you doing", "how's it going", "how do you do",
+        "are you doing well", "how are things", "how have you been", "you ok",
+    ],
+    "creator": [
+        "who made you", "who created you", "who built this bot", "who is your developer",
+        "who developed this app", "who designed you", "which person made this chatbot",
+        "who is behind this project", "who programmed you",
+    ],
+    "identity": [
+        "what is your name", "who are you", "what's your name", "your name please",
+        "what are you", "introduce yourself", "what should i call you", "are you a bot",
+        "what kind of assistant are you",
+    ],
+    "farewell": [
+        "bye", "goodbye", "thanks", "thank you", "thanks a lot", "thank you so much",
+        "see you", "see you later", "that's all, thanks", "great, thank you", "cheers",
+        "ok bye", "thx", "many thanks",
+    ],
+    "off_topic": [
+        "what's the stock price of apple", "tell me a joke", "who won the cricket match yesterday",
+        "what is the capital of france", "recommend a movie", "how do i cook biryani",
+        "what time is it", "write a poem about love", "who is the prime minister",
+        "how to learn python", "what is bitcoin worth today", "play some music",
+        "translate hello into french", "what's 2 plus 2", "book a train ticket to delhi",
+        "how tall is mount everest", "give me a recipe for cake", "what is the meaning of life",
+        "how do i fix my laptop", "tell me about football", "best phone under 20000",
+        "what's the news today", "how many planets are there", "suggest a holiday destination",
+    ],
+    "overview": [
+        "what data do you have", "tell me about the district data", "what datasets are available",
+        "show me the data", "what can you tell me about tamil nadu", "what information do you have",
+        "what can i ask you", "list the datasets", "what districts do you cover",
+        "give me an overview", "what do you know about tamil nadu districts", "help",
+        "what sources do you use", "summarize the data", "which districts are in the data",
+        "what kind of questions can you answer",
+    ],
+    "rainfall": [
+        "how much rain did {district} get", "what is the rainfall in {district}",
+        "show rainfall for {district}", "rainfall data for {district}",
+        "compare {district} and {other} rainfall", "compare rainfall between {district} and {other}",
+        "{district} vs {other} rainfall", "how wet was {district}", "tell me about rainfall in tamil nadu",
+        "show the rainfall data", "what was the {season} rainfall in {district}",
+        "how did the monsoon do in {district}", "precipitation in {district}",
+        "did {district} get more rain than {other}", "how much did it rain in {district} last year",
+        "rainfall statistics", "show me monsoon data", "which districts got rain in {season}",
+        "is {district} wetter than {other}", "how much rain falls in {district} during {season}",
+        "{district} rainfall", "rain in {district} and {other}",
+    ],
+    "rainfall.top": [
+        "which district has the highest rainfall", "top {n} districts by rainfall",
+        "show top {n} districts by rainfall", "which district received the most rain",
+        "wettest district in tamil nadu", "which district is the wettest", "top {n} wettest districts",
+        "districts with maximum rainfall", "most rainfall district", "rank districts by rainfall",
+        "which {n} districts got the most rain", "highest {season} rainfall",
+        "which district gets the heaviest rain", "where does it rain the most",
+        "which district had the most precipitation", "best {n} districts for rainfall",
+        "which district produced the most rainfall", "which district recorded the largest rainfall",
+        "greatest rainfall by district", "top rainfall districts in {season}",
+    ],
+    "rainfall.lowest": [
+        "which district has the lowest rainfall", "show the {n} lowest rainfall districts",
+        "driest district in tamil nadu", "which district is the driest", "districts with least rain",
+        "bottom {n} districts by rainfall", "which district received the minimum rainfall",
+        "where does it rain the least", "which district got the smallest amount of rain",
+        "lowest {season} rainfall", "{n} driest districts", "districts with the least precipitation",
+        "which district is most drought prone", "which district had the weakest monsoon",
+        "worst {n} districts for rainfall", "least rainy district",
+    ],
+    "rainfall.average": [
+        "what is the average rainfall in tamil nadu", "average rainfall", "mean rainfall of the state",
+        "state average rainfall", "what is the typical rainfall across districts",
+        "average annual rainfall in tamil nadu", "mean {season} rainfall", "how much rain on average",
+        "what's the statewide average precipitation", "overall average rain in the state",
+        "average rain per district",
+    ],
+    "crops": [
+        "tell me about crop production", "show crop data", "crop statistics for tamil nadu",
+        "what crops are grown", "show me the agriculture data", "crop information",
+        "what does the farming data show", "give me crop details", "agricultural statistics",
+        "show the crop dataset", "list the crops",
+    ],
+    "crops.production": [
+        "show top {n} crops by production", "which crop has the highest production",
+        "what is {crop} production", "how much {crop} is produced", "top producing crops",
+        "what is the crop production in {district}", "which district produces the most {crop}",
+        "production of {crop} in tamil nadu", "total {crop} output", "how much does {district} produce",
+        "top {n} districts by crop production", "crop production in {district}",
+        "which crops are produced the most", "biggest crop producers", "rank crops by output",
+        "how many tonnes of {crop} were harvested", "{district} crop output",
+        "how much {crop} did {district} harvest",
+    ],
+    "crops.productivity": [
+        "which crops have the highest productivity", "top {n} crops by yield", "highest yielding crop",
+        "crop productivity ranking", "which district has the best yield", "what is the yield of {crop}",
+        "most productive crops", "yield per hectare of {crop}", "which district is most productive",
+        "productivity of {crop} in {district}", "best yield per hectare", "top {n} districts by productivity",
+        "which crop gives the most per hectare", "kg per hectare ranking", "where is farming most efficient",
+    ],
+    "crops.area": [
+        "show crops by cultivation area", "top {n} crops by cultivation area", "which crop covers the most area",
+        "area under {crop}", "how many hectares of {crop}", "cultivated area by district",
+        "which district has the largest cultivated land", "crops with the largest acreage",
+        "land under cultivation in {district}", "top {n} districts by area", "how much land is farmed",
+        "which crop is grown on the most land", "sown area ranking", "hectares cultivated in {district}",
+    ],
+    "correlation": [
+        "correlate rainfall with agriculture", "is there a relationship between rainfall and crop yield",
+        "how does rainfall affect productivity", "impact of monsoon on crops", "does rain affect yield",
+        "rainfall vs productivity", "relation between rain and crop production",
+        "do wetter districts have better yields", "how does the {season} influence farming",
+        "does more rain mean more production", "link between precipitation and harvest",
+        "compare rainfall and crop data", "effect of rainfall on agriculture", "rainfall and yield correlation",
+        "which season matters most for crop yield", "does rainfall explain productivity",
+        "how is farming output related to rain",
+    ],
+}
+
+PREFIXES = ["", "", "", "", "hi, ", "hello ", "please ", "can you tell me ", "i want to know ",
+            "could you show ", "quick question: ", "bot, "]
+SUFFIXES = ["", "", "?", "?", "?", " please", "??", "."]
+
+
+def typo(text, rng):
+    """Drop one letter from one longer word."""
+    words = text.split(" ")
+    long_words = [i for i, w in enumerate(words) if len(w) > 5 and w.isalpha()]
+    if not long_words:
+        return text
+    i = rng.choice(long_words)
+    j = rng.randrange(1, len(words[i]) - 1)
+    words[i] = words[i][:j] + words[i][j + 1:]
+    return " ".join(words)
+
+
+def fill(template, rng):
+    district, other = rng.sample(DISTRICTS, 2)
+    return template.format(district=district, other=other, n=rng.randint(2, 15),
+                           crop=rng.choice(CROPS), season=rng.choice(SEASONS))
+
+
+def examples(per_intent=400, seed=0):
+    """[(question, intent)] with ``per_intent`` noisy examples for every intent."""
+    rng = random.Random(seed)
+    data = []
+    for intent, templates in TEMPLATES.items():
+        chat = intent in ("greeting", "how_are_you", "creator", "identity", "farewell", "off_topic")
+        for _ in range(per_intent):
+            text = fill(rng.choice(templates), rng)
+            if not chat:
+                text = rng.choice(PREFIXES) + text
+            text += rng.choice(SUFFIXES)
+            if rng.random() < 0.15:
+                text = typo(text, rng)
+            if rng.random() < 0.3:
+                text = text.capitalize()
+            data.append((text, intent))
+    rng.shuffle(data)
+    return data
@@ -0,0 +1,217 @@
+"""Trained intent classifier: hashed n-gram features and a linear model.
+
+A question is turned into hashed features (words, word pairs and the
+character 3- to 5-grams of every word, so "wettest", "cultivated" or a
+dropped letter still land near their training examples) and scored by a
+multinomial logistic regression. Training needs scikit-learn and runs
+offline; the weights are shipped quantized to int8 in
+``models/intent_classifier.npz``, and prediction only needs NumPy.
+
+    python intent_model.py train [--per-intent 400] [-o models/intent_classifier.npz]
+
+``router`` is a drop-in for ``intent_router.router``. It takes the
+classifier's intent and falls back to the keyword rules when the model is
+unsure, when it calls a question off topic that names a data domain
+("weather in Chennai"), or when the artifact is missing.
+"""
+import math
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+from intent_router import DOMAIN_INTENTS, Route, extract_slots, router as keyword_router, tokenize
+
+
+MODEL_PATH = Path(__file__).resolve().parent / "models" / "intent_classifier.npz"
+HASH_BITS = 14
+MIN_CONFIDENCE = 0.5
+DATA_DOMAINS = {name for name, _ in DOMAIN_INTENTS}
+
+
+@lru_cache(maxsize=65536)
+def word_features(token, bits=HASH_BITS):
+    """Hashed ids of a word and its character 3- to 5-grams (cached per word)."""
+    mask = (1 << bits) - 1
+    word = f"<{token}>"
+    grams = [f"w:{token}"] + [word[i:i + n] for n in (3, 4, 5) for i in range(len(word) - n + 1)]
+    return tuple(zlib.crc32(gram.encode()) & mask for gram in grams)
+
+
+def features(tokens, bits=HASH_BITS):
+    """Hashed feature ids of a token list (duplicates kept as counts)."""
+    mask = (1 << bits) - 1
+    ids = [zlib.crc32(f"b:{a} {b}".encode()) & mask for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        ids += word_features(token, bits)
+    return ids
+
+
+class IntentClassifier:
+    """Linear scorer over hashed features.
+
+    ``weights`` is (2**bits, classes): scoring a question is a sum of the
+    rows of its features, so the cost depends on the question length only.
+    """
+
+    def __init__(self, weights, bias, labels, bits=HASH_BITS):
+        self.weights = weights
+        self.bias = bias
+        self.labels = list(labels)
+        self.bits = bits
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        import numpy as np
+
+        with np.load(path) as artifact:
+            weights = artifact["weights"].astype(np.float32) * artifact["scale"]
+            return cls(weights, artifact["bias"], artifact["labels"].tolist(), int(artifact["bits"]))
+
+    def save(self, path=MODEL_PATH):
+        import numpy as np
+
+        # int8 per-class quantization keeps the artifact small and loads in a few ms
+        scale = np.abs(self.weights).max(axis=0) / 127
+        scale[scale == 0] = 1
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, weights=np.round(self.weights / scale).astype(np.int8),
+                            scale=scale.astype(np.float32), bias=self.bias.astype(np.float32),
+                            labels=np.array(self.labels), bits=self.bits)
+
+    def scores(self, ids):
+        if not ids:
+            return self.bias
+        return self.weights[ids].sum(axis=0) / math.sqrt(len(ids)) + self.bias
+
+    def predict_tokens(self, tokens):
+        """(intent, probability) for one tokenized question."""
+        import numpy as np
+
+        scores = self.scores(features(tokens, self.bits))
+        best = int(scores.argmax())
+        probability = 1.0 / float(np.exp(scores - scores[best]).sum())
+        return self.labels[best], probability
+
+    def predict(self, question):
+        return self.predict_tokens(tokenize(question))
+
+    def predict_batch(self, questions):
+        """(intents, probabilities) for many questions in one pass."""
+        import numpy as np
+
+        rows = [features(tokenize(question), self.bits) for question in questions]
+        lengths = np.array([len(ids) for ids in rows])
+        flat = np.fromiter((i for ids in rows for i in ids), dtype=np.int64, count=int(lengths.sum()))
+        scores = np.tile(self.bias, (len(rows), 1)).astype(np.float32)
+        nonempty = lengths > 0
+        if flat.size:
+            starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])[nonempty]
+            sums = np.add.reduceat(self.weights[flat], starts, axis=0)
+            scores[nonempty] += sums / np.sqrt(lengths[nonempty])[:, None]
+        best = scores.argmax(axis=1)
+        probabilities = 1.0 / np.exp(scores - scores[np.arange(len(rows)), best][:, None]).sum(axis=1)
+        return [self.labels[i] for i in best], probabilities
+
+
+def train(per_intent=400, seed=0, bits=HASH_BITS):
+    """Fit the classifier on intent_examples (needs scikit-learn and SciPy)."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from sklearn.linear_model import LogisticRegression
+
+    from intent_examples import examples
+
+    data = examples(per_intent, seed)
+    rows, cols, values = [], [], []
+    for row, (question, _) in enumerate(data):
+        ids = features(tokenize(question), bits)
+        rows += [row] * len(ids)
+        cols += ids
+        values += [1.0 / math.sqrt(len(ids))] * len(ids)
+    X = csr_matrix((values, (rows, cols)), shape=(len(data), 1 << bits))
+    y = [intent for _, intent in data]
+    model = LogisticRegression(C=20.0, max_iter=2000)
+    model.fit(X, y)
+    return IntentClassifier(model.coef_.T.astype(np.float32), model.intercept_.astype(np.float32),
+                            model.classes_.tolist(), bits)
+
+
+class ClassifierRouter:
+    """Route with the trained classifier, falling back to the keyword router."""
+
+    def __init__(self, path=MODEL_PATH, fallback=keyword_router, min_confidence=MIN_CONFIDENCE):
+        self.path = Path(path)
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self._model = None
+        self._loaded = False
+
+    @property
+    def model(self):
+        # Loaded on first use so ``import engine`` stays free of NumPy
+        if not self._loaded:
+            try:
+                self._model = IntentClassifier.load(self.path)
+            except OSError:
+                self._model = None
+            self._loaded = True
+        return self._model
+
+    def route(self, question):
+        tokens = tokenize(question)
+        model = self.model
+        if model is None or not tokens:
+            return self.fallback.route(question)
+        intent, probability = model.predict_tokens(tokens)
+        return self.decide(question, tokens, intent, probability)
+
+    def route_batch(self, questions):
+        """Routes for many questions, scored in one batched predict."""
+        model = self.model
+        if model is None:
+            return [self.fallback.route(question) for question in questions]
+        intents, probabilities = model.predict_batch(questions)
+        routes = []
+        for question, intent, probability in zip(questions, intents, probabilities):
+            tokens = tokenize(question)
+            if not tokens:
+                routes.append(self.fallback.route(question))
+            else:
+                routes.append(self.decide(question, tokens, intent, probability))
+        return routes
+
+    def decide(self, question, tokens, intent, probability):
+        """The classifier's route, or the keyword route when the classifier is unsure
+        or rejects a question the keyword rules place in a data domain."""
+        if probability < self.min_confidence:
+            return self.fallback.route(question)
+        if intent == "off_topic":
+            keyword = self.fallback.route(question)
+            if keyword.intent.split(".")[0] in DATA_DOMAINS:
+                return keyword
+        return Route(intent, extract_slots(tokens), tokens)
+
+
+router = ClassifierRouter()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the AgriClimateBot intent classifier")
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--per-intent", type=int, default=400, help="generated examples per intent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=str(MODEL_PATH))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    classifier = train(args.per_intent, args.seed)
+    classifier.save(args.output)
+    print(f"trained {len(classifier.labels)} intents in {time.perf_counter() - start:.1f} s "
+          f"-> {args.output} ({Path(args.output).stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Keyword intent router for AgriClimateBot questions.
+
+The router is compiled once from the declarative tables below. A question is
+tokenised a single time and every keyword is matched in the same pass through
+a token-level hash map, so routing cost depends on the question length and
+not on how many keywords the tables hold.
+"""
+import re
+from collections import namedtuple
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# Small talk. Only used when the question has no data keyword at all, so
+# "Hi, which district has the most rain?" is answered as a data question.
+CHAT_INTENTS = [
+    ("greeting", ["hi", "hello", "hey", "good morning", "good evening"]),
+    ("how_are_you", ["how are you"]),
+    ("creator", ["who made you", "developer"]),
+    ("identity", ["what is your name", "who are you", "your name"]),
+    ("farewell", ["bye", "thank*"]),
+]
+
+# Data domains in priority order. A trailing "*" matches any word that starts
+# with the keyword ("rain*" matches rain, rainfall, rainy).
+DOMAIN_INTENTS = [
+    ("correlation", ["correlat*", "relationship*", "relation", "impact*", "affect*"]),
+    ("rainfall", ["rain*", "monsoon*", "precipitation", "weather", "climate"]),
+    ("crops", [
+        "crop*", "production", "produce*", "agricultur*", "farming", "paddy",
+        "rice", "wheat", "productivity", "yield*", "area", "maize", "ragi",
+        "jowar", "bajra",
+    ]),
+]
+
+# Words that keep a question on topic without choosing a domain.
+TOPIC_KEYWORDS = ["district*", "data", "dataset*", "tamil nadu"]
+
+# Operations per domain, in priority order.
+OPERATIONS = {
+    "rainfall": [
+        ("top", ["highest", "maximum", "most", "top", "wettest"]),
+        ("lowest", ["lowest", "minimum", "least", "bottom", "driest"]),
+        ("average", ["average", "mean"]),
+    ],
+    "crops": [
+        ("productivity", ["productivity", "yield*"]),
+        ("area", ["area", "cultivation area"]),
+        ("production", ["production", "produce*", "top", "highest"]),
+    ],
+}
+
+# Words next to which a number is read as the N in "top N".
+RANK_WORDS = {"top", "highest", "lowest", "bottom", "best", "worst", "most", "least"}
+
+Route = namedtuple("Route", ["intent", "slots", "tokens"])
+
+
+def tokenize(text):
+    """Lower-case word tokens of a question."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Single-pass multi-keyword matcher over a token list.
+
+    Whole-word phrases are stored by their first token, prefix keywords by the
+    prefix itself, so each question token costs a few dict lookups however
+    many keywords were registered.
+    """
+
+    def __init__(self):
+        self.phrases = {}
+        self.prefixes = {}
+        self.prefix_lengths = set()
+
+    def add(self, keyword, label):
+        if keyword.endswith("*"):
+            prefix = keyword[:-1].lower()
+            self.prefixes.setdefault(prefix, set()).add(label)
+            self.prefix_lengths.add(len(prefix))
+        else:
+            words = tuple(tokenize(keyword))
+            self.phrases.setdefault(words[0], []).append((words, label))
+
+    def scan(self, tokens):
+        """Return the set of labels whose keywords occur in ``tokens``."""
+        hits = set()
+        phrases = self.phrases
+        prefixes = self.prefixes
+        lengths = self.prefix_lengths
+        for i, token in enumerate(tokens):
+            for words, label in phrases.get(token, ()):
+                if len(words) == 1 or tuple(tokens[i:i + len(words)]) == words:
+                    hits.add(label)
+            if prefixes:
+                for n in lengths:
+                    if n <= len(token):
+                        labels = prefixes.get(token[:n])
+                        if labels:
+                            hits.update(labels)
+        return hits
+
+
+class IntentRouter:
+    """Route a question to an intent such as ``rainfall.top`` plus slots."""
+
+    def __init__(self, chat=CHAT_INTENTS, domains=DOMAIN_INTENTS,
+                 topic=TOPIC_KEYWORDS, operations=OPERATIONS):
+        self.chat = [name for name, _ in chat]
+        self.domains = [name for name, _ in domains]
+        self.operations = {domain: [name for name, _ in ops] for domain, ops in operations.items()}
+        self.matcher = KeywordMatcher()
+        for name, keywords in chat:
+            for keyword in keywords:
+                self.matcher.add(keyword, ("chat", name))
+        for name, keywords in domains:
+            for keyword in keywords:
+                self.matcher.add(keyword, ("domain", name))
+        for keyword in topic:
+            self.matcher.add(keyword, ("topic", None))
+        for domain, ops in operations.items():
+            for name, keywords in ops:
+                for keyword in keywords:
+                    self.matcher.add(keyword, (domain, name))
+
+    def route(self, question):
+        tokens = tokenize(question)
+        hits = self.matcher.scan(tokens)
+        slots = extract_slots(tokens)
+
+        domain = next((d for d in self.domains if ("domain", d) in hits), None)
+        if domain is None:
+            if ("topic", None) in hits:
+                return Route("overview", slots, tokens)
+            chat = next((c for c in self.chat if ("chat", c) in hits), None)
+            return Route(chat or "off_topic", slots, tokens)
+
+        operation = next((op for op in self.operations.get(domain, ()) if (domain, op) in hits), None)
+        intent = f"{domain}.{operation}" if operation else domain
+        return Route(intent, slots, tokens)
+
+
+def extract_slots(tokens):
+    """Pull the "top N" count out of the question tokens."""
+    slots = {}
+    for i, token in enumerate(tokens):
+        if not token.isdigit():
+            continue
+        before = tokens[i - 1] if i > 0 else None
+        after = tokens[i + 1] if i + 1 < len(tokens) else None
+        if int(token) > 0 and (before in RANK_WORDS or after in RANK_WORDS):
+            slots["n"] = int(token)
+            break
+    return slots
+
+
+router = IntentRouter()
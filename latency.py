@@ -0,0 +1,151 @@
+"""Per-stage latency recording for the question pipeline.
+
+Code on the hot path times itself with ``recorder.time(stage)``, which
+returns a stopwatch whose ``lap(next_stage)`` closes the running stage and
+starts the next one. Each stage keeps a call count, a running total and the
+last ``window`` durations, from which p50/p95/p99 are reported as a dict,
+JSON or Prometheus text.
+
+Recording is off unless ``AGRICLIMATE_PROFILE=1`` is set or
+``recorder.enabled`` is set in code (the benchmarks do); it is process-wide,
+so the app's sidebar panel only shows it and has no switch. While off, ``time()`` hands out a
+shared no-op stopwatch, so the instrumentation costs one attribute check and
+a few empty method calls per question.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# Pipeline stages, in order
+STAGES = ["load", "route", "extract", "compute", "format", "render"]
+QUANTILES = [0.5, 0.95, 0.99]
+
+
+class Stopwatch:
+    """Times consecutive stages of one call."""
+
+    __slots__ = ("recorder", "stage", "start")
+
+    def __init__(self, recorder, stage):
+        self.recorder = recorder
+        self.stage = stage
+        self.start = time.perf_counter()
+
+    def lap(self, stage):
+        """Close the running stage and start ``stage``."""
+        now = time.perf_counter()
+        self.recorder.record(self.stage, now - self.start)
+        self.stage, self.start = stage, now
+
+    def stop(self):
+        if self.stage is not None:
+            self.recorder.record(self.stage, time.perf_counter() - self.start)
+            self.stage = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class NullStopwatch:
+    """Stand-in for Stopwatch while recording is off."""
+
+    __slots__ = ()
+
+    def lap(self, stage):
+        pass
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+NULL_STOPWATCH = NullStopwatch()
+
+
+def quantile(ordered, q):
+    """Nearest-rank quantile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LatencyRecorder:
+    """Thread-safe per-stage counters and rolling latency windows."""
+
+    def __init__(self, window=1024, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+        self.totals = {}
+
+    def time(self, stage):
+        """Stopwatch for ``stage``; use as a context manager."""
+        if not self.enabled:
+            return NULL_STOPWATCH
+        return Stopwatch(self, stage)
+
+    def record(self, stage, seconds):
+        with self.lock:
+            if stage not in self.samples:
+                self.samples[stage] = deque(maxlen=self.window)
+                self.counts[stage] = 0
+                self.totals[stage] = 0.0
+            self.samples[stage].append(seconds)
+            self.counts[stage] += 1
+            self.totals[stage] += seconds
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+            self.totals.clear()
+
+    def summary(self):
+        """{stage: {"count", "sum", "p50", "p95", "p99"}} in seconds, pipeline order first."""
+        with self.lock:
+            snapshot = {stage: (sorted(values), self.counts[stage], self.totals[stage])
+                        for stage, values in self.samples.items()}
+        order = [s for s in STAGES if s in snapshot] + sorted(snapshot.keys() - set(STAGES))
+        result = {}
+        for stage in order:
+            ordered, count, total = snapshot[stage]
+            result[stage] = {"count": count, "sum": total}
+            for q in QUANTILES:
+                result[stage][f"p{round(q * 100)}"] = quantile(ordered, q)
+        return result
+
+    def to_json(self):
+        return json.dumps({"window": self.window, "stages": self.summary()}, indent=2)
+
+    def to_prometheus(self, name="agriclimate_stage_seconds"):
+        """Summary metric in the Prometheus text exposition format."""
+        lines = [f"# HELP {name} Time spent per question pipeline stage (last {self.window} calls).",
+                 f"# TYPE {name} summary"]
+        for stage, stats in self.summary().items():
+            for q in QUANTILES:
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {stats[f"p{round(q * 100)}"]:.9f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["sum"]:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically write the Prometheus text to ``path`` (node_exporter textfile collector)."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+# Process-wide recorder used by the engine and the app
+recorder = LatencyRecorder(enabled=os.environ.get("AGRICLIMATE_PROFILE") == "1")
@@ -0,0 +1,230 @@
+"""Numeric filters in questions: thresholds, ranges and the metric they apply to.
+
+    "districts with more than 1000 mm rainfall"      total_actual > 1000
+    "crops between 2 and 5 t/ha"                     productivity in [2, 5]
+    "north east monsoon of at least 400 mm"          ne_actual >= 400
+    "area above 20,000 and below 50k hectares"       20000 < area < 50000
+
+``parse_filter`` turns a question into a ``NumericFilter``, which is
+hashable so it can sit in the route slots (and the answer cache key). It is
+executed against the precomputed RankingViews with ``RankingView.between``.
+
+``parse_departure`` reads the other kind of threshold question, a season
+judged against its normal ("which districts had a deficient NE monsoon"),
+answered from the precomputed departures.DepartureTable.
+"""
+import re
+from collections import namedtuple
+
+from intent_router import tokenize
+
+
+NumericFilter = namedtuple("NumericFilter", "domain metric low high low_inclusive high_inclusive")
+Departure = namedtuple("Departure", "season category")
+
+NUMBER = r"(\d+(?:\.\d+)?)\s*(k\b)?"
+# A single bound is not a year span: "over 2017-18"
+VALUE = rf"{NUMBER}(?![\d.]|\s*[-–]\s*\d)"
+UNIT_NAMES = r"mm|millimet(?:er|re)s?|t/ha|kg/ha|tonnes?|tons?|mt|hectares?|ha|kg"
+UNITS = rf"\s*(?:{UNIT_NAMES})\b"
+UNIT = rf"(?:{UNITS})?"
+UNIT_AFTER = re.compile(rf"\s*({UNIT_NAMES})\b")
+NEAR = 3  # tokens either side of a bound searched for a metric word
+
+# (pattern, which bound(s) it sets, inclusive)
+BOUNDS = [
+    (re.compile(rf"\bbetween\s+{NUMBER}{UNIT}\s+and\s+{NUMBER}"), "range", True),
+    (re.compile(rf"\bfrom\s+{NUMBER}{UNIT}\s+to\s+{NUMBER}"), "range", True),
+    # A bare "800-1000" needs a unit, so "2017-18" is not read as a range
+    (re.compile(rf"(?<![\w.]){NUMBER}{UNIT}\s*(?:-|–|to)\s*{NUMBER}(?={UNITS})"), "range", True),
+    (re.compile(rf"(?:\bat least|\bno less than|\bminimum of|>=|≥)\s*{VALUE}"), "low", True),
+    (re.compile(rf"(?:\bmore than|\bgreater than|\bhigher than|\bover|\babove|\bexceeding|\bin excess of|>)\s*{VALUE}"),
+     "low", False),
+    (re.compile(rf"(?:\bat most|\bno more than|\bup to|\bmaximum of|<=|≤)\s*{VALUE}"), "high", True),
+    (re.compile(rf"(?:\bless than|\blower than|\bfewer than|\bunder|\bbelow|<)\s*{VALUE}"), "high", False),
+]
+
+# Metric words, most specific first: (token phrase, domain, column)
+METRICS = [
+    (("south", "west"), "rainfall", "sw_actual"),
+    (("southwest",), "rainfall", "sw_actual"),
+    (("sw",), "rainfall", "sw_actual"),
+    (("north", "east"), "rainfall", "ne_actual"),
+    (("northeast",), "rainfall", "ne_actual"),
+    (("ne",), "rainfall", "ne_actual"),
+    (("winter",), "rainfall", "winter_actual"),
+    (("hot", "weather"), "rainfall", "hot_actual"),
+    (("summer",), "rainfall", "hot_actual"),
+    (("productivity",), "crops", "productivity"),
+    (("yield",), "crops", "productivity"),
+    (("t", "ha"), "crops", "productivity"),
+    (("kg", "ha"), "crops", "productivity"),
+    (("area",), "crops", "area"),
+    (("hectares",), "crops", "area"),
+    (("production",), "crops", "production"),
+    (("tonnes",), "crops", "production"),
+    (("output",), "crops", "production"),
+    (("rainfall",), "rainfall", "total_actual"),
+    (("rain",), "rainfall", "total_actual"),
+    (("mm",), "rainfall", "total_actual"),
+]
+DEFAULT_METRIC = {"rainfall": "total_actual", "crops": "production"}
+
+# Rainfall departure from normal categories (see departures.py)
+CATEGORIES = ["deficient", "normal", "excess"]
+
+# Question phrases → category, most specific first
+CATEGORY_PHRASES = [
+    (("below", "normal"), "deficient"),
+    (("above", "normal"), "excess"),
+    (("near", "normal"), "normal"),
+    (("within", "normal"), "normal"),
+    (("normal", "range"), "normal"),
+    (("deficient",), "deficient"),
+    (("deficit",), "deficient"),
+    (("deficiency",), "deficient"),
+    (("shortfall",), "deficient"),
+    (("excess",), "excess"),
+    (("excessive",), "excess"),
+    (("surplus",), "excess"),
+]
+DEPARTURE_WORDS = {"departure", "departures", "deviation", "deviations", "anomaly", "anomalies"}
+
+# column → (label, unit the column is stored in, decimals)
+METRIC_NAMES = {
+    "total_actual": ("Total Annual Rainfall", "mm", 1),
+    "sw_actual": ("South West Monsoon Rainfall", "mm", 1),
+    "ne_actual": ("North East Monsoon Rainfall", "mm", 1),
+    "winter_actual": ("Winter Rainfall", "mm", 1),
+    "hot_actual": ("Hot Weather Rainfall", "mm", 1),
+    "area": ("Cultivation Area", "ha", 0),
+    "production": ("Production", "tonnes", 0),
+    "productivity": ("Productivity", "t/ha", 2),
+}
+
+# (column, unit written in the question) → factor to the column's unit
+CONVERSIONS = {
+    ("productivity", "kg/ha"): 0.001,
+    ("production", "kg"): 0.001,
+}
+
+
+def number(digits, thousands):
+    value = float(digits)
+    return value * 1000 if thousands else value
+
+
+def in_column_unit(value, metric, unit):
+    """``value`` written in ``unit`` converted to the unit ``metric`` is stored in."""
+    if value is None or unit is None:
+        return value
+    return value * CONVERSIONS.get((metric, unit), 1)
+
+
+def contains(tokens, phrase):
+    n = len(phrase)
+    return any(tuple(tokens[i:i + n]) == phrase for i in range(len(tokens) - n + 1))
+
+
+def find_metric(tokens, domain=None):
+    """(domain, column) named in the question, else the domain's default."""
+    for phrase, metric_domain, column in METRICS:
+        if contains(tokens, phrase):
+            return metric_domain, column
+    if domain in DEFAULT_METRIC:
+        return domain, DEFAULT_METRIC[domain]
+    return None, None
+
+
+def unit_after(text, match, group):
+    """Unit written right after the number in ``group`` of ``match`` (and its "k"), or None."""
+    end = match.end(group + 1) if match.group(group + 1) else match.end(group)
+    unit = UNIT_AFTER.match(text, end)
+    return unit.group(1) if unit else None
+
+
+def measured(text, match, units):
+    """Whether the number(s) of ``match`` carry a unit or stand next to a metric word.
+
+    Keeps "more than 2 crops" or "top 10 over 5 years" from becoming a
+    threshold on the default metric.
+    """
+    if any(units):
+        return True
+    nearby = tokenize(text[:match.start()])[-NEAR:] + tokenize(match.group(0)) + tokenize(text[match.end():])[:NEAR]
+    return find_metric(nearby)[1] is not None
+
+
+def parse_filter(question, domain=None):
+    """NumericFilter for a question with a threshold or range, else None.
+
+    A bound needs a unit ("1000 mm") or a metric word close by ("rainfall
+    above 1000"). ``domain`` ("rainfall"/"crops") picks the metric when the
+    question does not name one.
+    """
+    if not any(ch.isdigit() for ch in question):
+        return None
+    text = re.sub(r"(?<=\d),(?=\d{3})", "", question.lower())
+    # "1000mm" → "1000 mm", so the unit is a token of its own
+    text = re.sub(r"(?<=\d)(?=(?:mm|ha|kg|t/)\b)", " ", text)
+    low = high = low_unit = high_unit = None
+    low_inclusive = high_inclusive = True
+    for pattern, bound, inclusive in BOUNDS:
+        groups = (1, 3) if bound == "range" else (1,)
+        match = units = None
+        for candidate in pattern.finditer(text):
+            units = [unit_after(text, candidate, g) for g in groups]
+            if measured(text, candidate, units):
+                match = candidate
+                break
+        if match is None:
+            continue
+        if bound == "range":
+            a, b = number(*match.group(1, 2)), number(*match.group(3, 4))
+            low, high = min(a, b), max(a, b)
+            # "between 2 and 5 kg/ha": the unit is written once, for both
+            low_unit = high_unit = next((unit for unit in units if unit), None)
+            low_inclusive = high_inclusive = True
+            break
+        value = number(*match.group(1, 2))
+        if bound == "low" and low is None:
+            low, low_unit, low_inclusive = value, units[0], inclusive
+        elif bound == "high" and high is None:
+            high, high_unit, high_inclusive = value, units[0], inclusive
+    if low is None and high is None:
+        return None
+
+    metric_domain, metric = find_metric(tokenize(text), domain)
+    if metric is None:
+        return None
+    return NumericFilter(metric_domain, metric, in_column_unit(low, metric, low_unit),
+                         in_column_unit(high, metric, high_unit), low_inclusive, high_inclusive)
+
+
+def describe(numeric_filter):
+    """'above 1000 mm', 'between 2 and 5 t/ha', ... for answer headings, in the column's unit."""
+    _, unit, _ = METRIC_NAMES[numeric_filter.metric]
+    low, high = numeric_filter.low, numeric_filter.high
+    if low is not None and high is not None:
+        if numeric_filter.low_inclusive and numeric_filter.high_inclusive:
+            return f"between {low:g} and {high:g} {unit}"
+        return (f"{'at least' if numeric_filter.low_inclusive else 'above'} {low:g} and "
+                f"{'at most' if numeric_filter.high_inclusive else 'below'} {high:g} {unit}")
+    if low is not None:
+        return f"{'at least' if numeric_filter.low_inclusive else 'above'} {low:g} {unit}"
+    return f"{'at most' if numeric_filter.high_inclusive else 'below'} {high:g} {unit}"
+
+
+def parse_departure(question):
+    """Departure(season, category) for a departure question, else None.
+
+    The category is None for questions about departures in general
+    ("departure from normal of the NE monsoon").
+    """
+    tokens = tokenize(question)
+    category = next((name for phrase, name in CATEGORY_PHRASES if contains(tokens, phrase)), None)
+    if category is None and not DEPARTURE_WORDS.intersection(tokens):
+        return None
+    domain, column = find_metric(tokens, "rainfall")
+    season = column.rsplit("_", 1)[0] if domain == "rainfall" else "total"
+    return Departure(season, category)
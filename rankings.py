@@ -0,0 +1,95 @@
+"""Precomputed ranking views over the metric columns of a dataset.
+
+Each metric column is sorted once when the datasets are loaded. Top-k,
+bottom-k and rank lookups are then slices of the stored position arrays and
+never re-sort the DataFrame; threshold and range filters are two binary
+searches over the sorted values plus a slice, O(log n + k).
+"""
+import numpy as np
+
+
+# Summary rows that are not districts and must not take part in rankings
+AGGREGATE_ROWS = {"state average", "state total"}
+
+
+def aggregate_mask(names):
+    """Boolean array marking state-level summary rows."""
+    return np.array([str(name).strip().lower() in AGGREGATE_ROWS for name in names], dtype=bool)
+
+
+class RankingView:
+    """A metric column sorted once, highest value first.
+
+    ``order`` holds row positions (for ``DataFrame.iloc``) from highest to
+    lowest value; ties keep their original row order. Rows that are excluded
+    or hold NaN are left out. ``ranks[pos]`` is the 1-based rank of the row at
+    ``pos``, 0 for rows that are not ranked.
+
+    Float columns keep their own dtype (float32 in the column store), so a
+    bound typed by the user compares equal to the value it names.
+    """
+
+    def __init__(self, values, exclude=None):
+        values = np.asarray(values)
+        if values.dtype.kind != "f":
+            values = values.astype(float)
+        valid = ~np.isnan(values)
+        if exclude is not None:
+            valid &= ~np.asarray(exclude, dtype=bool)
+        positions = np.flatnonzero(valid)
+        self.order = positions[np.argsort(-values[positions], kind="stable")]
+        self.sorted_values = values[self.order]
+        # Ascending copy for np.searchsorted (sorted_values is highest first)
+        self.ascending = self.sorted_values[::-1].copy()
+        self.ranks = np.zeros(len(values), dtype=np.int64)
+        self.ranks[self.order] = np.arange(1, len(self.order) + 1)
+
+    def __len__(self):
+        return len(self.order)
+
+    def top(self, k):
+        """Positions of the ``k`` highest rows, highest first."""
+        return self.order[:max(k, 0)]
+
+    def bottom(self, k):
+        """Positions of the ``k`` lowest rows, lowest first."""
+        k = min(max(k, 0), len(self.order))
+        return self.order[len(self.order) - k:][::-1]
+
+    def between(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """Positions of the rows with ``low <= value <= high``, highest first.
+
+        Either bound may be None; the inclusive flags make it ``<``/``>``.
+        """
+        n = len(self.ascending)
+        # 1017.2 as float64 is not the float32 1017.2 stored in the column
+        cast = self.ascending.dtype.type
+        low = None if low is None else cast(low)
+        high = None if high is None else cast(high)
+        start = 0 if low is None else np.searchsorted(self.ascending, low, "left" if low_inclusive else "right")
+        end = n if high is None else np.searchsorted(self.ascending, high, "right" if high_inclusive else "left")
+        if end <= start:
+            return self.order[:0]
+        # ascending[start:end] is order[n - end:n - start] in highest-first order
+        return self.order[n - end:n - start]
+
+    def rank(self, position):
+        """1-based rank of the row at ``position``, or None if it is not ranked."""
+        rank = int(self.ranks[position])
+        return rank or None
+
+
+def build_rankings(df, metrics, name_col, positive_only=()):
+    """RankingView per metric column, skipping aggregate rows.
+
+    Columns listed in ``positive_only`` also drop rows with a value <= 0.
+    """
+    aggregates = aggregate_mask(df[name_col])
+    rankings = {}
+    for col in metrics:
+        values = df[col].to_numpy()
+        exclude = aggregates
+        if col in positive_only:
+            exclude = aggregates | ~(values > 0)
+        rankings[col] = RankingView(values, exclude)
+    return rankings
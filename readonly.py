@@ -0,0 +1,62 @@
+"""Read-only, process-shared forms of the loaded datasets.
+
+The datasets are cached once per process with ``st.cache_resource`` and
+handed to every session by reference, so nothing may write to them. Frames
+are rebuilt on top of read-only NumPy arrays (text columns become
+categoricals with read-only codes) and the metadata becomes a read-only
+mapping; any in-place write raises instead of leaking into other sessions.
+"""
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+
+def _read_only(array):
+    array = np.ascontiguousarray(array)
+    array.flags.writeable = False
+    return array
+
+
+def freeze_frame(df):
+    """Copy of ``df`` whose column buffers cannot be written to."""
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            cat = pd.Categorical(series)
+            columns[col] = pd.Categorical.from_codes(_read_only(cat.codes), dtype=cat.dtype)
+        else:
+            columns[col] = _read_only(series.to_numpy(copy=True))
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def freeze_mapping(value):
+    """Recursively wrap dicts in read-only mapping proxies and lists in tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze_mapping(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_mapping(v) for v in value)
+    return value
+
+
+def is_frozen(df):
+    """True when no column of ``df`` can be written in place."""
+    for col in df.columns:
+        values = df[col].array
+        if isinstance(values, pd.Categorical):
+            values = values.codes
+        else:
+            values = np.asarray(values)
+        if values.flags.writeable:
+            return False
+    return True
+
+
+def guard(df):
+    """Per-query view of a shared frame.
+
+    The shallow copy shares the read-only column buffers, so reads cost no
+    copy while adding, dropping or renaming columns only touches the view.
+    """
+    return df.copy(deep=False)
@@ -0,0 +1,163 @@
+"""Dataset registry: the loaded datasets, hot-reloaded when ``data/`` changes.
+
+The registry holds one immutable ``Snapshot`` (both frames, their views and
+the metadata). A query takes the snapshot once and uses it to the end, so a
+reload never changes the data under a running query; the new snapshot is
+published with a single reference assignment once everything in it is built.
+
+A background thread polls the data directory. Every dataset is fingerprinted
+by the SHA-256 of its CSV plus its column schema in ``dataset.json`` (files
+are only re-hashed when their size or mtime moved, and a file modified in the
+last ``SETTLE_SECONDS`` is left for the next poll, so a copy in progress is
+not picked up half written). Only a dataset whose fingerprint changed is
+reloaded, and only the views derived from it are rebuilt: the other
+dataset's entity index and rankings are carried over as they are. Answers
+and charts are cached per dataset version (see engine.data_version), so
+their caches keep everything about the unchanged dataset.
+
+    registry = DatasetRegistry()
+    registry.start()                   # poll every AGRICLIMATE_RELOAD_INTERVAL seconds
+    snapshot = registry.snapshot()     # rainfall_df, crop_df, views, metadata
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import engine
+from dataset_store import DATA_DIR, DATASETS, column_labels, dataset_version, file_fingerprint, load_dataset
+from latency import recorder
+from readonly import freeze_mapping
+
+
+DEFAULT_INTERVAL = float(os.environ.get("AGRICLIMATE_RELOAD_INTERVAL", 2.0))
+SETTLE_SECONDS = 1.0
+
+# Dataset name → (views domain, builder of the views derived from it alone)
+VIEW_BUILDERS = {
+    "rainfall_data": ("rainfall", engine.build_rainfall_views),
+    "crop_production": ("crops", engine.build_crop_views),
+}
+
+Snapshot = namedtuple("Snapshot", "rainfall_df crop_df views metadata")
+Loaded = namedtuple("Loaded", "df manifest views inputs")
+
+
+class DatasetRegistry:
+    """Current datasets of ``data_dir``, swapped atomically on reload."""
+
+    def __init__(self, data_dir=DATA_DIR, interval=DEFAULT_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.store_dir = self.data_dir / "store"
+        self.interval = interval
+        self.reloads = dict.fromkeys(DATASETS, 0)
+        self.last_error = None
+        self._snapshot = None
+        self._loaded = {}
+        self._metadata_hash = None
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refresh()
+
+    def snapshot(self):
+        """The current Snapshot; keep using the same one for a whole query."""
+        return self._snapshot
+
+    def content_hash(self, path):
+        """SHA-256 of ``path``; None when missing, False while it is still being written."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self._hashes.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        if self._snapshot is not None and time.time() - stat.st_mtime < SETTLE_SECONDS:
+            return False
+        digest = file_fingerprint(path)["sha256"]
+        self._hashes[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def read_metadata(self):
+        """(raw dataset.json dict or {}, frozen metadata for display)."""
+        try:
+            with open(self.data_dir / "dataset.json") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}, engine.load_metadata(self.data_dir)
+        return raw, freeze_mapping(raw)
+
+    def changed(self):
+        """{dataset name: new inputs} for the datasets whose CSV or schema changed."""
+        raw, _ = self.read_metadata()
+        changes = {}
+        for name, file_name in DATASETS.items():
+            digest = self.content_hash(self.data_dir / file_name)
+            if digest is False:
+                continue
+            inputs = (digest, json.dumps(raw.get(name, {}).get("columns"), sort_keys=True))
+            loaded = self._loaded.get(name)
+            if loaded is None or loaded.inputs != inputs:
+                changes[name] = inputs
+        return changes
+
+    def refresh(self):
+        """Reload what changed and publish a new snapshot; returns the reloaded dataset names.
+
+        On an error the current snapshot stays in place and the change is
+        retried on the next call.
+        """
+        with self._lock:
+            metadata_hash = self.content_hash(self.data_dir / "dataset.json")
+            changes = self.changed()
+            if not changes and metadata_hash in (False, self._metadata_hash):
+                return []
+
+            loaded = dict(self._loaded)
+            with recorder.time('load'):
+                for name, inputs in changes.items():
+                    previous = loaded.get(name)
+                    # A schema edit does not touch the CSV, so the store would still look fresh
+                    rebuild = previous is not None and previous.inputs[1] != inputs[1]
+                    df, manifest = load_dataset(name, self.data_dir, self.store_dir, rebuild=rebuild)
+                    _, build = VIEW_BUILDERS[name]
+                    views = build(df, column_labels(manifest), dataset_version(manifest))
+                    loaded[name] = Loaded(df, manifest, views, inputs)
+
+            rainfall, crops = loaded["rainfall_data"], loaded["crop_production"]
+            versions = {"rainfall": dataset_version(rainfall.manifest), "crops": dataset_version(crops.manifest)}
+            views = engine.combine_views(rainfall.views, crops.views,
+                                         dataset_version(rainfall.manifest, crops.manifest), versions)
+            _, metadata = self.read_metadata()
+            self._snapshot = Snapshot(rainfall.df, crops.df, views, metadata)
+            self._loaded = loaded
+            if metadata_hash is not False:
+                self._metadata_hash = metadata_hash
+            for name in changes:
+                self.reloads[name] += 1
+            return list(changes)
+
+    def _poll(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def start(self):
+        """Poll for changes in a daemon thread (no-op when the interval is 0)."""
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._poll, name="dataset-registry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,25 @@
+from chat_history import ChatHistory
+
+
+def fill(history, count):
+    for i in range(count):
+        history.append("user", f"q{i}", "12:00")
+
+
+def test_spilled_messages_page_back(tmp_path):
+    history = ChatHistory(capacity=4, spill_path=tmp_path / "history.sqlite")
+    fill(history, 10)
+    assert len(history) == 10 and history.spilled == 6
+    assert [m.content for m in history.latest(3)] == ["q7", "q8", "q9"]
+    assert [m.content for m in history.latest(3, 6)] == ["q1", "q2", "q3"]
+    history.clear()
+    assert len(history) == 0
+
+
+def test_len_counts_only_retrievable_messages(tmp_path):
+    # No writable spill file: the overflow is dropped and must not be paged for
+    history = ChatHistory(capacity=4, spill_path=tmp_path / "missing" / "history.sqlite")
+    fill(history, 10)
+    assert history.dropped == 6
+    assert len(history) == 4
+    assert [m.content for m in history.latest(10)] == ["q6", "q7", "q8", "q9"]
@@ -0,0 +1,29 @@
+import pytest
+
+from entity_index import DISTRICT_ALIASES, EntityIndex
+
+DISTRICTS = ["Chennai", "Coimbatore", "The Nilgiris", "Tiruchirappalli", "Thoothukudi", "Kancheepuram",
+             "State Average"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return EntityIndex(DISTRICTS, aliases=DISTRICT_ALIASES)
+
+
+@pytest.mark.parametrize("question, found", [
+    ("Compare Chennai and Coimbatore rainfall", ["Chennai", "Coimbatore"]),
+    ("Compare rainfall in Chennai and Coimbatur", ["Chennai", "Coimbatore"]),
+    ("Show rainfall for Nilgiris", ["The Nilgiris"]),
+    ("rainfall in Trichy", ["Tiruchirappalli"]),
+    ("Tuticorin vs Tiruchi", ["Thoothukudi", "Tiruchirappalli"]),
+    # The alias target is a spelling too, and the dataset's own spelling still wins
+    ("Kanchipuram and Kancheepuram", ["Kancheepuram"]),
+    ("Which district has highest rainfall?", []),
+])
+def test_find(index, question, found):
+    assert index.find(question) == found
+
+
+def test_aliases_are_optional():
+    assert EntityIndex(DISTRICTS).find("rainfall in Trichy") == []
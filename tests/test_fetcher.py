@@ -0,0 +1,72 @@
+import json
+from collections import Counter
+
+import pytest
+
+import fetcher
+from dataset_store import DATA_DIR, DATASETS
+from standin_api import StandInAPI
+
+API_KEY = "offline-key"
+PAGE_SIZE = 10
+
+
+@pytest.fixture
+def api():
+    resources = {f"{name}-resource": (DATA_DIR / file_name).read_bytes() for name, file_name in DATASETS.items()}
+    with StandInAPI(resources, API_KEY, max_keep_alive=7) as api:
+        yield api
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    metadata = json.loads((DATA_DIR / "dataset.json").read_text())
+    for name in DATASETS:
+        metadata[name]["resource_id"] = f"{name}-resource"
+    (tmp_path / "dataset.json").write_text(json.dumps(metadata))
+    return tmp_path
+
+
+def refresh(api, data_dir):
+    stats = Counter()
+    status = fetcher.refresh(data_dir, api.url, API_KEY, concurrency=4, page_size=PAGE_SIZE, stats=stats)
+    return status, stats
+
+
+def test_first_refresh_downloads_every_dataset(api, data_dir):
+    status, stats = refresh(api, data_dir)
+    assert status == dict.fromkeys(DATASETS, "updated")
+    assert stats["not_modified"] == 0 and stats["requests"] == stats["pages"]
+    for name, file_name in DATASETS.items():
+        assert (data_dir / file_name).read_bytes() == api.resources[f"{name}-resource"]
+
+
+def test_second_refresh_only_revalidates(api, data_dir):
+    refresh(api, data_dir)
+    status, stats = refresh(api, data_dir)
+    assert status == dict.fromkeys(DATASETS, "unchanged")
+    assert stats["requests"] > 0
+    assert stats["not_modified"] == stats["requests"]
+    assert stats["downloaded_bytes"] == 0
+
+
+def test_changed_resource_is_rewritten(api, data_dir):
+    refresh(api, data_dir)
+    changed, unchanged = DATASETS
+    content = api.resources[f"{changed}-resource"]
+    api.resources[f"{changed}-resource"] = content.replace(b"Chennai", b"Chennai City")
+
+    status, stats = refresh(api, data_dir)
+    assert status == {changed: "updated", unchanged: "unchanged"}
+    assert 0 < stats["not_modified"] < stats["requests"]
+    assert (data_dir / DATASETS[changed]).read_bytes() == api.resources[f"{changed}-resource"]
+
+
+def test_failed_resource_keeps_its_file(api, data_dir):
+    refresh(api, data_dir)
+    before = (data_dir / DATASETS["rainfall_data"]).read_bytes()
+    del api.resources["rainfall_data-resource"]
+
+    status, _ = refresh(api, data_dir)
+    assert status["rainfall_data"].startswith("failed: FetchError")
+    assert (data_dir / DATASETS["rainfall_data"]).read_bytes() == before
@@ -0,0 +1,20 @@
+import pytest
+
+from intent_model import router
+
+QUESTIONS = [
+    ("what is the weather like in chennai today?", "rainfall"),
+    ("how is the climate in madurai", "rainfall"),
+    ("hello", "greeting"),
+    ("what is the stock price", "off_topic"),
+]
+
+
+@pytest.mark.parametrize("question, intent", QUESTIONS)
+def test_route(question, intent):
+    assert router.route(question).intent == intent
+
+
+def test_route_batch_matches_route():
+    questions = [question for question, _ in QUESTIONS]
+    assert [route.intent for route in router.route_batch(questions)] == [router.route(q).intent for q in questions]
@@ -0,0 +1,62 @@
+import pytest
+
+import engine
+from numeric_query import NumericFilter, parse_filter
+
+# (question, domain of the route, NumericFilter or None)
+PARSES = [
+    ("districts with more than 1000 mm rainfall", "rainfall",
+     NumericFilter("rainfall", "total_actual", 1000, None, False, True)),
+    ("north east monsoon of at least 400 mm", "rainfall", NumericFilter("rainfall", "ne_actual", 400, None, True, True)),
+    ("rainfall above 1000", "rainfall", NumericFilter("rainfall", "total_actual", 1000, None, False, True)),
+    ("rainfall 800-1000 mm", "rainfall", NumericFilter("rainfall", "total_actual", 800, 1000, True, True)),
+    # Bounds are converted to the unit of the column (t/ha, ha, tonnes)
+    ("which crops yield over 20 t/ha", "crops", NumericFilter("crops", "productivity", 20, None, False, True)),
+    ("productivity above 2000 kg/ha", "crops", NumericFilter("crops", "productivity", 2, None, False, True)),
+    ("crops between 2000 and 5000 kg/ha", "crops", NumericFilter("crops", "productivity", 2, 5, True, True)),
+    ("area between 20,000 and 50k hectares", "crops", NumericFilter("crops", "area", 20000, 50000, True, True)),
+    # Years and counts are not thresholds
+    ("Which district had the most rain over 2017-18?", "rainfall", None),
+    ("Which district had the most rain in 2017-18?", "rainfall", None),
+    ("districts with more than 2 crops", "crops", None),
+    ("top 10 districts over 5 years", "rainfall", None),
+]
+
+# (question, names that must be in the answer, names that must not)
+ANSWERS = [
+    # Inclusive bounds on float32 columns keep the row equal to the bound
+    ("districts with at most 1017.2 mm rainfall", {"Coimbatore"}, set()),
+    ("districts with less than 1017.2 mm rainfall", set(), {"Coimbatore"}),
+    ("districts with at least 1151.7 mm rainfall", {"Tirunelveli"}, set()),
+    ("districts with more than 1151.7 mm rainfall", set(), {"Tirunelveli"}),
+]
+
+# (question, heading the answer starts with)
+HEADINGS = [
+    ("which crops yield over 20 t/ha", "## 🔎 Crops with Productivity above 20 t/ha"),
+    ("productivity above 2000 kg/ha", "## 🔎 Crops with Productivity above 2 t/ha"),
+    ("area between 20,000 and 50k hectares", "## 🔎 Crops with Cultivation Area between 20000 and 50000 ha"),
+]
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    return engine.load_datasets()
+
+
+@pytest.mark.parametrize("question, domain, expected", PARSES)
+def test_parse_filter(question, domain, expected):
+    assert parse_filter(question, domain) == expected
+
+
+@pytest.mark.parametrize("question, present, absent", ANSWERS)
+def test_filter_bounds(datasets, question, present, absent):
+    data = engine.analyze_question(question, *datasets)["data"]
+    names = set() if data is None else set(data["district"].astype(str))
+    assert present <= names and not absent & names
+
+
+@pytest.mark.parametrize("question, heading", HEADINGS)
+def test_filter_heading(datasets, question, heading):
+    text = engine.analyze_question(question, *datasets)["text"]
+    assert text.startswith(heading)
@@ -0,0 +1,123 @@
+"""Caches keyed by dataset version.
+
+``PerVersion`` memoizes a structure derived from a whole dataset (a join, a
+lookup table) for the last few versions, so a reload builds it once for the
+new version and sessions still on the previous snapshot keep theirs.
+
+``VersionedLRU`` holds many small results (answers, chart images), each
+tagged with the version of the data it was computed from; it is the one
+place their eviction, expiry and invalidation rules live.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class PerVersion:
+    """Values built once per dataset version, for the ``max_versions`` latest versions.
+
+    Nothing is cached when the version is unknown (None). Two threads asking
+    for a new version at once may both build it; the last one is kept.
+    """
+
+    def __init__(self, max_versions=4):
+        self.max_versions = max_versions
+        self.built = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, version, build, *args):
+        """``build(*args)`` for ``version``, built on the first call only."""
+        if version is None:
+            return build(*args)
+        with self.lock:
+            if version in self.built:
+                self.built.move_to_end(version)
+                return self.built[version]
+        value = build(*args)
+        with self.lock:
+            self.built[version] = value
+            while len(self.built) > self.max_versions:
+                self.built.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.built.clear()
+
+
+class VersionedLRU:
+    """Thread-safe LRU with an entry cap, a byte budget and an optional TTL.
+
+    ``sizeof(value)`` is the (approximate) size counted against ``max_bytes``;
+    a value larger than the whole budget is not stored. An entry looked up
+    under another version than its own is dropped and counted as an
+    invalidation, one past its TTL as an expiration.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None, sizeof=len, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, version, key):
+        """Value cached for ``key`` under dataset ``version``, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry_version, expires, size, value = entry
+            if entry_version != version or expires < self.clock():
+                del self.entries[key]
+                self.bytes -= size
+                if entry_version != version:
+                    self.invalidations += 1
+                else:
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, version, key, value):
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = float("inf") if self.ttl is None else self.clock() + self.ttl
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self.entries[key] = (version, expires, size, value)
+            self.bytes += size
+            while ((self.max_entries is not None and len(self.entries) > self.max_entries)
+                   or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                _, (_, _, evicted_size, _) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }